@@ -0,0 +1,71 @@
+"""Micro-benchmark of spine marker columns (markerColor, mplMarker).
+
+Compares the previous per user type loop with getSpineMarkers()
+on synthetic spine tables of 1k, 10k and 100k spines.
+
+    python sandbox/benchSpineMarkers.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from pymapmanager.annotations.baseAnnotationsCore import getSpineMarkers, getUserTypeMarkers_mpl
+
+def _makeSpinesDf(numSpines : int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'accept': rng.random(numSpines) > 0.1,
+        'userType': rng.integers(0, 12, numSpines),
+    })
+    return df
+
+def _loopMarkers(df : pd.DataFrame):
+    """Previous implementation, two masked .loc passes and one filter per user type.
+    """
+    df = df.copy()
+    df['markerColor'] = 'm'
+    _notAcceptRowLabels = df[ ~df['accept'].astype(bool) ]
+    if len(_notAcceptRowLabels)>0:
+        df.loc[_notAcceptRowLabels.index, 'markerColor'] = 'w'
+
+    _userTypeMarkers = getUserTypeMarkers_mpl()
+    df['mplMarker'] = 'o'
+    for userType in range(10):
+        _userTypeRowLabels = df[ df['userType'] == userType]
+        df.loc[_userTypeRowLabels.index, 'mplMarker'] = _userTypeMarkers[userType]
+    return df
+
+def _vectorMarkers(df : pd.DataFrame):
+    df = df.copy()
+    markerColor, mplMarker = getSpineMarkers(df['accept'], df['userType'])
+    df['markerColor'] = markerColor
+    df['mplMarker'] = mplMarker
+    return df
+
+def _timeit(func, df, numRepeat = 5) -> float:
+    """Best of numRepeat, in ms.
+    """
+    best = np.inf
+    for _ in range(numRepeat):
+        startSec = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - startSec)
+    return best * 1000
+
+def run():
+    for numSpines in [1_000, 10_000, 100_000]:
+        df = _makeSpinesDf(numSpines)
+
+        loopDf = _loopMarkers(df)
+        vectorDf = _vectorMarkers(df)
+        assert (loopDf['markerColor'] == vectorDf['markerColor']).all()
+        assert (loopDf['mplMarker'] == vectorDf['mplMarker']).all()
+
+        loopMs = _timeit(_loopMarkers, df)
+        vectorMs = _timeit(_vectorMarkers, df)
+        print(f'{numSpines:>7} spines  loop:{loopMs:8.2f} ms  vector:{vectorMs:8.2f} ms  speedup:{loopMs/vectorMs:5.1f}x')
+
+if __name__ == '__main__':
+    run()
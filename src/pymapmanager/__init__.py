@@ -1,3 +1,7 @@
+# first, so imports of all dependencies can be timed (see startupProfiler)
+from .startupProfiler import startupProfiler
+startupProfiler.startFromEnvironment()
+
 from .timeseriesCore import TimeSeriesCore
 from .stack import stack
 
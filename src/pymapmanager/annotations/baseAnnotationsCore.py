@@ -19,12 +19,47 @@ from mapmanagercore.layers.line import clipLines
 # from pymapmanager.interface2.stackWidgets.event.spineEvent import EditSpinePropertyEvent
 
 from pymapmanager import TimeSeriesCore
+from pymapmanager.annotations.zIndex import ZSortedIndex
+from pymapmanager.annotations.polylineLayer import PolylineLayer
 
 from pymapmanager._logger import logger
 
 def getUserTypeMarkers_mpl():
     return ['o', 'v', '^', '<', '>', 'D', 'd', '*', 'p' ,'h']
 
+def getSpineMarkers(accept : pd.Series, userType : pd.Series):
+    """Get plot marker color and mpl marker symbol for each spine in one pass.
+
+    Accepted spines are 'm', not accepted are 'w'.
+    User types [0, 9] map to getUserTypeMarkers_mpl(), anything else is 'o'.
+
+    Returns
+    -------
+    (markerColor, mplMarker) : (np.ndarray, np.ndarray)
+        Object arrays of str, one item per spine.
+    """
+    # after we add a spine, pandas is converting
+    # dtype of column 'accept' from bool to object?
+    _accept = np.asarray(accept).astype(bool)
+    _colors = np.array(['w', 'm'], dtype=object)
+    markerColor = _colors.take(_accept.view(np.int8))
+
+    # lookup table, last item is for user types out of range (or nan)
+    _userTypeMarkers = getUserTypeMarkers_mpl()
+    _markerLut = np.array(_userTypeMarkers + ['o'], dtype=object)
+    _userType = np.asarray(userType)
+    if not np.issubdtype(_userType.dtype, np.integer):
+        # object or float column, e.g. after adding a spine, non integers are out of range
+        _userType = pd.to_numeric(pd.Series(_userType), errors='coerce').to_numpy(dtype=float)
+        _isInt = np.isfinite(_userType)
+        _isInt[_isInt] = _userType[_isInt] % 1 == 0
+        _userType = np.where(_isInt, _userType, -1).astype(np.intp)
+    _isUserType = (_userType >= 0) & (_userType < len(_userTypeMarkers))
+    _markerIdx = np.where(_isUserType, _userType, len(_userTypeMarkers))
+    mplMarker = _markerLut.take(_markerIdx)
+
+    return markerColor, mplMarker
+
 class AnnotationsCore:
     def __init__(self,
                  timeSeriesCore : TimeSeriesCore,  # multi timepoint
@@ -48,6 +83,9 @@ class AnnotationsCore:
         self._df = None
         self._isDirty = False #abj
 
+        self._zIndex : Optional[ZSortedIndex] = None
+        # built on first getSegmentPlot() after self._df changes
+
         self._buildDataFrame()
     
     def _buildTimepoint(self):
@@ -84,6 +122,13 @@ class AnnotationsCore:
         """
         logger.error('baseAnnotationCore SHOULD NEVER BE CALLED.')
 
+    def _refreshRows(self, rowIdx : Union[int, List[int]]):
+        """Update our df after core edited some rows.
+
+        By default, full rebuild. See SpineAnnotationsCore.
+        """
+        self._buildDataFrame()
+
     def getDataFrame(self) -> pd.DataFrame:
         """Flat dataframe of all annotations (one per row).
         """
@@ -120,20 +165,32 @@ class AnnotationsCore:
         # logger.info(f'{self.getClassName()} df: {type(df)}')
         # print(df.columns)
         # print(df)
-        
-        df['rowIndex'] = list(np.arange(len(df)))
 
         #abj: 7/17/24
-        if not df.empty:
-            df = df[(df['z']>=_startSlice) & (df['z']<=_stopSlice)]
+        if df.empty:
+            return df
 
+        zIndex = self._getZIndex()
+        _rows = zIndex.getRows(_startSlice, _stopSlice, segmentID=segmentID)
+        
         # logger.info(f"df {df}")
 
-        if segmentID is not None:
-            df = df[ df['segmentID'] == segmentID]
-
-        return df
+        return df.iloc[_rows]
     
+    def _getZIndex(self) -> ZSortedIndex:
+        """Get z index of self._df, rebuild if invalidated by an edit.
+        """
+        if self._zIndex is None:
+            df = self.getDataFrame()
+            _segmentID = df['segmentID'].to_numpy() if 'segmentID' in df.columns else None
+            self._zIndex = ZSortedIndex(df['z'].to_numpy(), _segmentID)
+        return self._zIndex
+
+    def _invalidateZIndex(self):
+        """Call whenever self._df rows or z change.
+        """
+        self._zIndex = None
+
     def getRow(self, rowIdx : int):
         """Get columns and values for one row index.
         """
@@ -232,8 +289,8 @@ class AnnotationsCore:
                 logger.error(e)
                 return
             
-            # rebuild df from mutated full map
-            self._buildDataFrame()
+            # patch edited row of df from mutated full map
+            self._refreshRows(row)
 
         except(IndexError):
             logger.error(f'did not set value for col "{colName}" at row {row}')
@@ -262,6 +319,9 @@ class AnnotationsCore:
             # reset to false everytime there is a save
         """
         self._isDirty = dirtyVal
+        if dirtyVal:
+            # invalidate map wide caches, see MapPlotCache
+            self._fullMap.incrementVersion()
 
     def getDirty(self):
         return self._isDirty 
@@ -271,7 +331,8 @@ class SpineAnnotationsCore(AnnotationsCore):
     def _buildDataFrame(self):
         """Dataframe representing backend spines, one row per spine.
         
-        Needs to be regenerated on any edit/mutation.
+        Full rebuild, used on load and undo/redo. After an edit
+        use _refreshRows() to patch just the edited spines.
 
         Notes
         -----
@@ -281,51 +342,100 @@ class SpineAnnotationsCore(AnnotationsCore):
 
         allSpinesDf = self.singleTimepoint.points[:]
 
-        if len(allSpinesDf) > 0:  
+        self._df = self._addDerivedColumns(allSpinesDf)
+        self._invalidateZIndex()
+
+        self._buildSummaryDf()
+
+        return self._df
+
+    def _addDerivedColumns(self, spinesDf : pd.DataFrame) -> pd.DataFrame:
+        """Add our columns (index, x, y, roiType, markerColor, mplMarker) to core spine rows.
+
+        Works on all spines or a subset of rows, see _refreshRows().
+        """
+        if len(spinesDf) > 0:  
             # when there is 1 spine, points[:] returns
             # <class 'pandas.core.series.Series'> 
             try:
-                xyCoord = allSpinesDf['point'].get_coordinates()
-                allSpinesDf['x'] = xyCoord['x']
-                allSpinesDf['y'] = xyCoord['y']
+                xyCoord = spinesDf['point'].get_coordinates()
+                spinesDf['x'] = xyCoord['x']
+                spinesDf['y'] = xyCoord['y']
             except(AttributeError) as e:
                 logger.error(e)
-                logger.error(f'error getting x/y allSpinesDf is: {type(allSpinesDf)}')
-                print(allSpinesDf)
+                logger.error(f'error getting x/y spinesDf is: {type(spinesDf)}')
+                print(spinesDf)
 
-        allSpinesDf.insert(0,'index', allSpinesDf.index)  # index is first column (use this as row label)
+        spinesDf.insert(0,'index', spinesDf.index)  # index is first column (use this as row label)
         
         addTheseColumns = ['roiType', 'markerColor', 'mplMarker']
         for aColumn in addTheseColumns:
-            allSpinesDf[aColumn] = None
+            spinesDf[aColumn] = None
 
-        allSpinesDf['roiType'] = 'spineROI'
+        spinesDf['roiType'] = 'spineROI'
 
-        if len(allSpinesDf) > 0:
-            allSpinesDf['markerColor'] = 'm'
-            try:
-                # after we add a spine, pandas is converting
-                # dtype of column 'accept' from bool to object?
-                _notAcceptRowLabels = allSpinesDf[ ~allSpinesDf['accept'].astype(bool) ]
-                if len(_notAcceptRowLabels)>0:
-                    allSpinesDf.loc[_notAcceptRowLabels.index, 'markerColor'] = 'w'
-            except (KeyError) as e:
-                logger.error(f'{e}')
-                raise(e)
-            
-            _userTypeMarkers = getUserTypeMarkers_mpl()
-            allSpinesDf['mplMarker'] = 'o'
-            for userType in range(10):
-                # 10 user types
-                _userTypeRowLabels = allSpinesDf[ allSpinesDf['userType'] == userType]
-                allSpinesDf.loc[_userTypeRowLabels.index, 'mplMarker'] = _userTypeMarkers[userType]
+        if len(spinesDf) > 0:
+            markerColor, mplMarker = getSpineMarkers(spinesDf['accept'], spinesDf['userType'])
+            spinesDf['markerColor'] = markerColor
+            spinesDf['mplMarker'] = mplMarker
 
-        self._df = allSpinesDf
+        return spinesDf
 
-        self._buildSummaryDf()
+    def _refreshRows(self, rowIdx : Union[int, List[int]]):
+        """Patch rows of our df after core edited some spines.
 
-        return self._df
+        Rows still in core are updated (or appended if new),
+        rows no longer in core are dropped. Derived columns are only
+        computed for these rows, all other rows are untouched.
+
+        Falls back to _buildDataFrame() when we have no rows yet.
+
+        Parameters
+        ----------
+        rowIdx : int | List[int]
+            Spine ID(s) that core added, deleted or modified.
+        """
+        if not isinstance(rowIdx, list):
+            rowIdx = [rowIdx]
+
+        if self._df is None or len(self._df) == 0:
+            self._buildDataFrame()
+            return
+
+        coreDf = self.singleTimepoint.points[:]
+        if len(coreDf) == 0:
+            self._buildDataFrame()
+            return
         
+        _inCore = [_row for _row in rowIdx if _row in coreDf.index]
+        _deleteRows = [_row for _row in rowIdx
+                       if _row not in coreDf.index and _row in self._df.index]
+
+        self._invalidateZIndex()
+
+        if len(_deleteRows) > 0:
+            self._df = self._df.drop(index=_deleteRows)
+
+        if len(_inCore) > 0:
+            # copy so we do not add columns to core frame
+            newRows = self._addDerivedColumns(coreDf.loc[_inCore].copy())
+
+            if list(newRows.columns) != list(self._df.columns):
+                # core added/removed a column, rare
+                logger.warning('columns changed -->> full rebuild')
+                self._buildDataFrame()
+                return
+
+            _updateRows = [_row for _row in _inCore if _row in self._df.index]
+            _appendRows = [_row for _row in _inCore if _row not in self._df.index]
+
+            if len(_updateRows) > 0:
+                self._df.loc[_updateRows] = newRows.loc[_updateRows]
+            if len(_appendRows) > 0:
+                self._df = pd.concat([self._df, newRows.loc[_appendRows]])
+
+        self._buildSummaryDf()
+
     def getSpineLines(self):
         """Get df to plot spine lines from head to tail (anchor).
         
@@ -412,7 +522,7 @@ class SpineAnnotationsCore(AnnotationsCore):
         # do not need to rebuild after addSpine
         # self._buildTimepoint()
 
-        self._buildDataFrame()
+        self._refreshRows(newSpineID)
 
         self._setDirty(True) #abj
 
@@ -429,7 +539,7 @@ class SpineAnnotationsCore(AnnotationsCore):
         # self.getMapPoints().deleteSpine(self.timepoint, rowIdx)
         self.singleTimepoint.deleteSpine(rowIdx)
 
-        self._buildDataFrame()
+        self._refreshRows(rowIdx)
 
         self._setDirty(True) #abj
 
@@ -445,10 +555,9 @@ class SpineAnnotationsCore(AnnotationsCore):
             col = item['col']
             value = item['value']
             
+            # setValue() patches the row in our df
             self.setValue(col, spineID, value)
 
-        self._buildDataFrame()
-
         self._setDirty(True) #abj
 
     def moveSpine(self, spineID :int, x, y, z):
@@ -465,8 +574,8 @@ class SpineAnnotationsCore(AnnotationsCore):
         #update background ROI
         # self.getTimepointMap().snapBackgroundOffset(spineID)
 
-        # rebuild df from mutated full map
-        self._buildDataFrame()
+        # patch moved row of df from mutated full map
+        self._refreshRows(spineID)
 
         self._setDirty(True) #abj
 
@@ -483,8 +592,8 @@ class SpineAnnotationsCore(AnnotationsCore):
         # _moved = self.getMapPoints().moveAnchor(self.timepoint, spineID, x=x, y=y, z=z)
         _moved = self.singleTimepoint.moveAnchor(spineID, x=x, y=y, z=z)
 
-        # rebuild df from mutated full map
-        self._buildDataFrame()
+        # patch moved row of df from mutated full map
+        self._refreshRows(spineID)
 
         self._setDirty(True) #abj
 
@@ -500,10 +609,28 @@ class SpineAnnotationsCore(AnnotationsCore):
         self.singleTimepoint.autoConnectBrightestIndex(spineID, segmentID, point, findBrightest)
 
         # refreshDataFrame
-        self._buildDataFrame()
+        self._refreshRows(spineID)
 
 class LineAnnotationsCore(AnnotationsCore):
-    
+
+    def __init__(self,
+                 timeSeriesCore : TimeSeriesCore,
+                 timepoint : int = 0,
+                 ):
+        self._segmentStatsDict = {}
+        # segmentID -> (segment LineString, number of points, length)
+        # reused by _buildSummaryDf() while the segment geometry is unchanged
+
+        self._polylineLayers = {}
+        # segment column ('segment', 'leftRadius', 'rightRadius') -> PolylineLayer
+        # built on first slice query, cleared in _buildDataFrame()
+        # and when TimeSeriesCore.version changes (undo/redo)
+
+        self._polylineVersion : Optional[int] = None
+        # TimeSeriesCore.version that self._polylineLayers were built from
+
+        super().__init__(timeSeriesCore, timepoint)
+
     def newSegment(self) -> int:
         # self.getMapSegments().newSegment(self.timepoint)
         newSegmentID = self.singleTimepoint.newSegment()
@@ -651,31 +778,13 @@ class LineAnnotationsCore(AnnotationsCore):
             # logger.info(f'{self.getClassName()} summaryDf is:')
             # print(summaryDf)
             
-            pointsList = []
-            lengthList = []
-            # pivotPointList = []
-            
-            # get len and points from each segment
-            for row_do_not_use, _data in summaryDf.iterrows():
+            pointsList, lengthList = self._getSegmentStats(segmentDf['segment'])
 
-                # logger.info(f'  row:{row_do_not_use} _data: {type(_data)}')
-                # logger.info('_data')
-                # print(_data)
-                
-                segmentID = _data['Segment']
-                
-                _numPoints = self.getNumPoints(segmentID)
-                _len = self.getLength(segmentID)
-                if _len > 0:
-                    _len = round(_len,2)
-                pointsList.append(_numPoints)
-                lengthList.append(_len)
-
-                # TODO
-                # pivotPointList.append('')
+            # TODO
+            # pivotPointList.append('')
                 
             summaryDf['Points'] = pointsList
-            summaryDf['Length'] = lengthList
+            summaryDf['Length'] = np.round(lengthList, 2)
 
         summaryDf.index = summaryDf['Segment']
         
@@ -683,6 +792,52 @@ class LineAnnotationsCore(AnnotationsCore):
 
         return summaryDf
     
+    def _getSegmentStats(self, segments) -> tuple:
+        """Get number of points and length of each segment.
+
+        Only segments whose geometry changed since the last call are computed,
+        in one vectorized shapely call.
+
+        Parameters
+        ----------
+        segments : gp.GeoSeries
+            LineString per segment, index is segmentID.
+
+        Returns
+        -------
+        (numPoints, length) : (np.ndarray, np.ndarray)
+            One item per segment, in the order of segments.
+        """
+        segmentIDs = segments.index.to_list()
+        lineStrings = segments.to_numpy()
+
+        _oldStatsDict = self._segmentStatsDict
+        _computeIdx = [_idx for _idx, (_segmentID, _lineString) in enumerate(zip(segmentIDs, lineStrings))
+                       if _segmentID not in _oldStatsDict
+                       or _oldStatsDict[_segmentID][0] is not _lineString]
+        
+        _newNumPoints = shapely.get_num_points(lineStrings[_computeIdx])
+        _newLength = shapely.length(lineStrings[_computeIdx])
+        
+        # drops deleted segments
+        statsDict = {_segmentID: _oldStatsDict[_segmentID] for _segmentID in segmentIDs
+                     if _segmentID in _oldStatsDict}
+        for _i, _idx in enumerate(_computeIdx):
+            statsDict[segmentIDs[_idx]] = (lineStrings[_idx], int(_newNumPoints[_i]), float(_newLength[_i]))
+        self._segmentStatsDict = statsDict
+
+        numPoints = np.array([statsDict[_segmentID][1] for _segmentID in segmentIDs], dtype=int)
+        length = np.array([statsDict[_segmentID][2] for _segmentID in segmentIDs], dtype=float)
+        
+        return numPoints, length
+
+    def _clearCaches(self):
+        """Clear cached segment stats and polylines, after undo/redo replaced core segments.
+        """
+        self._segmentStatsDict = {}
+        self._polylineLayers = {}
+        self._polylineVersion = None
+
     def _buildDataFrame(self) -> None:  
         """Build dataframe for plotting.
         
@@ -737,6 +892,8 @@ class LineAnnotationsCore(AnnotationsCore):
         # print("dfRet", dfRet)
 
         self._df = dfRet
+        self._invalidateZIndex()
+        self._polylineLayers = {}
     
         # summary, one row per segment        
         self._buildSummaryDf()
@@ -807,6 +964,36 @@ class LineAnnotationsCore(AnnotationsCore):
    
         return returnPointX, returnPointY
     
+    def getPolylineSlice(self, column : str, sliceNumber : int, zPlusMinus : int):
+        """Get x/y and connect of one polyline column of all segments in a z range.
+
+        Parameters
+        ----------
+        column : str
+            Segment column, one of ('segment', 'leftRadius', 'rightRadius').
+
+        Returns
+        -------
+        (x, y, connect) : (np.ndarray, np.ndarray, np.ndarray)
+            See PolylineLayer.getSlice()
+        """
+        if self._polylineVersion != self._fullMap.version:
+            self._polylineLayers = {}
+            self._polylineVersion = self._fullMap.version
+
+        polylineLayer = self._polylineLayers.get(column, None)
+        if polylineLayer is None:
+            if self.getNumSegments() == 0:
+                _lines = []
+            else:
+                _lines = self.singleTimepoint.segments[column]
+            polylineLayer = PolylineLayer(_lines)
+            self._polylineLayers[column] = polylineLayer
+
+        _startSlice = sliceNumber - zPlusMinus
+        _stopSlice = sliceNumber + zPlusMinus
+        return polylineLayer.getSlice(_startSlice, _stopSlice)
+
     def getLeftRadiusPlot(self, sliceNumber, zPlusMinus):
         # segmentLines = self._df 
         # logger.info(f"self._fullMap segments columns {self._fullMap.segments}")
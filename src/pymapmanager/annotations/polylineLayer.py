@@ -0,0 +1,77 @@
+"""Flat coordinate arrays of 3D polylines for fast z slice queries.
+
+Used by LineAnnotationsCore to plot segment radius lines on every slice change.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import shapely
+
+class PolylineLayer:
+    """All polylines (one per segment) as flat x/y/z arrays with line breaks.
+
+    A slice query is a vectorized z range mask plus a connect array,
+    no clipping of geometry and no dataframes.
+
+    Points are kept (not interpolated) at the edge of the z range, the line
+    stops at the last point in range.
+
+    Parameters
+    ----------
+    lines : np.ndarray | gp.GeoSeries
+        One (Multi)LineString per segment, with z.
+    """
+    def __init__(self, lines):
+        lines = np.asarray(lines)
+        
+        coords, lineIdx = shapely.get_coordinates(lines, include_z=True, return_index=True)
+        
+        self._x = coords[:, 0]
+        self._y = coords[:, 1]
+        self._z = coords[:, 2]
+        
+        self._lineIdx = lineIdx
+        # index into lines for each point
+
+        self._isLineEnd = np.ones(len(lineIdx), dtype=bool)
+        # True for the last point of each line, do not connect to next
+        self._isLineEnd[:-1] = lineIdx[1:] != lineIdx[:-1]
+
+        # a MultiLineString has breaks inside one segment
+        _partEnds = self._getPartEnds(lines)
+        if _partEnds is not None:
+            self._isLineEnd[_partEnds] = True
+
+    @staticmethod
+    def _getPartEnds(lines : np.ndarray) -> Optional[np.ndarray]:
+        """Get point index of the last point of each part of MultiLineStrings.
+        """
+        _isMulti = shapely.get_type_id(lines) == shapely.GeometryType.MULTILINESTRING
+        if not np.any(_isMulti):
+            return None
+        
+        # explode to parts in the same order as get_coordinates()
+        parts = shapely.get_parts(lines)
+        numPartPoints = shapely.get_num_coordinates(parts)
+        return np.cumsum(numPartPoints) - 1
+
+    def __len__(self):
+        return len(self._x)
+
+    def getSlice(self, zMin : float, zMax : float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get points with zMin <= z <= zMax.
+
+        Returns
+        -------
+        (x, y, connect) : (np.ndarray, np.ndarray, np.ndarray)
+            connect[i] is True to draw a line from point i to i+1,
+            for pyqtgraph setData(connect=connect).
+        """
+        inRange = (self._z >= zMin) & (self._z <= zMax)
+        
+        # connect to next point if next point is in range and in the same line
+        connectNext = inRange & ~self._isLineEnd
+        connectNext[:-1] &= inRange[1:]
+
+        rows = np.flatnonzero(inRange)
+        return self._x[rows], self._y[rows], connectNext[rows]
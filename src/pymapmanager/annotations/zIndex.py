@@ -0,0 +1,80 @@
+"""Sorted z index of an annotation dataframe for fast slice queries.
+
+Used by AnnotationsCore.getSegmentPlot() on every slice change.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+class ZSortedIndex:
+    """Sorted z values and their argsort permutation.
+
+    A z range query is two binary searches, O(log n + k) for k rows in the range,
+    instead of a boolean filter over all rows.
+
+    Rows are positional (iloc) and returned in dataframe order, so
+    line annotations keep their point order within each segment.
+
+    Parameters
+    ----------
+    z : np.ndarray
+        z of each row in the dataframe.
+    segmentID : np.ndarray | None
+        segmentID of each row, needed for queries of one segment.
+    """
+    def __init__(self, z : np.ndarray, segmentID : Optional[np.ndarray] = None):
+        z = np.asarray(z, dtype=float)
+        
+        self._order = np.argsort(z, kind='stable')
+        self._sortedZ = z[self._order]  # nan are sorted to the end and never match
+
+        self._z = z
+        self._segmentID = segmentID
+
+        self._segmentDict : Optional[Dict[int, Tuple[np.ndarray, np.ndarray]]] = None
+        # segmentID -> (sortedZ, order), built on first query for one segment
+
+    def __len__(self):
+        return len(self._order)
+
+    def _buildSegmentDict(self):
+        """Partition by segmentID, each partition sorted by z.
+        """
+        self._segmentDict = {}
+        if len(self._z) == 0:
+            return
+        
+        segmentID = np.asarray(self._segmentID)
+        order = np.lexsort((self._z, segmentID))
+        sortedSegmentID = segmentID[order]
+        _boundaries = np.flatnonzero(sortedSegmentID[1:] != sortedSegmentID[:-1]) + 1
+        for _order in np.split(order, _boundaries):
+            _segmentID = segmentID[_order[0]]
+            self._segmentDict[_segmentID] = (self._z[_order], _order)
+
+    def getRows(self, zMin : float, zMax : float, segmentID : Optional[int] = None) -> np.ndarray:
+        """Get positional rows with zMin <= z <= zMax, in dataframe order.
+
+        Parameters
+        ----------
+        zMin, zMax : float
+            Inclusive z range.
+        segmentID : int | None
+            If specified, only rows in this segment.
+        """
+        if segmentID is None:
+            sortedZ, order = self._sortedZ, self._order
+        else:
+            if self._segmentID is None:
+                raise KeyError('segmentID')
+            if self._segmentDict is None:
+                self._buildSegmentDict()
+            try:
+                sortedZ, order = self._segmentDict[segmentID]
+            except KeyError:
+                return np.empty(0, dtype=np.intp)
+
+        _start = np.searchsorted(sortedZ, zMin, side='left')
+        _stop = np.searchsorted(sortedZ, zMax, side='right')
+        
+        return np.sort(order[_start:_stop])
@@ -0,0 +1,313 @@
+"""Per (timepoint, channel) image intensity statistics.
+
+Statistics (min, max, auto contrast percentiles and a histogram) are
+computed once, in bounded size batches of planes, and saved into the .mmap
+so opening a stack does not need to read every voxel to set the contrast.
+
+The .mmap is a zarr zip store written by mapmanagercore, we add one
+json member to the zip after core has saved.
+"""
+import json
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from pymapmanager._logger import logger
+
+class IntensityAccumulator:
+    """Accumulate intensity statistics over image planes without keeping the planes.
+
+    Integer images only (uint8, uint16), floats are truncated to int.
+    """
+
+    autoContrastPercentiles = (0.175, 99.825)
+    # like ImageJ auto contrast, 0.35% saturated pixels
+
+    numHistBins = 256
+    # number of bins in the saved histogram
+
+    chunkPixels = 2**20
+    # np.bincount() casts to int64, count this many pixels at a time to bound the temporary copy
+
+    def __init__(self):
+        self._counts : Optional[np.ndarray] = None  # full resolution histogram
+        self._numPixels = 0
+        self._dtype = None
+
+    def add(self, planes : np.ndarray):
+        """Add one plane (y, x) or a batch of planes (z, y, x).
+        """
+        if self._dtype is None:
+            self._dtype = str(planes.dtype)
+
+        if not np.issubdtype(planes.dtype, np.integer):
+            planes = planes.astype(np.int64)
+
+        flat = planes.ravel()
+        if flat.size == 0:
+            return
+
+        if flat.min() < 0:
+            logger.warning('negative intensities are clipped to 0')
+            flat = np.clip(flat, 0, None)
+
+        for start in range(0, flat.size, self.chunkPixels):
+            counts = np.bincount(flat[start:start + self.chunkPixels])
+            self._addCounts(counts)
+
+        self._numPixels += flat.size
+
+    def _addCounts(self, counts : np.ndarray):
+        if self._counts is None:
+            self._counts = counts.copy()
+        elif len(counts) > len(self._counts):
+            counts = counts.copy()
+            counts[:len(self._counts)] += self._counts
+            self._counts = counts
+        else:
+            self._counts[:len(counts)] += counts
+
+    def merge(self, other : "IntensityAccumulator"):
+        """Merge another accumulator into self, used for parallel reductions.
+        """
+        if other._counts is None:
+            return
+        if self._dtype is None:
+            self._dtype = other._dtype
+        self._addCounts(other._counts)
+        self._numPixels += other._numPixels
+
+    def _percentile(self, cumCounts : np.ndarray, percent : float) -> int:
+        target = percent / 100 * self._numPixels
+        return int(np.searchsorted(cumCounts, target, side='left'))
+
+    def getStats(self) -> dict:
+        """Get a json serializable dict of stats.
+        """
+        if self._counts is None:
+            return None
+
+        nonZero = np.nonzero(self._counts)[0]
+        _min = int(nonZero[0])
+        _max = int(nonZero[-1])
+
+        cumCounts = np.cumsum(self._counts)
+        lowPercent, highPercent = self.autoContrastPercentiles
+        minAutoContrast = self._percentile(cumCounts, lowPercent)
+        maxAutoContrast = self._percentile(cumCounts, highPercent)
+
+        # downsample histogram to numHistBins over [0, max]
+        binEdges = np.linspace(0, _max + 1, self.numHistBins + 1)
+        histogram, _ = np.histogram(np.arange(_max + 1),
+                                    bins=binEdges,
+                                    weights=self._counts[:_max + 1])
+
+        theDict = {
+            'dtype': self._dtype,
+            'numPixels': int(self._numPixels),
+            'min': _min,
+            'max': _max,
+            'percentiles': list(self.autoContrastPercentiles),
+            'minAutoContrast': minAutoContrast,
+            'maxAutoContrast': maxAutoContrast,
+            'histogram': histogram.astype(np.int64).tolist(),
+            'binEdges': binEdges.tolist(),
+        }
+        return theDict
+
+def computeIntensityStats(fetchSlab : Callable[[int, int], np.ndarray],
+                            numSlices : int,
+                            planeBytes : int,
+                            maxBytes : int = 64 * 2**20,
+                            numWorkers : int = 1) -> Optional[dict]:
+    """Compute intensity stats over a volume in bounded size batches of z planes.
+
+    The full volume is never in memory, at most numWorkers batches of planes are
+    (plus a bounded temporary per worker, see IntensityAccumulator.chunkPixels).
+
+    Parameters
+    ----------
+    fetchSlab : Callable[[int, int], np.ndarray]
+        Function to fetch raw planes [firstSlice, lastSlice) as a (z, y, x) array.
+    numSlices : int
+        Number of z planes in the volume.
+    planeBytes : int
+        Number of bytes in one plane, to size batches.
+    maxBytes : int
+        Peak memory for image data across all workers.
+    numWorkers : int
+        Number of worker threads, 1 to run in the calling thread.
+    """
+    numWorkers = max(1, numWorkers)
+    batchSlices = max(1, maxBytes // (numWorkers * max(1, planeBytes)))
+    batchSlices = min(batchSlices, max(1, numSlices))
+
+    batchList = [(z, min(z + batchSlices, numSlices)) for z in range(0, numSlices, batchSlices)]
+
+    def _reduceBatch(zRange : Tuple[int, int]) -> IntensityAccumulator:
+        accumulator = IntensityAccumulator()
+        accumulator.add(fetchSlab(zRange[0], zRange[1]))
+        return accumulator
+
+    total = IntensityAccumulator()
+    if numWorkers == 1 or len(batchList) == 1:
+        for zRange in batchList:
+            total.merge(_reduceBatch(zRange))
+    else:
+        # workers fetch their own batch, so only numWorkers batches are in memory
+        with ThreadPoolExecutor(max_workers=numWorkers,
+                                thread_name_prefix='computeIntensityStats') as executor:
+            for accumulator in executor.map(_reduceBatch, batchList):
+                total.merge(accumulator)
+
+    return total.getStats()
+
+class IntensityStats:
+    """Intensity statistics for all (timepoint, channel) in a map.
+
+    Loaded lazily from the .mmap on first get().
+    Thread safe, stacks of a map can get their stats from worker threads.
+
+    Parameters
+    ----------
+    path : str
+        Path to .mmap, None for imported (tif) stacks.
+    """
+
+    version = 1
+
+    mmapMember = 'pymapmanager/intensityStats.json'
+    # name of json in the .mmap zip store
+
+    def __init__(self, path : Optional[str] = None):
+        self._path = path
+        self._statsDict : Dict[Tuple[int, int], dict] = {}
+        self._loaded = False
+        # set once _statsDict is filled from the .mmap
+
+        self._lock = threading.RLock()
+
+    def __str__(self):
+        return f'IntensityStats path:{self._path} loaded:{self._loaded} keys:{list(self._statsDict.keys())}'
+
+    def get(self, timepoint : int, channel : int) -> Optional[dict]:
+        """Get stats for one timepoint and channel, None if not available.
+        """
+        self.ensureLoaded()
+        return self._statsDict.get((timepoint, channel))
+
+    def set(self, timepoint : int, channel : int, statsDict : dict):
+        self.ensureLoaded()
+        with self._lock:
+            self._statsDict[(timepoint, channel)] = statsDict
+
+    def invalidate(self, timepoint : int = None, channel : int = None):
+        """Remove stats for a timepoint and/or channel, with no arguments remove all.
+        """
+        self.ensureLoaded()
+        with self._lock:
+            for key in list(self._statsDict.keys()):
+                if timepoint is not None and key[0] != timepoint:
+                    continue
+                if channel is not None and key[1] != channel:
+                    continue
+                self._statsDict.pop(key)
+
+    def ensureLoaded(self):
+        """Load from the .mmap if we have not already.
+
+        Call before core saves to the same path, saving overwrites the .mmap.
+        """
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                # loaded by another thread while we waited
+                return
+            self._statsDict.update(self._readStatsDict())
+            self._loaded = True
+
+    def _readStatsDict(self) -> Dict[Tuple[int, int], dict]:
+        """Read stats from the .mmap, empty if there are none.
+        """
+        if self._path is None:
+            return {}
+
+        jsonStr = None
+        try:
+            if os.path.isdir(self._path):
+                _jsonPath = os.path.join(self._path, self.mmapMember)
+                if os.path.isfile(_jsonPath):
+                    with open(_jsonPath) as f:
+                        jsonStr = f.read()
+            elif zipfile.is_zipfile(self._path):
+                with zipfile.ZipFile(self._path, 'r') as zf:
+                    if self.mmapMember in zf.namelist():
+                        jsonStr = zf.read(self.mmapMember).decode('utf-8')
+        except (OSError, zipfile.BadZipFile) as e:
+            logger.error(f'did not load intensity stats from {self._path}: {e}')
+            return {}
+
+        if jsonStr is None:
+            logger.info(f'no saved intensity stats in {self._path}')
+            return {}
+
+        try:
+            loadedDict = json.loads(jsonStr)
+        except json.JSONDecodeError as e:
+            logger.error(f'did not load intensity stats from {self._path}: {e}')
+            return {}
+
+        if loadedDict.get('version') != self.version:
+            logger.warning(f"ignoring intensity stats version {loadedDict.get('version')}")
+            return {}
+
+        statsDict = {}
+        for key, oneStats in loadedDict['stats'].items():
+            timepoint, channel = key.split('/')
+            statsDict[(int(timepoint), int(channel))] = oneStats
+
+        logger.info(f'loaded intensity stats {list(statsDict.keys())}')
+        return statsDict
+
+    def save(self, path : str):
+        """Add stats to a .mmap that core just saved.
+
+        Parameters
+        ----------
+        path : str
+            Path to .mmap, becomes our path for future loads.
+        """
+        self.ensureLoaded()
+        self._path = path
+
+        with self._lock:
+            statsDict = dict(self._statsDict)
+
+        if len(statsDict) == 0:
+            return
+
+        saveDict = {
+            'version': self.version,
+            'stats': {f'{t}/{c}': oneStats for (t, c), oneStats in statsDict.items()},
+        }
+        jsonStr = json.dumps(saveDict)
+
+        try:
+            if os.path.isdir(path):
+                _jsonPath = os.path.join(path, self.mmapMember)
+                os.makedirs(os.path.dirname(_jsonPath), exist_ok=True)
+                with open(_jsonPath, 'w') as f:
+                    f.write(jsonStr)
+            else:
+                with zipfile.ZipFile(path, 'a', compression=zipfile.ZIP_STORED) as zf:
+                    zf.writestr(self.mmapMember, jsonStr)
+        except (OSError, zipfile.BadZipFile) as e:
+            logger.error(f'did not save intensity stats to {path}: {e}')
+            return
+
+        logger.info(f'saved intensity stats {list(statsDict.keys())} to {path}')
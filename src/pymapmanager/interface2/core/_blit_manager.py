@@ -0,0 +1,117 @@
+"""Redraw selection artists of a matplotlib figure without redrawing the figure.
+
+canvas.draw() renders every artist, for a scatter of many points this is
+too slow to follow the mouse. With blitting the figure is rendered once
+(on each 'draw_event') and cached, then each update restores the cached
+background and only draws the animated artists on top.
+"""
+from contextlib import contextmanager
+from typing import List
+
+from matplotlib.artist import Artist
+
+class BlitManager:
+    """Blit a few animated artists over a cached figure background.
+
+    Artists added with addArtists() are set animated, they are not drawn by
+    canvas.draw() but by BlitManager after each draw and by update().
+
+    Other animated artists in the figure (like a RectangleSelector with
+    useblit=True) are also drawn, so they are not erased by update().
+
+    If the canvas does not support blitting, artists are not set animated and
+    update() falls back to a full canvas.draw() with the artists drawn normally.
+
+    Animated artists are still in figure.savefig() output, matplotlib draws
+    them when saving.
+
+    Parameters
+    ----------
+    canvas : matplotlib.backend_bases.FigureCanvasBase
+    artists : List[matplotlib.artist.Artist]
+    """
+    def __init__(self, canvas, artists : List[Artist] = None):
+        self.canvas = canvas
+
+        self._background = None
+
+        self._artists : List[Artist] = []
+        # artists added with addArtists()
+
+        self.addArtists(artists or [])
+
+        self._cid = self.canvas.mpl_connect('draw_event', self._onDraw)
+
+    @property
+    def supportsBlit(self) -> bool:
+        return getattr(self.canvas, 'supports_blit', False)
+
+    def addArtists(self, artists : List[Artist]):
+        """Add artists to be drawn by update().
+
+        Artists removed from their axes are no longer drawn.
+        """
+        for artist in artists:
+            self._artists.append(artist)
+            if self.supportsBlit:
+                artist.set_animated(True)
+
+    @contextmanager
+    def _notAnimated(self):
+        """Temporarily draw our artists with the rest of the figure.
+        """
+        animatedArtists = [artist for artist in self._artists if artist.get_animated()]
+        for artist in animatedArtists:
+            artist.set_animated(False)
+        try:
+            yield
+        finally:
+            for artist in animatedArtists:
+                artist.set_animated(True)
+
+    def _animatedArtists(self) -> List[Artist]:
+        """All visible animated artists in the figure, in zorder.
+        """
+        figure = self.canvas.figure
+        animated = [artist
+                    for ax in figure.axes
+                    for artist in ax.get_children()
+                    if artist.get_animated() and artist.get_visible()]
+        return sorted(animated, key=lambda artist: artist.get_zorder())
+
+    def _onDraw(self, event):
+        """Cache the new background after the figure is drawn.
+        """
+        if event is not None and event.canvas is not self.canvas:
+            return
+        if not self.supportsBlit:
+            return
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._drawAnimated()
+
+    def _drawAnimated(self):
+        figure = self.canvas.figure
+        for artist in self._animatedArtists():
+            figure.draw_artist(artist)
+
+    def update(self):
+        """Show changes to the animated artists.
+        """
+        if not self.supportsBlit:
+            # animated artists are skipped by a normal draw
+            with self._notAnimated():
+                self.canvas.draw()
+            return
+
+        if self._background is None:
+            # draw_event will cache the background
+            self.canvas.draw_idle()
+            return
+
+        self.canvas.restore_region(self._background)
+        self._drawAnimated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._cid)
+        self._background = None
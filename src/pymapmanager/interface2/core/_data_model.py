@@ -9,16 +9,36 @@ import math
 import numpy as np
 import pandas as pd
 from qtpy import QtCore, QtGui, QtWidgets
-from typing import List
+from typing import List, Optional, Tuple
 
 from pymapmanager._logger import logger
 
+def _contiguousRuns(sortedRows : List[int]) -> List[Tuple[int, int]]:
+    """Split sorted unique rows into runs of contiguous rows, as (first, last).
+    """
+    runs = []
+    for row in sortedRows:
+        if len(runs) > 0 and row == runs[-1][1] + 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return [(first, last) for first, last in runs]
+
 class pandasModel(QtCore.QAbstractTableModel):
+    """Table model of a pandas dataframe.
+
+    Values are held as one numpy array per column and accessed by position
+    (row, column), not with dataframe label lookups. Display values are
+    formatted once per column, the first time a cell in the column is shown.
+    """
 
     #signalMyDataChanged = QtCore.pyqtSignal(object, object, object)
     signalMyDataChanged = QtCore.Signal(object, object, object)
     """Emit on user editing a cell."""
 
+    keepIndexOnDelete = False
+    """If False, myDeleteRows() resets the dataframe index to 0..n-1."""
+
     def __init__(self, data : pd.DataFrame):
         """Data model for a pandas dataframe.
 
@@ -27,10 +47,66 @@ class pandasModel(QtCore.QAbstractTableModel):
         """
         QtCore.QAbstractTableModel.__init__(self)
         
-        self._data = data
+        self._setDataFrame(data)
 
         #self._myFont = QtGui.QFont('Arial', pointSize=10)
 
+    def _setDataFrame(self, data : pd.DataFrame):
+        """Set the dataframe and reset the per column arrays, does not notify views.
+        """
+        self._data = data
+
+        self._columnNames : List[str] = list(data.columns)
+        self._columnValues : List[np.ndarray] = [data[col].to_numpy() for col in self._columnNames]
+        # raw values, one array per column
+        
+        self._displayValues : List[Optional[np.ndarray]] = [None] * len(self._columnNames)
+        # formatted values (object arrays), one per column, filled in by _getDisplayColumn()
+
+    def _formatColumn(self, values : np.ndarray) -> np.ndarray:
+        """Format an array of column values for display, returns an object array.
+
+        Numpy scalars become python scalars, nan becomes '', bool and list become str.
+        """
+        kind = values.dtype.kind
+        if kind == 'f':
+            displayValues = values.astype(object)
+            displayValues[np.isnan(values)] = ''
+        elif kind in 'iu':
+            displayValues = values.astype(object)
+        elif kind == 'b':
+            displayValues = np.array(['False', 'True'], dtype=object)[values.astype(np.intp)]
+        else:
+            displayValues = np.empty(len(values), dtype=object)
+            displayValues[:] = [self._formatValue(value) for value in values]
+        return displayValues
+
+    def _formatValue(self, value):
+        """Format one value of an object column for display.
+        """
+        if isinstance(value, np.floating):
+            value = float(value)
+        elif isinstance(value, np.integer):
+            value = int(value)
+        elif isinstance(value, np.bool_):
+            value = str(value)
+        elif isinstance(value, list):
+            value = str(value)
+        elif isinstance(value, str) and value == 'nan':
+            value = ''
+
+        if isinstance(value, float) and math.isnan(value):
+            # don't show 'nan' in table
+            value = ''
+        return value
+
+    def _getDisplayColumn(self, columnIdx : int) -> np.ndarray:
+        displayValues = self._displayValues[columnIdx]
+        if displayValues is None:
+            displayValues = self._formatColumn(self._columnValues[columnIdx])
+            self._displayValues[columnIdx] = displayValues
+        return displayValues
+
     def rowCount(self, parent=None):
         # abb sept
         return len(self._data.index) 
@@ -38,54 +114,22 @@ class pandasModel(QtCore.QAbstractTableModel):
 
     def columnCount(self, parnet=None):
         # abb sept
-        return len(self._data.columns.values) 
+        return len(self._columnNames)
         # return self._data.shape[1]
 
     def data(self, index, role=QtCore.Qt.DisplayRole):
-        # abb sept
-        # if role == QtCore.Qt.DisplayRole:
-        #     i = index.row()
-        #     j = index.column()
-        #     ret = '{0}'.format(self._data.iat[i, j])
-        #     # print('ret:', ret, type(ret))
-        #     return ret
-        # else:
-        #     return QtCore.QVariant()
-
         if index.isValid():
             if role == QtCore.Qt.ToolTipRole:
                 # no tooltips here
                 pass
             elif role in [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole]:
-                columnName = self._data.columns[index.column()]
-
-                realRow = index.row()
                 try:
-                    retVal = self._data.loc[realRow, columnName]
-                except(KeyError) as e:
-                    # logger.error(f'key error {e}')
+                    return self._getDisplayColumn(index.column())[index.row()]
+                except (IndexError) as e:
+                    # logger.error(f'index error {e}')
                     return # QtCore.QVariant()
-                else:
-                    if isinstance(retVal, np.float64):
-                        retVal = float(retVal)
-                    elif isinstance(retVal, np.int64):
-                        retVal = int(retVal)
-                    elif isinstance(retVal, np.bool_):
-                        retVal = str(retVal)
-                    elif isinstance(retVal, list):
-                        retVal = str(retVal)
-                    elif isinstance(retVal, str) and retVal == 'nan':
-                        retVal = ''
-
-                    if isinstance(retVal, float) and math.isnan(retVal):
-                        # don't show 'nan' in table
-                        retVal = ''
-                    return retVal
 
             elif role == QtCore.Qt.FontRole:
-                #realRow = self._data.index[index.row()]
-                realRow = index.row()
-                columnName = self._data.columns[index.column()]
                 # if columnName == 'Symbol':
                 #     # make symbols larger
                 #     return QtCore.QVariant(QtGui.QFont('Arial', pointSize=16))
@@ -93,52 +137,6 @@ class pandasModel(QtCore.QAbstractTableModel):
                 return QtCore.QVariant()
                 #return QtCore.QVariant(self._myFont)
 
-            # ~~~~ 10/5: commented out due to error ~~~~
-            # elif role == QtCore.Qt.ForegroundRole:
-            #     columnName = self._data.columns[index.column()]
-            #     colorColumns = ['Symbol', 'Shape Type', 'note']
-            #     #if columnName == 'Symbol':
-            #     if columnName in colorColumns:
-            #         # don't get col from index, get from name
-            #         realRow = self._data.index[index.row()]
-            #         face_color = self._data.loc[realRow, 'Face Color'] # rgba
-            #         # TODO: face_color is sometimes a scalar
-            #         # try:
-            #         #  _color = (np.array(color.getRgb()) / 255).astype(np.float32)
-            #         try:
-            #             #r = int(face_color[0] * 255)
-            #             #g = int(face_color[1] * 255)
-            #             #b = int(face_color[2] * 255)
-            #             #alpha = int(face_color[3] * 255)
-            #             #theColor = QtCore.QVariant(QtGui.QColor(r, g, b, alpha))
-            #             # swap AA
-            #             # napari uses proper order #RRGGBBAA
-            #             # pyqt uses stange order #AARRGGBB
-            #             face_color = face_color[0] + face_color[7:9] + face_color[1:7]
-            #             theColor = QtCore.QVariant(QtGui.QColor(face_color))
-            #             theColor = QtCore.QVariant(QtGui.QColor(200, 100, 100))
-            #             return theColor
-            #         except (IndexError) as e:
-            #             logger.error(f'expecting "Face Color"" as list of rgba, got scalar of {face_color}')
-            #             return QtCore.QVariant()
-            #     return QtCore.QVariant()
-
-            #  ~~~~ 10/5: commented out due to error ~~~~
-            # elif role == QtCore.Qt.BackgroundRole:
-            #     columnName = self._data.columns[index.column()]
-            #     if columnName == 'note':
-            #         realRow = self._data.index[index.row()]
-            #         face_color = self._data.loc[realRow, 'Face Color'] # rgba
-            #         face_color = face_color[0] + face_color[7:9] + face_color[1:7]
-            #         theColor = QtCore.QVariant(QtGui.QColor(face_color))
-            #         theColor = QtCore.QVariant(QtGui.QColor(200, 100, 100))
-            #         return theColor         
-            #     elif index.row() % 2 == 0:
-            #             return QtCore.QVariant()
-            #             #return QtCore.QVariant(QtGui.QColor('#111122'))
-            #     else:
-            #         return QtCore.QVariant()
-            #         #return QtCore.QVariant(QtGui.QColor('#666666'))
         #
         return QtCore.QVariant()
 
@@ -271,33 +269,71 @@ class pandasModel(QtCore.QAbstractTableModel):
 
         # append one empty row
         newRowIdx = len(self._data)
-        self.beginInsertRows(QtCore.QModelIndex(), newRowIdx, newRowIdx)
+        self.beginInsertRows(QtCore.QModelIndex(), newRowIdx, newRowIdx + len(dfRow) - 1)
 
         self._data = pd.concat([self._data, dfRow], ignore_index=True)
+        for columnIdx, columnName in enumerate(self._columnNames):
+            self._updateColumn(columnIdx, np.arange(newRowIdx, len(self._data)))
 
         self.endInsertRows()
 
+    def _updateColumn(self, columnIdx : int, rows : np.ndarray):
+        """Refresh one column array from self._data after rows changed (or were appended).
+
+        Only the changed rows are formatted for display.
+        """
+        oldValues = self._columnValues[columnIdx]
+        newValues = self._data.iloc[:, columnIdx].to_numpy()
+        self._columnValues[columnIdx] = newValues
+
+        displayValues = self._displayValues[columnIdx]
+        if displayValues is None:
+            return
+        if newValues.dtype != oldValues.dtype:
+            # formatting of all rows can change, e.g. int -> float
+            self._displayValues[columnIdx] = None
+            return
+
+        if len(newValues) > len(displayValues):
+            displayValues = np.concatenate([displayValues,
+                                            np.empty(len(newValues) - len(displayValues), dtype=object)])
+            self._displayValues[columnIdx] = displayValues
+        displayValues[rows] = self._formatColumn(newValues[rows])
+
     def myDeleteRows(self, rows: List[int]):
         """Delete a list of rows from model.
 
+        Each contiguous run of rows is removed with beginRemoveRows()/endRemoveRows()
+        so views keep their scroll position and selection of other rows.
+
         Args:
             rows (list of int): row indices to delete
-        
-        TODO: get update of rows to work
         """
         logger.info(f'rows:{rows}')
-        # minRow = min(rows)
-        # maxRow = max(rows)
-        # want this
-        # self.beginRemoveRows(QtCore.QModelIndex(), minRow, maxRow)
-        self.beginResetModel()
-
-        self._data = self._data.drop(rows)
-        self._data = self._data.reset_index(drop=True)
-    
-        # want this
-        # self.endRemoveRows()
-        self.endResetModel()
+
+        numRows = len(self._data)
+        rows = sorted(set(int(row) for row in rows))
+        if len(rows) == 0:
+            return
+        if rows[0] < 0 or rows[-1] >= numRows:
+            logger.error(f'rows out of range, number of rows is {numRows}')
+            return
+
+        # last run first so row positions of earlier runs do not change
+        for firstRow, lastRow in reversed(_contiguousRuns(rows)):
+            self.beginRemoveRows(QtCore.QModelIndex(), firstRow, lastRow)
+
+            _removeSlice = slice(firstRow, lastRow + 1)
+            self._data = self._data.drop(self._data.index[_removeSlice])
+            for columnIdx in range(len(self._columnNames)):
+                self._columnValues[columnIdx] = np.delete(self._columnValues[columnIdx], _removeSlice)
+                if self._displayValues[columnIdx] is not None:
+                    self._displayValues[columnIdx] = np.delete(self._displayValues[columnIdx], _removeSlice)
+
+            self.endRemoveRows()
+
+        if not self.keepIndexOnDelete:
+            self._data = self._data.reset_index(drop=True)
 
     def mySetRow(self, rowList: List[int], df: pd.DataFrame):
         """Set a number of rows from a pandas dataframe.
@@ -307,29 +343,23 @@ class pandasModel(QtCore.QAbstractTableModel):
             df (pd.Dataframe): DataFrame with new values for each row in rowList.
                 Rows of dataframe correspond to enumeration of rowList list
         """
-    
-        #logger.info(f'rowList:{rowList}')
-        #print('  from df:')
-        #pprint(df)
-
         logger.info(f'rowList:{rowList}')
-        
-        for dfIdx, rowIdx in enumerate(rowList):
-            # on switching to v2, was giving error
-            # our df has row indices matching the changed rows (same as rowList)
-            #oneRow = df.loc[dfIdx]
-            oneRow = df.iloc[dfIdx]
-            
-            #IndexError: iloc cannot enlarge its target object
-            self._data.iloc[rowIdx] = oneRow  # needed because we are passed small df that changed
 
-            startIdx = self.index(rowIdx, 0)  # QModelIndex
-            #stopIdx = self.index(rowIdx, self._data.shape[1]-1)  # QModelIndex
-            stopIdx = self.index(rowIdx, self._data.shape[1]-1)  # QModelIndex
-            
-            #print('  startIdx:', startIdx.row(), startIdx.column())
-            #print('  stopIdx:', stopIdx.row(), stopIdx.column())
-            
+        rows = np.asarray(rowList, dtype=np.intp)
+        if len(rows) == 0:
+            return True
+
+        # one vectorised set per column, not one row at a time
+        for columnIdx, columnName in enumerate(self._columnNames):
+            if columnName not in df.columns:
+                continue
+            self._data.iloc[rows, columnIdx] = df[columnName].to_numpy()
+            self._updateColumn(columnIdx, rows)
+
+        lastColumn = len(self._columnNames) - 1
+        for firstRow, lastRow in _contiguousRuns(sorted(set(rowList))):
+            startIdx = self.index(firstRow, 0)  # QModelIndex
+            stopIdx = self.index(lastRow, lastColumn)  # QModelIndex
             self.dataChanged.emit(startIdx, stopIdx)
 
         return True
@@ -0,0 +1,150 @@
+"""Uniform grid index of plotted (x, y) points for rectangle and nearest point queries.
+
+Used by scatter plot selection (Highlighter) on every mouse move and by
+mmMapPlot_mpl to pick the point under the mouse.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+class PointGridIndex:
+    """Points bucketed into a uniform grid of cells (a spatial hash).
+
+    Points are sorted by cell, so each row of cells is a contiguous block.
+    A rectangle query only tests points in the cells it overlaps,
+    O(cells + k) instead of a boolean filter over all points.
+
+    Points are positional (index into x/y). Points with a nan x or y
+    are not indexed and never match.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Plotted values, one per point.
+    pointsPerCell : int
+        Average number of points in a cell, sets the grid size.
+    """
+
+    maxCellsPerAxis = 1024
+
+    def __init__(self, x : np.ndarray, y : np.ndarray, pointsPerCell : int = 8):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.shape != y.shape:
+            raise ValueError(f'x and y have different shapes {x.shape} {y.shape}')
+
+        self._x = x
+        self._y = y
+
+        _finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+
+        if len(_finite) == 0:
+            xMin = xMax = yMin = yMax = 0.0
+        else:
+            xMin, xMax = x[_finite].min(), x[_finite].max()
+            yMin, yMax = y[_finite].min(), y[_finite].max()
+
+        self._numX, self._numY = self._gridShape(len(_finite),
+                                                 xMax - xMin,
+                                                 yMax - yMin,
+                                                 pointsPerCell)
+
+        self._xMin = xMin
+        self._yMin = yMin
+        self._cellWidth = (xMax - xMin) / self._numX or 1.0
+        self._cellHeight = (yMax - yMin) / self._numY or 1.0
+
+        cell = self._cellY(y[_finite]) * self._numX + self._cellX(x[_finite])
+        _order = np.argsort(cell, kind='stable')
+
+        self._order = _finite[_order]
+        # point index sorted by cell
+
+        self._cellStarts = np.searchsorted(cell[_order], np.arange(self._numX * self._numY + 1))
+        # cell -> start of its points in _order, cell points are _order[start[cell]:start[cell+1]]
+
+    def __len__(self):
+        return len(self._order)
+
+    def __str__(self):
+        return f'PointGridIndex points:{len(self)} grid:{self._numX}x{self._numY}'
+
+    @classmethod
+    def _gridShape(cls, numPoints : int, width : float, height : float, pointsPerCell : int) -> Tuple[int, int]:
+        """Number of cells in x and y, about square cells.
+        """
+        numCells = max(1, numPoints // max(1, pointsPerCell))
+        if width > 0 and height > 0:
+            numX = int(round(np.sqrt(numCells * width / height)))
+            numX = min(max(1, numX), numCells)
+            numY = max(1, numCells // numX)
+        elif width > 0:
+            numX, numY = numCells, 1
+        elif height > 0:
+            numX, numY = 1, numCells
+        else:
+            numX, numY = 1, 1
+        return min(numX, cls.maxCellsPerAxis), min(numY, cls.maxCellsPerAxis)
+
+    def _cellX(self, x):
+        _cell = np.floor((x - self._xMin) / self._cellWidth)
+        return np.clip(_cell, 0, self._numX - 1).astype(np.intp)
+
+    def _cellY(self, y):
+        _cell = np.floor((y - self._yMin) / self._cellHeight)
+        return np.clip(_cell, 0, self._numY - 1).astype(np.intp)
+
+    def queryRect(self, xMin : float, xMax : float, yMin : float, yMax : float) -> np.ndarray:
+        """Get points strictly inside a rectangle, sorted.
+
+        Same as np.flatnonzero((x > xMin) & (x < xMax) & (y > yMin) & (y < yMax)).
+        Corners can be in any order.
+        """
+        xMin, xMax = sorted((xMin, xMax))
+        yMin, yMax = sorted((yMin, yMax))
+
+        if len(self._order) == 0 or not np.isfinite([xMin, xMax, yMin, yMax]).all():
+            return np.empty(0, dtype=np.intp)
+
+        # x and y are clipped, points outside the grid are in the edge cells
+        ix0, ix1 = self._cellX(np.array([xMin, xMax]))
+        iy0, iy1 = self._cellY(np.array([yMin, yMax]))
+
+        # each row of cells [ix0, ix1] is one contiguous block of _order
+        _rowCells = np.arange(iy0, iy1 + 1) * self._numX
+        _starts = self._cellStarts[_rowCells + ix0]
+        _stops = self._cellStarts[_rowCells + ix1 + 1]
+        candidates = np.concatenate([self._order[_start:_stop]
+                                     for _start, _stop in zip(_starts, _stops)])
+
+        _x = self._x[candidates]
+        _y = self._y[candidates]
+        _inside = (_x > xMin) & (_x < xMax) & (_y > yMin) & (_y < yMax)
+
+        return np.sort(candidates[_inside])
+
+    def queryRectMask(self, xMin : float, xMax : float, yMin : float, yMax : float) -> np.ndarray:
+        """Boolean mask (one per point) of points strictly inside a rectangle.
+        """
+        mask = np.zeros(self._x.shape, dtype=bool)
+        mask[self.queryRect(xMin, xMax, yMin, yMax)] = True
+        return mask
+
+    def nearest(self, x : float, y : float, xRadius : float, yRadius : float) -> Optional[int]:
+        """Get the point nearest to (x, y) within an ellipse, None if there is no point.
+
+        Distance in x and y is in units of xRadius and yRadius, pass the size
+        of a pixel radius in data units to get the nearest point on screen.
+        """
+        if xRadius <= 0 or yRadius <= 0:
+            return None
+
+        candidates = self.queryRect(x - xRadius, x + xRadius, y - yRadius, y + yRadius)
+        if len(candidates) == 0:
+            return None
+
+        _dist = ((self._x[candidates] - x) / xRadius) ** 2 + ((self._y[candidates] - y) / yRadius) ** 2
+        _nearest = np.argmin(_dist)
+        if _dist[_nearest] > 1:
+            return None
+        return int(candidates[_nearest])
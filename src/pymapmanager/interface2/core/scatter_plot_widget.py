@@ -17,6 +17,8 @@ from matplotlib.widgets import RectangleSelector  # To click+drag rectangular se
 import matplotlib.markers as mmarkers 
 import numpy as np
 import seaborn as sns
+from pymapmanager.interface2.core._blit_manager import BlitManager
+from pymapmanager.interface2.core._point_index import PointGridIndex
 from random import randint
 from PyQt5.QtCore import Qt, QAbstractTableModel
 # from pymapmanager.interface.pmmWidget import PmmWidget
@@ -177,6 +179,10 @@ class Highlighter(object):
         # Initialize original values of given statlists
         self.x = x
         self.y = y
+        self._pointIndex = PointGridIndex(x, y)
+
+        # only redraw the highlight while selecting
+        self._blitManager = BlitManager(self.canvas, [self._highlight])
 
         # logger.info(f'x: {x} x.shape: {x.shape}')
         self.maskPoints = np.zeros(self.x.shape, dtype=bool)
@@ -215,10 +221,14 @@ class Highlighter(object):
     def resetHighlighter(self, ax, x, y, xyIndex):
         self.disconnectCanvas()
         self.ax = ax
+        if self.canvas is not ax.figure.canvas:
+            self._blitManager.disconnect()
+            self._blitManager = BlitManager(ax.figure.canvas)
         self.canvas = ax.figure.canvas
         self.xyStatIndex = xyIndex
         self.x = x
         self.y = y
+        self._pointIndex = PointGridIndex(x, y)
         self.setCanvasConnections()
    
     def _on_spine_pick_event3(self, event):
@@ -277,13 +287,14 @@ class Highlighter(object):
         
         self._HighlighterReleasedEvent()
 
-        self.canvas.draw()
+        self._blitManager.update()
 
     def update_axScatter(self, newAXScatter):
         self.ax = newAXScatter
         (self._highlight, ) = self.ax.plot(
             [], [], "o", markersize=self.markerSize, color="yellow", zorder=10
         )
+        self._blitManager.addArtists([self._highlight])
 
     def get_xyVal(self):
         """
@@ -298,6 +309,7 @@ class Highlighter(object):
         self.y = newY
         self.xyStatIndex = newIndex
         self.maskPoints = np.zeros(self.x.shape, dtype=bool)
+        self._pointIndex = PointGridIndex(newX, newY)
 
     def on_button_release(self, event):
         logger.info(f'Highlighter')
@@ -361,7 +373,7 @@ class Highlighter(object):
         """
         logger.info(f'setting data in highlighter')
         self._highlight.set_data(xStat, yStat)
-        self.canvas.draw()
+        self._blitManager.update()
 
     def on_mouse_move(self, event):
         """When mouse is down, respond to movement and select points.
@@ -390,6 +402,10 @@ class Highlighter(object):
 
         if event1 is None or event2 is None:
             return
+
+        if event1.xdata is None or event2.xdata is None:
+            # mouse down was not in the axes
+            return
         
         _insideMask = self.inside(event1, event2)
         self.maskPoints |= _insideMask
@@ -399,7 +415,7 @@ class Highlighter(object):
 
         # Highlights the data in yellow
         self._highlight.set_data(xy[:,0], xy[:,1])
-        self.canvas.draw()
+        self._blitManager.update()
 
     def inside(self, event1, event2):
         """Returns a boolean mask of the points inside the
@@ -407,7 +423,7 @@ class Highlighter(object):
         """
         x0, x1 = sorted([event1.xdata, event2.xdata])
         y0, y1 = sorted([event1.ydata, event2.ydata])
-        mask = (self.x > x0) & (self.x < x1) & (self.y > y0) & (self.y < y1)
+        mask = self._pointIndex.queryRectMask(x0, x1, y0, y1)
 
         # logger.info(f'inside mask before: {np.where(mask)}')
         return mask
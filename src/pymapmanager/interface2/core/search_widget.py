@@ -1,13 +1,15 @@
 from typing import List, Optional
 from contextlib import contextmanager
 
+import numpy as np
 import pandas as pd
 
 from qtpy import QtGui, QtCore, QtWidgets
-from PyQt5.QtCore import Qt, QSortFilterProxyModel, QAbstractTableModel, QModelIndex, QRegExp
+from PyQt5.QtCore import Qt, QSortFilterProxyModel, QModelIndex, QRegExp
 from PyQt5.QtWidgets import QTableView
 
 from pymapmanager._logger import logger
+from pymapmanager.interface2.core._data_model import pandasModel
 
 class myQSortFilterProxyModel(QSortFilterProxyModel):
     def __init__(self, parent=None):
@@ -123,13 +125,20 @@ class myQSortFilterProxyModel(QSortFilterProxyModel):
     #     else:
     #         return False
     
-class TableModel(QAbstractTableModel):
+class TableModel(pandasModel):
     """
         This will replace Pandas Model 
+
+        Cells are read by position from per column arrays (see pandasModel),
+        not with a label lookup into the dataframe on each paint.
+
+        The dataframe index holds annotation labels (spine or segment ID),
+        it is kept when deleting rows.
     """
+    keepIndexOnDelete = True
+
     def __init__(self, data : pd.DataFrame):
-        super().__init__()
-        self._data : pd.DataFrame = data
+        super().__init__(data)
 
     # NOTE: Only necessary in editable Table View
     # https://www.pythonguis.com/faq/editing-pyqt-tableview/
@@ -150,12 +159,16 @@ class TableModel(QAbstractTableModel):
             if orientation == QtCore.Qt.Horizontal:
                 # print("entering column names")
                 # Shows the column names
-                return self._data.columns[section]
+                return self._columnNames[section]
   
             elif orientation == QtCore.Qt.Vertical:
                 # this is to show pandas 'index' for each row 
                 # vertical headers, the section number corresponds to the row number
-                return self._data.index.tolist()[section]
+                rowLabel = self._data.index[section]
+                # Qt does not display numpy scalars (e.g. np.int64), use the python value
+                if isinstance(rowLabel, np.generic):
+                    rowLabel = rowLabel.item()
+                return rowLabel
             
     # abb 20241121
     # def index(self, visualRowIdx : int):
@@ -169,62 +182,52 @@ class TableModel(QAbstractTableModel):
 
         Returns the data stored under the given role for the item referred to by the index. (in str form)
         """
-        # print("data", self.rowCount(None))
-        # print("role: ", type(role))
         if role == Qt.DisplayRole:
-            # See below for the nested-list data structure.
-            # .row() indexes into the outer list,
-            # .column() indexes into the sub-list
-            # Geting row of model
-            row = index.row()
-
-            # Get the corresponding row within the actual dataframe
-            # They could be different values due to deleting
-            row = self._data.index.tolist()[row]
-            # print("row", row)
-            # if(row != -1):
-       
-            col = index.column()
-                
-            # Get column name
-            colName = self._data.columns[col]
-
+            # row and column are positions, they can differ from the
+            # dataframe index labels due to deleting
             try:
-                
-                # abb 042024
-                # returnVal = self._data.at[row, colName]
-                returnVal = self._data.loc[row, colName]
-
-                # print('qqq Table model used "at" to get row', row, 'colName', colName, 'returnVal:', returnVal)
-
-                # print(f"row: {row} col: {col} colName: {colName} returnVal: {returnVal} returnVal type: {type(returnVal)}")
-                # TODO: possible type checking
-                # return str(returnVal)
-                # return returnVal
-                # data does not like returning numpy ints
-                # type checking to see if value can be converted to int
-
-                try:
-                    checkVal = float(returnVal)
-                except TypeError:
-                    checkVal = None
-                    # logger.info(f"Col {colName} values do not have the correct type")
-                except ValueError:
-                    checkVal = None
-                    # logger.info("table data value is not a float")
-
-                if checkVal is not None and not checkVal.is_integer():
-                      return round(float(returnVal), 2)
-                elif str(returnVal).isdigit(): # check for int
-                    # logger.info(f"colName: {colName}")
-                    return int(returnVal)
-                else:
-                    return str(returnVal)
-
-                # TODO: check if filtering still works after this
-            except KeyError:
-                print(f'Error occurred when accessing dataframe: {KeyError}')
+                return self._getDisplayColumn(index.column())[index.row()]
+            except IndexError:
+                logger.error(f'row:{index.row()} column:{index.column()} out of range')
+
+    def _formatColumn(self, values : np.ndarray):
+        """Format a column for display.
+
+        Floats are rounded to 2 decimals, integer valued floats become str (e.g. '3.0'),
+        non negative ints stay int (for numeric sorting) and everything else becomes str.
+        """
+        kind = values.dtype.kind
+        if kind == 'f':
+            displayValues = np.empty(len(values), dtype=object)
+            with np.errstate(invalid='ignore'):
+                isInteger = np.isfinite(values) & (values == np.floor(values))
+            displayValues[isInteger] = [str(value) for value in values[isInteger].tolist()]
+            # nan and inf are kept as (rounded) floats
+            displayValues[~isInteger] = [round(value, 2) for value in values[~isInteger].tolist()]
+            return displayValues
+        elif kind in 'iu':
+            displayValues = values.astype(object)
+            isNegative = values < 0
+            displayValues[isNegative] = [str(value) for value in values[isNegative].tolist()]
+            return displayValues
+        return super()._formatColumn(values)
+
+    def _formatValue(self, value):
+        """Format one value of an object column, see _formatColumn().
+        """
+        # data does not like returning numpy ints
+        # type checking to see if value can be converted to int
+        try:
+            checkVal = float(value)
+        except (TypeError, ValueError):
+            checkVal = None
 
+        if checkVal is not None and not checkVal.is_integer():
+            return round(checkVal, 2)
+        elif str(value).isdigit(): # check for int
+            return int(value)
+        else:
+            return str(value)
 
     def rowCount(self, index: None):
         """
@@ -269,7 +272,7 @@ class TableModel(QAbstractTableModel):
         n1 = len(self._data)
 
         self.beginResetModel()
-        self._data = df
+        self._setDataFrame(df)
         self.endResetModel()
 
         n2 = len(self._data)
@@ -456,6 +459,40 @@ class myQTableView(QtWidgets.QTableView):
         # want this
         # self.model.updateDF(df)
 
+    def refreshRows(self, df : pd.DataFrame, rowLabels : List[int]):
+        """Patch the current model to df after annotations were edited or deleted.
+
+        Rows no longer in df are removed and rows in rowLabels are set in place,
+        so views only update the changed rows and keep their selection.
+        Falls back to a full updateDataFrame() when rows were added or reordered,
+        or columns changed.
+
+        Args:
+            df: New dataframe, index is row labels.
+            rowLabels: Labels of edited rows.
+        """
+        if self.model is None or list(df.columns) != list(self.model.myGetData().columns):
+            self.updateDataFrame(df)
+            return
+        
+        oldIndex = self.model.myGetData().index
+        isKept = oldIndex.isin(df.index)
+        if not oldIndex[isKept].equals(df.index):
+            # added or reordered rows
+            self.updateDataFrame(df)
+            return
+
+        deleteRows = np.flatnonzero(~isKept).tolist()
+        if len(deleteRows) > 0:
+            self.model.myDeleteRows(deleteRows)
+
+        setLabels = [rowLabel for rowLabel in rowLabels if rowLabel in df.index]
+        if len(setLabels) > 0:
+            setRows = df.index.get_indexer(setLabels).tolist()
+            self.model.mySetRow(setRows, df.loc[setLabels])
+
+        self.df = df
+
     def _setDataFrame(self, newDf):
         """Call this once from init().
         """
@@ -203,26 +203,21 @@ class MapDendrogramWidget(mmWidget2):
         
         # self.mmmPlot.replotMap()
 
-        logger.info('TODO: fix logic, our mmmPlot has a pointer to our local self.plotDict')
-        
-        self.mmmPlot.rebuildPlotDict()  # expensive
+        # our self.plotDict is the same dict as self.mmmPlot.pd
+        self.mmmPlot.rebuildPlotDict()
         self.mmmPlot.replotMap(resetZoom=True)
 
     def _on_set_y_axis(self, yAxis : str):
         logger.info(f'yAxis:{yAxis}')
         self.plotDict['ystat'] = yAxis
-        self.mmmPlot.rebuildPlotDict()  # expensive
+        self.mmmPlot.rebuildPlotDict()
         self.mmmPlot.replotMap(resetZoom=True)
 
     def _on_checkbox(self, name : str, state : bool):
         # logger.info(f'{state} {name}')
 
-        _doReplot = False
         if name == 'Dynamics':
-            self.plotDict['showdynamics'] = state
-            _doReplot = True
+            # only changes marker colors
+            self.mmmPlot.toggledynamics(state)
         else:
-            logger.warning(f'did not understancd "{name}"')
-
-        if _doReplot:
-            self.mmmPlot.replotMap()
\ No newline at end of file
+            logger.warning(f'did not understancd "{name}"')
\ No newline at end of file
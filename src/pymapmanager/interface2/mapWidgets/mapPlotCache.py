@@ -0,0 +1,184 @@
+"""Map wide spine values for map plots, as numpy arrays.
+
+Getting the point dataframe of a map and splitting it into runs (one run per
+spineID across sessions) is the expensive part of building a map plot. This
+is done once per map version (see TimeSeriesCore.version). Switching the
+plotted stats, or the map segment, then only indexes cached arrays.
+"""
+import weakref
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from pymapmanager import TimeSeriesCore
+from pymapmanager._logger import logger
+
+class MapPlotCache:
+    """Columnar cache of all spine values in a map.
+
+    Rows are sorted by (segmentID, spineID, t) so each run is a contiguous
+    block of rows. Columns are converted to numpy arrays the first time
+    they are plotted.
+
+    Use MapPlotCache.getCache(map) to share one cache for all plots of a map.
+
+    Parameters
+    ----------
+    map : TimeSeriesCore
+    """
+
+    _cacheDict = weakref.WeakKeyDictionary()
+    # TimeSeriesCore -> MapPlotCache
+
+    @classmethod
+    def getCache(cls, map : TimeSeriesCore) -> "MapPlotCache":
+        """Get the shared cache for a map.
+        """
+        cache = cls._cacheDict.get(map)
+        if cache is None:
+            cache = cls(map)
+            cls._cacheDict[map] = cache
+        return cache
+
+    def __init__(self, map : TimeSeriesCore):
+        self._map = map
+
+        self._version : Optional[int] = None
+        # map version of the cached values
+
+        self._df : pd.DataFrame = None
+        # map points with (spineID, t) as columns, sorted by (segmentID, spineID, t)
+
+        self._columnDict : Dict[str, np.ndarray] = {}
+        # column name -> values of all rows
+
+        self._segmentDict : Dict[int, dict] = {}
+        # segmentID -> {'rows', 'runStarts', 'markerColor'}, see _getSegment()
+
+        self._numBuilds = 0
+
+    def __str__(self):
+        return f'MapPlotCache version:{self._version} builds:{self._numBuilds} columns:{list(self._columnDict.keys())}'
+
+    @property
+    def numBuilds(self) -> int:
+        """Number of times the map values were (re)loaded.
+        """
+        return self._numBuilds
+
+    def _ensureCurrent(self):
+        if self._version == self._map.version and self._df is not None:
+            return
+
+        df = self._map.getPointDataFrame()
+        if df is None:
+            # no spines
+            df = pd.DataFrame(columns=['spineID', 't', 'segmentID'])
+        else:
+            # move row labels (spineID, t) to columns
+            df = df.reset_index()
+
+        df = df.sort_values(['segmentID', 'spineID', 't'], kind='stable')
+        self._df = df.reset_index(drop=True)
+
+        self._columnDict = {}
+        self._segmentDict = {}
+        self._version = self._map.version
+        self._numBuilds += 1
+
+    def getColumn(self, columnName : str) -> np.ndarray:
+        """Get values of one column for all rows.
+
+        Unknown columns are all nan.
+        """
+        self._ensureCurrent()
+        values = self._columnDict.get(columnName)
+        if values is None:
+            if columnName in self._df.columns:
+                values = self._df[columnName].to_numpy()
+            else:
+                logger.error(f'did not find column "{columnName}" in map points')
+                values = np.full(len(self._df), np.nan)
+            self._columnDict[columnName] = values
+        return values
+
+    def _getSegment(self, segmentID : int) -> dict:
+        """Get the rows, run starts and dynamics marker and run colors for one map segment.
+        """
+        self._ensureCurrent()
+        segmentDict = self._segmentDict.get(segmentID)
+        if segmentDict is not None:
+            return segmentDict
+
+        rows = np.flatnonzero(self.getColumn('segmentID') == segmentID)
+        spineID = self.getColumn('spineID')[rows]
+        t = self.getColumn('t')[rows]
+
+        # rows are sorted by spineID, a run starts where spineID changes
+        runStarts = np.flatnonzero(np.r_[len(rows) > 0, spineID[1:] != spineID[:-1]])
+        runStops = np.r_[runStarts[1:], len(rows)][:len(runStarts)] - 1  # last row of each run
+
+        lastSession = self._map.numSessions - 1
+
+        markerColor = np.full(len(rows), 'w', dtype=object)
+        isTransient = runStarts == runStops
+        isAdded = ~isTransient & (t[runStarts] != 0)
+        isSubtracted = ~isTransient & (t[runStops] != lastSession)
+        markerColor[runStarts[isAdded]] = 'g'
+        markerColor[runStops[isSubtracted]] = 'r'
+        markerColor[runStarts[isTransient]] = 'b'
+
+        # one color per run line, '' for the default line color
+        runColor = np.full(len(runStarts), '', dtype=object)
+        runColor[isAdded] = 'g'
+        runColor[isSubtracted] = 'r'
+        runColor[isTransient] = 'b'
+
+        segmentDict = {
+            'rows': rows,
+            'runStarts': runStarts,
+            'markerColor': markerColor,
+            'runColor': runColor,
+        }
+        self._segmentDict[segmentID] = segmentDict
+        return segmentDict
+
+    def fillPlotDict(self, plotDict : dict) -> dict:
+        """Fill in the values to plot for plotDict 'xstat', 'ystat' and 'segmentid'.
+
+        Sets keys (x, y, xyPlotSpineID, xyPlotTimepoint, markerColor, runStarts,
+        runColor, xPlotLines, yPlotLines, xSpineLineDict, ySpineLineDict).
+        Point values are arrays, one element per plotted point.
+        Each run is a contiguous block of points starting at 'runStarts'.
+        """
+        segmentDict = self._getSegment(plotDict['segmentid'])
+        rows = segmentDict['rows']
+        runStarts = segmentDict['runStarts']
+
+        x = self.getColumn(plotDict['xstat'])[rows]
+        y = self.getColumn(plotDict['ystat'])[rows]
+        spineID = self.getColumn('spineID')[rows]
+
+        plotDict['x'] = x
+        plotDict['y'] = y
+        plotDict['xyPlotSpineID'] = spineID
+        plotDict['xyPlotTimepoint'] = self.getColumn('t')[rows]
+        plotDict['markerColor'] = list(segmentDict['markerColor'])
+        plotDict['runStarts'] = runStarts
+        plotDict['runColor'] = list(segmentDict['runColor'])
+
+        # one (view) array per run
+        if len(runStarts) > 0:
+            xPlotLines = np.split(x, runStarts[1:])
+            yPlotLines = np.split(y, runStarts[1:])
+        else:
+            xPlotLines = []
+            yPlotLines = []
+        runSpineIDs = spineID[runStarts].tolist()
+        plotDict['xPlotLines'] = xPlotLines
+        plotDict['yPlotLines'] = yPlotLines
+        plotDict['xSpineLineDict'] = dict(zip(runSpineIDs, xPlotLines))
+        plotDict['ySpineLineDict'] = dict(zip(runSpineIDs, yPlotLines))
+
+        return plotDict
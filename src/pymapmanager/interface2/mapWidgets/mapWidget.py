@@ -5,10 +5,13 @@ import numpy as np
 
 from qtpy import QtWidgets
 
+import pymapmanager
 from pymapmanager.timeseriesCore import TimeSeriesCore
 
 from pymapmanager.interface2.stackWidgets.stackWidget2 import stackWidget2
 from pymapmanager.interface2.mapWidgets.mapTableWidget import mapTableWidget
+from pymapmanager.interface2.mapWidgets.stackRunLoader import StackRunLoader
+from pymapmanager.interface2.mapWidgets.sliceRenderCoordinator import SliceRenderCoordinator
 from pymapmanager.interface2.mainWindow import MainWindow
 
 from pymapmanager.interface2.stackWidgets.event.spineEvent import (AddSpineEvent, 
@@ -71,6 +74,13 @@ class mapWidget(MainWindow):
         # dict of open stackWidget children
         # keys are session number
 
+        self._sliceRenderCoordinator : SliceRenderCoordinator = None
+        # created on first linked slice change, see linkOpenPlot_slice()
+
+        self._stackRunLoader : StackRunLoader = None
+        self._stackRunDict : dict = None
+        # state while opening a run of stacks, see _openStackRunStaged()
+
         # self._buildMenus()
 
         self._buildUI()
@@ -161,31 +171,130 @@ class mapWidget(MainWindow):
         
         logger.info(f'firstTp:{firstTp} lastTp:{lastTp} spineID:{spineID}')
 
+        posRectDict = {}
+        for tp in range(firstTp, lastTp):
+            if _multipleTp:
+                posRectDict[tp] = screenGrid[tp]
+            else:
+                posRectDict[tp] = [10, 10, 500, 500]
+
+        loadSessions = [tp for tp in posRectDict.keys() if tp not in self._stackWidgetDict.keys()]
+
+        if len(loadSessions) > 1:
+            # already open stack widgets
+            for tp in posRectDict.keys():
+                if tp in self._stackWidgetDict.keys():
+                    self._setupRunStackWidget(self._stackWidgetDict[tp], _multipleTp, spineID)
+
+            # load the rest in parallel, attach each widget when its stack is loaded
+            self._openStackRunStaged(loadSessions, posRectDict, _multipleTp, spineID)
+            return
+
         for tp in range(firstTp, lastTp):
             if tp in self._stackWidgetDict.keys():
                 bsw = self._stackWidgetDict[tp]
             else:
-                if _multipleTp:
-                    posRect = screenGrid[tp]
-                else:
-                    posRect = [10, 10, 500, 500]
-                bsw = self.openStack2(tp, posRect=posRect)
-
-            # toggle interface
-            # dict_keys(['top toolbar', 'Point List', 'Line List', 'image plot', 'Histogram'])
-            if _multipleTp:
-                bsw._toggleWidget("Top Toolbar", False)
-                bsw._toggleWidget("Point List", False)
-                bsw._toggleWidget("Segment List", False)
-                # bsw._toggleWidget("Status Bar", False)
-
-            # select a point and zoom
-            if spineID is not None:
-                bsw.zoomToPointAnnotation(spineID, isAlt=True, select=True)
+                bsw = self.openStack2(tp, posRect=posRectDict[tp])
+            self._setupRunStackWidget(bsw, _multipleTp, spineID)
 
         if spineID and _multipleTp:
             self.linkOpenPlots(link=True)
 
+    def _setupRunStackWidget(self, bsw : stackWidget2, multipleTp : bool, spineID : int = None):
+        """Set up one stack widget in a run, see openStackRun().
+        """
+        # toggle interface
+        # dict_keys(['top toolbar', 'Point List', 'Line List', 'image plot', 'Histogram'])
+        if multipleTp:
+            bsw._toggleWidget("Top Toolbar", False)
+            bsw._toggleWidget("Point List", False)
+            bsw._toggleWidget("Segment List", False)
+            # bsw._toggleWidget("Status Bar", False)
+
+        # select a point and zoom
+        if spineID is not None:
+            bsw.zoomToPointAnnotation(spineID, isAlt=True, select=True)
+
+    def _openStackRunStaged(self,
+                            sessionList : List[int],
+                            posRectDict : dict,
+                            multipleTp : bool,
+                            spineID : int = None):
+        """Load stacks for sessions on worker threads and open a stack widget as each is loaded.
+
+        Shows a progress dialog, cancel stops loading sessions that have not started.
+        """
+        if self._stackRunLoader is not None:
+            logger.warning('already opening a run of stacks -->> cancelling it')
+            oldLoader = self._stackRunLoader
+            oldProgress = self._stackRunDict['progress']
+            oldLoader.cancel()
+            # its signalFinished is ignored once replaced, close its progress here
+            oldProgress.close()
+
+        progress = QtWidgets.QProgressDialog(f'Loading {len(sessionList)} sessions ...',
+                                             'Cancel', 0, len(sessionList), self)
+        progress.setWindowTitle('Open Stacks')
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+        progress.show()
+
+        # annotations are built on the GUI thread one session per event loop step,
+        # image data of each built session is loaded on worker threads
+        loader = StackRunLoader.fromMap(self._map, sessionList)
+        progress.canceled.connect(loader.cancel)
+
+        self._stackRunLoader = loader
+        self._stackRunDict = {
+            'posRectDict': posRectDict,
+            'multipleTp': multipleTp,
+            'spineID': spineID,
+            'progress': progress,
+        }
+
+        loader.signalStackLoaded.connect(self._slot_stackRunLoaded)
+        loader.signalStackFailed.connect(self._slot_stackRunFailed)
+        loader.signalFinished.connect(self._slot_stackRunFinished)
+
+        logger.info(f'{loader}')
+        loader.start()
+
+    def _slot_stackRunLoaded(self, session : int, stack : "pymapmanager.stack"):
+        loader = self.sender()
+        if loader is not self._stackRunLoader:
+            return
+        
+        if session in self._stackWidgetDict.keys():
+            # opened while we were loading
+            bsw = self._stackWidgetDict[session]
+        else:
+            posRect = self._stackRunDict['posRectDict'][session]
+            bsw = self.openStack(session=session, posRect=posRect, stack=stack)
+        self._setupRunStackWidget(bsw,
+                                  self._stackRunDict['multipleTp'],
+                                  self._stackRunDict['spineID'])
+        
+        self._stackRunDict['progress'].setValue(loader.numDone)
+
+    def _slot_stackRunFailed(self, session : int, error : str):
+        loader = self.sender()
+        if loader is not self._stackRunLoader:
+            return
+        logger.error(f'did not open session:{session} {error}')
+        self._stackRunDict['progress'].setValue(loader.numDone)
+
+    def _slot_stackRunFinished(self):
+        loader = self.sender()
+        if loader is not self._stackRunLoader:
+            return
+        self._stackRunDict['progress'].close()
+
+        if self._stackRunDict['spineID'] and self._stackRunDict['multipleTp']:
+            self.linkOpenPlots(link=True)
+
+        self._stackRunLoader = None
+        self._stackRunDict = None
+
     def getNumSessions(self):
         return self.getMap().numSessions
     
@@ -221,6 +330,7 @@ class mapWidget(MainWindow):
     def openStack(self,
                   session : int,
                   posRect : List[int] = None,
+                  stack : "pymapmanager.stack" = None,
                   ) -> stackWidget2:
         """Open a stack widget for one map session.
         
@@ -229,6 +339,8 @@ class mapWidget(MainWindow):
         session : int
         postRect : List[int]
             Position for the window [l, t, w, h]
+        stack : pymapmanager.stack
+            Already loaded stack for session, if None then the stack widget loads it
         """
 
         if session in self._stackWidgetDict.keys():
@@ -238,7 +350,8 @@ class mapWidget(MainWindow):
         
         bsw = stackWidget2(timeseriescore=self._map,
                                                         mapWidget=self,
-                                                        timepoint=session)
+                                                        timepoint=session,
+                                                        stack=stack)
 
         bsw.setWindowTitle(f'map {os.path.split(self._map.path)[1]} session {session}')
 
@@ -264,14 +377,37 @@ class mapWidget(MainWindow):
         return bsw
 
     def linkOpenPlot_slice(self, slice):
+        """Set the slice of all linked stack windows.
+
+        Slices are loaded in parallel by self._sliceRenderCoordinator,
+        each window is updated in _applyLinkedSlice() when its slice is loaded.
+        """
         logger.info(f'slice:{slice}')
         if self._blockSlots:
             logger.info(f'  -->> return block slots True')
             return
-        self._blockSlots = True
+        
+        if self._sliceRenderCoordinator is None:
+            self._sliceRenderCoordinator = SliceRenderCoordinator(self._applyLinkedSlice)
+
+        # the window that changed slice is already showing it
+        senderPlotWidget = self.sender()
         for tp, widget in self._stackWidgetDict.items():
             _imagePlotWidget = widget._getNamedWidget('Image Viewer')
-            _imagePlotWidget.slot_setSlice(slice)
+            if _imagePlotWidget is senderPlotWidget:
+                continue
+            self._sliceRenderCoordinator.requestSlice(tp, _imagePlotWidget.prepareSlice, slice)
+
+    def _applyLinkedSlice(self, tp : int, slice : int):
+        """Show a loaded slice in one stack window, called by self._sliceRenderCoordinator.
+        """
+        widget = self._stackWidgetDict.get(tp, None)
+        if widget is None:
+            # closed while loading
+            return
+        _imagePlotWidget = widget._getNamedWidget('Image Viewer')
+        self._blockSlots = True
+        _imagePlotWidget.slot_setSlice(slice)
         self._blockSlots = False
 
     def linkOpenPlots(self, link=True):
@@ -293,13 +429,14 @@ class mapWidget(MainWindow):
             # prevPlotWidget = widget._imagePlotWidget._plotWidget
             prevPlotWidget = _imagePlotWidget._plotWidget
 
-            # this works but we get recursion
+            # recursion is broken by self._blockSlots, see _applyLinkedSlice()
+            try:
+                # do not connect twice
+                _imagePlotWidget.signalSliceChanged.disconnect(self.linkOpenPlot_slice)
+            except TypeError:
+                pass
             if link:
-                # widget._imagePlotWidget.signalUpdateSlice.connect(self.linkOpenPlot_slice)
-                _imagePlotWidget.signalUpdateSlice.connect(self.linkOpenPlot_slice)
-            else:
-                # widget._imagePlotWidget.signalUpdateSlice.disconnect()
-                _imagePlotWidget.signalUpdateSlice.disconnect()
+                _imagePlotWidget.signalSliceChanged.connect(self.linkOpenPlot_slice)
 
     def slot_MouseMoveEvent(self, event):
         return
@@ -413,6 +550,9 @@ class mapWidget(MainWindow):
         """
         logger.warning('NEED TO CHECK IF DIRTY AND PROMPT TO SAVE')
         
+        if self._sliceRenderCoordinator is not None:
+            self._sliceRenderCoordinator.shutdown()
+
         self.getApp().closeMapWindow(self)
 
     def closeStackWindow(self, stackWidget):
@@ -7,8 +7,12 @@ import pandas as pandas
 import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.widgets import RectangleSelector  # To click+drag rectangular selection
+from matplotlib.collections import LineCollection
 
 from pymapmanager import TimeSeriesCore
+from pymapmanager.interface2.core._blit_manager import BlitManager
+from pymapmanager.interface2.core._point_index import PointGridIndex
+from pymapmanager.interface2.mapWidgets.mapPlotCache import MapPlotCache
 from pymapmanager._logger import logger
 
 def _old_getPlotDict_mpl():
@@ -103,8 +107,13 @@ class mmMapPlot_mpl():
 
         self._lastClickDict = None
 
-        # abb removed core
-        self.rebuildPlotDict()  # expensive
+        self._plotCache = MapPlotCache.getCache(self.map)
+        # map values shared by all plots of the map
+
+        self._pointIndex : PointGridIndex = None
+        # index of plotted (x, y) for picking, built on first pick, see _getPointIndex()
+
+        self.rebuildPlotDict()
 
         if self.pd['doDark']:
             plt.style.use('dark_background')
@@ -159,7 +168,7 @@ class mmMapPlot_mpl():
                                             marker='o',
                                             s=markersize,
                                             zorder=zOrderScatter,
-                                            picker=True)
+                                            picker=self._pickScatter)
                 
         #
         # line plot (between points in a run)
@@ -173,21 +182,15 @@ class mmMapPlot_mpl():
         #                                 zorder=zOrderLines,
         #                                 picker=False)
 
-        #lines
-        # logger.info(f'lineColor:{lineColor} linewidth:{linewidth} zOrderLines:{zOrderLines}')
-        plotDict = self.pd
-        self.myLinePlotList = []
-        for idx, xPlotLine in enumerate(plotDict['xPlotLines']):
-            yPlotLine = plotDict['yPlotLines'][idx]
-            # logger.info(f'idx:{idx} xPlotLine:{xPlotLine} yPlotLine:{yPlotLine}')
-            _oneLine = self.axes.plot(xPlotLine,
-                                yPlotLine,
-                                c=lineColor,
-                                linewidth=linewidth,
-                                zorder=zOrderLines,
-                                picker=False,
-                                )
-            self.myLinePlotList.append(_oneLine)
+        # lines, one LineCollection with one segment per run
+        self._lineColor = lineColor
+        self.myRunLines = LineCollection([],
+                                         colors=lineColor,
+                                         linewidths=linewidth,
+                                         zorder=zOrderLines,
+                                         picker=False)
+        self.axes.add_collection(self.myRunLines, autolim=False)
+        self._buildRunLines()
 
         # logger.info(f'self.myLinePlot: {self.myLinePlot}')
         # logger.info(f'   self.myLinePlot: {len(self.myLinePlot)}')
@@ -217,8 +220,12 @@ class mmMapPlot_mpl():
                                                 zorder = zOrderPointSelection,
                                                 picker = False)
 
-        self.toggledynamics(self.pd['showdynamics'])
-        self.togglelines(self.pd['showlines'])
+        # selection changes only redraw the selection
+        self._blitManager = BlitManager(self.figure.canvas,
+                                        [self.mySelectedRows, self.myPointSelection])
+
+        self.toggledynamics(self.pd['showdynamics'], doRefresh=False)
+        self.togglelines(self.pd['showlines'], doRefresh=False)
 
         self._segmentLines = None
         self._buildSegmentLines()
@@ -228,6 +235,56 @@ class mmMapPlot_mpl():
 
         # self.axes.autoscale(False)
 
+    def _buildRunLines(self):
+        """Set the run lines (spineID across sessions) from the plot dict.
+
+        All runs are drawn by one LineCollection so the number of artists
+        does not grow with the number of runs. Run colors follow 'showdynamics'.
+        """
+        xy = np.column_stack([self.pd['x'], self.pd['y']]).astype(float)
+        runStarts = self.pd['runStarts']
+        if len(runStarts) > 0:
+            segments = np.split(xy, runStarts[1:])
+        else:
+            segments = []
+        self.myRunLines.set_segments(segments)
+        self._setRunLineDynamics()
+
+    def _setRunLineDynamics(self):
+        """Color added (g), subtracted (r) and transient (b) runs when showing dynamics.
+        """
+        if self.pd['showdynamics']:
+            colors = [runColor if runColor else self._lineColor for runColor in self.pd['runColor']]
+        else:
+            colors = None
+        self.setRunLineStyle(colors=colors, doRefresh=False)
+
+    def setRunLineStyle(self, colors = None, visibleMask : np.ndarray = None, doRefresh=True):
+        """Set the color and visibility of each run line.
+
+        Parameters
+        ----------
+        colors : str | List
+            One color for all runs or one color per run (in order of plotDict['runStarts']).
+            None for the default line color.
+        visibleMask : np.ndarray
+            One bool per run, runs that are False are not drawn. None to draw all runs.
+        """
+        numRuns = len(self.pd['runStarts'])
+        if colors is None:
+            colors = self._lineColor
+        rgba = matplotlib.colors.to_rgba_array(colors)
+        if len(rgba) not in (1, numRuns):
+            logger.error(f'got {len(rgba)} colors for {numRuns} runs -->> using the first color')
+        if len(rgba) != numRuns:
+            rgba = np.broadcast_to(rgba[0], (numRuns, 4)).copy()
+        if visibleMask is not None:
+            rgba[~np.asarray(visibleMask, dtype=bool), 3] = 0
+        self.myRunLines.set_colors(rgba)
+
+        if doRefresh:
+            self._refreshFigure()
+
     def _getUserSelection(self, ind : int) -> dict:
         """Get use selection from _on_pick.
         """
@@ -238,8 +295,8 @@ class mmMapPlot_mpl():
             'x' : self.pd['x'][ind],
             'y' : self.pd['y'][ind],
 
-            'spineID' : self.pd['xyPlotSpineID'][ind],
-            'timepoint' : self.pd['xyPlotTimepoint'][ind],
+            'spineID' : int(self.pd['xyPlotSpineID'][ind]),
+            'timepoint' : int(self.pd['xyPlotTimepoint'][ind]),
             # 'segmentID' : self.pd['xySegmentID'][ind],
 
             'isAlt' : self._isAlt,
@@ -249,6 +306,41 @@ class mmMapPlot_mpl():
  
         return ret
     
+    def _getPointIndex(self) -> PointGridIndex:
+        if self._pointIndex is None:
+            self._pointIndex = PointGridIndex(self.pd['x'], self.pd['y'])
+        return self._pointIndex
+
+    def _pickScatter(self, artist, mouseevent):
+        """Picker for the main scatter, find the nearest point to the mouse.
+
+        Like the default collection picker, a point is hit within its marker
+        radius plus pickradius (pixels), but uses the point index rather than
+        testing all points.
+
+        Returns
+        -------
+        (hit, dict(ind=[ind]))
+        """
+        if mouseevent.inaxes is not self.axes or mouseevent.xdata is None:
+            return False, {}
+
+        # marker size is area in points^2
+        markerRadius = np.sqrt(self.pd['markersize']) / 2 * self.figure.dpi / 72
+        pixelRadius = markerRadius + artist.get_pickradius()
+
+        # data units per pixel
+        bbox = self.axes.bbox
+        xMin, xMax = self.axes.get_xlim()
+        yMin, yMax = self.axes.get_ylim()
+        xRadius = pixelRadius * abs(xMax - xMin) / bbox.width
+        yRadius = pixelRadius * abs(yMax - yMin) / bbox.height
+
+        ind = self._getPointIndex().nearest(mouseevent.xdata, mouseevent.ydata, xRadius, yRadius)
+        if ind is None:
+            return False, {}
+        return True, dict(ind=np.array([ind]))
+
     def _on_pick(self, event):
         """Respond to user clicking on a point in the scatter.
         
@@ -297,7 +389,7 @@ class mmMapPlot_mpl():
         if self._on_pick_fn is not None:
             self._on_pick_fn(_lastClickDict)
 
-        self._refreshFigure()
+        self._refreshSelection()
 
     def getLastClickDict(self):
         return self._lastClickDict
@@ -340,7 +432,7 @@ class mmMapPlot_mpl():
                 logger.info('nope')
                 return
             self.cancelSelection()
-            self.rebuildPlotDict()  # expensive
+            self.rebuildPlotDict()
             self.replotMap(resetZoom=True)
         elif event.key == 'down':
             # go to the previous map segment
@@ -351,7 +443,7 @@ class mmMapPlot_mpl():
                 logger.info('nope')
                 return
             self.cancelSelection()
-            self.rebuildPlotDict()  # expensive
+            self.rebuildPlotDict()
             self.replotMap(resetZoom=True)
         
         elif event.key in ['left', 'right', 'alt+left', 'alt+right']:
@@ -385,7 +477,7 @@ class mmMapPlot_mpl():
 
         self._refreshFigure()
 
-    def toggledynamics(self, onoff : Optional[bool] = None):
+    def toggledynamics(self, onoff : Optional[bool] = None, doRefresh=True):
         logger.info('TODO')
 
         if onoff is not None:
@@ -404,7 +496,10 @@ class mmMapPlot_mpl():
                 cMatrix = 'k'
             self.myScatterPlot.set_color(cMatrix)
 
-        self._refreshFigure()
+        self._setRunLineDynamics()
+
+        if doRefresh:
+            self._refreshFigure()
 
     def toggleMarkers(self):
         isVisible = self.myScatterPlot.get_visible()
@@ -412,7 +507,7 @@ class mmMapPlot_mpl():
 
         self._refreshFigure()
     
-    def togglelines(self, onoff : Optional[bool] = None):
+    def togglelines(self, onoff : Optional[bool] = None, doRefresh=True):
         logger.info('TODO')
     
         if onoff is not None:
@@ -424,11 +519,10 @@ class mmMapPlot_mpl():
         
         logger.info(f'onoff:{onoff} showLines:{showLines}')
 
-        for line in self.myLinePlotList:
-            for line0 in line:
-                line0.set_visible(showLines)
+        self.myRunLines.set_visible(showLines)
 
-        self._refreshFigure()
+        if doRefresh:
+            self._refreshFigure()
 
     def _buildSegmentLines(self):
         """Used in a dendrogram to draw vertical lines, one line for each session.
@@ -492,7 +586,7 @@ class mmMapPlot_mpl():
         self.cancelPointSelection()
         self.cancelRunSelection()
     
-        self._refreshFigure()
+        self._refreshSelection()
     
     def cancelPointSelection(self):
         self.myPointSelection.set_xdata([])
@@ -572,7 +666,7 @@ class mmMapPlot_mpl():
         # self.myPointSelection.set_ydata([yList])
 
         if doRefresh:
-            self._refreshFigure()
+            self._refreshSelection()
 
         if doEmit:
             # emit selection to parent
@@ -598,7 +692,7 @@ class mmMapPlot_mpl():
         self.mySelectedRows.set_ydata(ySpineRun)
 
         if doRefresh:
-            self._refreshFigure()
+            self._refreshSelection()
 
     def _refreshFigure(self):
         """Call this whenever the plot changes.
@@ -607,6 +701,11 @@ class mmMapPlot_mpl():
         self.figure.canvas.draw()
         # self.figure.canvas.flush_events()
 
+    def _refreshSelection(self):
+        """Call this when only the point or run selection changes.
+        """
+        self._blitManager.update()
+
     def connect_on_pick(self, onPickCallback):
         """Connect a callback to be triggered on a pick event.
         
@@ -624,11 +723,38 @@ class mmMapPlot_mpl():
             - Y-Stat
             - Segments
             - Sessions
+
+        Call rebuildPlotDict() first. Existing artists are updated with the
+        new values, the axes are not cleared.
         """
+        _x = self.pd['x']
+        _y = self.pd['y']
+        xy = np.column_stack([_x, _y]).astype(float)
+        
+        self.myScatterPlot.set_offsets(xy)
+        self._pointIndex = None
+        self.myScatterPlot.set_sizes(np.full(len(xy), self.pd['markersize']))
+        self.toggledynamics(self.pd['showdynamics'], doRefresh=False)
 
-        self.axes.clear()
-        self._buildUI()
-        return
+        self._buildRunLines()
+        self.togglelines(self.pd['showlines'], doRefresh=False)
+
+        self._indSelectionList = []
+        self.cancelPointSelection()
+        self.cancelRunSelection()
+
+        # data limits from the new values only
+        finiteXY = xy[np.isfinite(xy).all(axis=1)]
+        self.axes.ignore_existing_data_limits = True
+        if len(finiteXY) > 0:
+            self.axes.update_datalim(finiteXY)
+
+        if resetZoom:
+            self.axes.autoscale_view()
+            self._origXLim = self.axes.get_xlim()
+            self._origYLim = self.axes.get_ylim()
+
+        self._refreshFigure()
 
     def resetZoom(self):
         self.axes.set_xlim(self._origXLim)
@@ -756,9 +882,11 @@ class mmMapPlot_mpl():
         return pd
 
     def rebuildPlotDict(self):
-        # self.pd = self.getMapValues3(self.pd)
-        from mapmanagercore.map_utils import getMapValues3
-        self.pd = getMapValues3(self.map._fullMap, self.pd)
+        """Fill in the plot dict values for the current 'xstat', 'ystat' and 'segmentid'.
+
+        Values come from the map wide MapPlotCache, the plot dict is updated in place.
+        """
+        self.pd = self._plotCache.fillPlotDict(self.pd)
 
     def _printPlotDict(self):
         logger.info('pd is:')
@@ -0,0 +1,145 @@
+"""Change the slice of linked stack windows in parallel.
+
+When stack windows in a map are linked, a slice change in one window is
+sent to all the others. Loading the image planes for a slice is the slow
+part and each session reads its own (independent) zarr chunks, so the
+planes for all sessions are loaded on a pool of worker threads. Each
+window is then shown at the new slice on the GUI thread as soon as its
+planes are ready.
+
+Only the latest slice for each session is kept. A request made while
+an older request for that session is loading replaces it, and the older
+result is dropped.
+"""
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Set, Tuple
+
+from qtpy import QtCore
+
+from pymapmanager._logger import logger
+
+class SliceRenderCoordinator(QtCore.QObject):
+    """Load slices for a number of stack windows on worker threads.
+
+    Parameters
+    ----------
+    applySlice : Callable[[Hashable, int], None]
+        Show a slice in one window, called on the GUI thread once the
+        slice is loaded. Called with (key, sliceNumber).
+    numWorkers : int
+        Number of worker threads, default is defaultNumWorkers.
+    """
+
+    _signalDone = QtCore.Signal(object, int, int)
+    # (key, sliceNumber, requestId) from worker threads, queued to the GUI thread
+
+    defaultNumWorkers = 4
+
+    def __init__(self,
+                 applySlice : Callable[[Hashable, int], None],
+                 numWorkers : int = None):
+        super().__init__()
+
+        self._applySlice = applySlice
+
+        if numWorkers is None:
+            numWorkers = min(self.defaultNumWorkers, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, numWorkers),
+                                            thread_name_prefix='SliceRenderCoordinator')
+
+        self._requestIds = itertools.count()
+
+        self._latestDict : Dict[Hashable, Tuple[int, int, Callable[[int], None]]] = {}
+        # key -> (requestId, sliceNumber, prepareSlice), latest request not yet shown
+
+        self._inFlight : Set[Hashable] = set()
+        # keys with a request loading on a worker thread
+
+        self._numApplied = 0
+        self._numDropped = 0
+
+        self._isShutdown = False
+
+        self._signalDone.connect(self._onDone, QtCore.Qt.QueuedConnection)
+
+    def __str__(self):
+        return f'SliceRenderCoordinator inFlight:{len(self._inFlight)} applied:{self._numApplied} dropped:{self._numDropped}'
+
+    @property
+    def numApplied(self) -> int:
+        return self._numApplied
+
+    @property
+    def numDropped(self) -> int:
+        """Number of loaded slices that were not shown because a newer slice was requested.
+        """
+        return self._numDropped
+
+    def requestSlice(self,
+                     key : Hashable,
+                     prepareSlice : Callable[[int], None],
+                     sliceNumber : int):
+        """Request one window to show a slice.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies the window, like a map session.
+        prepareSlice : Callable[[int], None]
+            Load everything needed to show a slice, called on a worker thread.
+            See imagePlotWidget2.prepareSlice().
+        sliceNumber : int
+        """
+        if self._isShutdown:
+            return
+        requestId = next(self._requestIds)
+        self._latestDict[key] = (requestId, sliceNumber, prepareSlice)
+        if key not in self._inFlight:
+            self._submit(key)
+
+    def _submit(self, key : Hashable):
+        requestId, sliceNumber, prepareSlice = self._latestDict[key]
+        self._inFlight.add(key)
+        self._executor.submit(self._worker, key, prepareSlice, sliceNumber, requestId)
+
+    def _worker(self, key, prepareSlice, sliceNumber : int, requestId : int):
+        try:
+            prepareSlice(sliceNumber)
+        except Exception as e:
+            # applySlice() will load the slice on the GUI thread
+            logger.error(f'key:{key} sliceNumber:{sliceNumber} {e}')
+        self._signalDone.emit(key, sliceNumber, requestId)
+
+    def _onDone(self, key, sliceNumber : int, requestId : int):
+        """Called on the GUI thread when a worker has loaded a slice.
+        """
+        self._inFlight.discard(key)
+        if self._isShutdown:
+            return
+
+        latest = self._latestDict.get(key)
+        if latest is None:
+            return
+
+        if latest[0] != requestId:
+            # superseded while loading, load the latest instead
+            self._numDropped += 1
+            self._submit(key)
+            return
+
+        self._latestDict.pop(key)
+        self._numApplied += 1
+        try:
+            self._applySlice(key, sliceNumber)
+        except RuntimeError as e:
+            # window was closed
+            logger.warning(f'key:{key} did not show slice {sliceNumber}: {e}')
+
+    def shutdown(self):
+        """Drop pending requests and stop the worker threads.
+        """
+        self._isShutdown = True
+        self._latestDict.clear()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,207 @@
+"""Load the data for a run of map sessions on worker threads.
+
+Building a pymapmanager.stack (annotations, header, first image slice and
+contrast) is the slow part of opening a stack widget. StackRunLoader loads
+one stack per session concurrently and emits signalStackLoaded (on the GUI
+thread) as each one is ready, so stack widgets can be attached one at a time.
+
+The annotations of all sessions are built from the one core map, which is not
+thread safe (computed columns are written into shared dataframes). Use
+StackRunLoader.fromMap() to build the annotations on the GUI thread, one
+session per event loop step, and load image data (first slice, contrast and
+intensity stats) of each built session on the workers.
+"""
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from qtpy import QtCore
+
+import pymapmanager
+from pymapmanager._logger import logger
+
+class StackRunLoader(QtCore.QObject):
+    """Build stacks for a list of sessions in a worker pool.
+
+    Parameters
+    ----------
+    loadStack : Callable[[int], pymapmanager.stack]
+        Function to load the stack for one session, called on a worker thread.
+        Must not touch the annotations of the core map, see fromMap().
+    sessionList : List[int]
+        Sessions to load, submitted in this order.
+    numWorkers : int
+        Number of worker threads, default is defaultNumWorkers.
+    buildStack : Callable[[int], None]
+        Optional, called on the GUI thread for one session at a time, each
+        in its own event loop step. The session is submitted to the worker
+        pool as soon as it returns.
+    """
+
+    signalStackLoaded = QtCore.Signal(int, object)
+    # (session, pymapmanager.stack)
+
+    signalStackFailed = QtCore.Signal(int, str)
+    # (session, error)
+
+    signalFinished = QtCore.Signal()
+    # all sessions are loaded, failed or cancelled
+
+    _signalDone = QtCore.Signal(int, object, str)
+    # from worker threads, queued to the GUI thread
+
+    defaultNumWorkers = 4
+
+    def __init__(self,
+                 loadStack : Callable[[int], object],
+                 sessionList : List[int],
+                 numWorkers : int = None,
+                 buildStack : Callable[[int], None] = None):
+        super().__init__()
+
+        self._loadStack = loadStack
+        self._buildStack = buildStack
+        self._sessionList = list(sessionList)
+
+        if numWorkers is None:
+            numWorkers = min(self.defaultNumWorkers, os.cpu_count() or 1)
+        self._numWorkers = max(1, min(numWorkers, len(self._sessionList)))
+
+        self._executor : ThreadPoolExecutor = None
+        self._futureDict : Dict[int, Future] = {}
+        # session -> Future
+
+        self._numStarted = 0
+        # sessions built and submitted (or failed to build)
+
+        self._numDone = 0
+        self._isCancelled = False
+        self._isFinished = False
+
+        self._signalDone.connect(self._onDone, QtCore.Qt.QueuedConnection)
+
+    @classmethod
+    def fromMap(cls,
+                map : "pymapmanager.TimeSeriesCore",
+                sessionList : List[int],
+                numWorkers : int = None) -> "StackRunLoader":
+        """Build the stacks of sessions and load their image data on worker threads.
+
+        Annotations are built on the GUI thread after start(), one session at a time.
+        """
+        stackDict = {}
+        # session -> pymapmanager.stack, filled in as each session is built
+
+        def _buildStack(session : int):
+            stackDict[session] = pymapmanager.stack(map, loadImageData=False, timepoint=session)
+
+        def _loadImageData(session : int) -> "pymapmanager.stack":
+            _stack = stackDict[session]
+            _stack.loadImageData()
+            return _stack
+
+        return cls(_loadImageData, sessionList, numWorkers=numWorkers, buildStack=_buildStack)
+
+    def __str__(self):
+        return f'StackRunLoader sessions:{self._sessionList} done:{self._numDone} workers:{self._numWorkers}'
+
+    @property
+    def numSessions(self) -> int:
+        return len(self._sessionList)
+
+    @property
+    def numDone(self) -> int:
+        return self._numDone
+
+    def start(self):
+        """Submit sessions to the worker pool.
+
+        With a buildStack, returns right away and builds one session per event loop step.
+        """
+        if len(self._sessionList) == 0:
+            self._checkFinished()
+            return
+
+        self._executor = ThreadPoolExecutor(max_workers=self._numWorkers,
+                                            thread_name_prefix='StackRunLoader')
+
+        if self._buildStack is not None:
+            QtCore.QTimer.singleShot(0, self._buildNext)
+            return
+
+        for session in self._sessionList:
+            self._submit(session)
+
+        # workers exit when the queue is empty
+        self._executor.shutdown(wait=False)
+
+    def cancel(self):
+        """Cancel sessions that have not started, sessions in progress are discarded.
+        """
+        if self._isCancelled or self._isFinished:
+            return
+        self._isCancelled = True
+        for session, future in self._futureDict.items():
+            if future.cancel():
+                logger.info(f'cancelled session:{session}')
+                self._numDone += 1
+
+        # sessions that were never built
+        self._numDone += len(self._sessionList) - self._numStarted
+        self._numStarted = len(self._sessionList)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._checkFinished()
+
+    def _submit(self, session : int):
+        self._futureDict[session] = self._executor.submit(self._worker, session)
+        self._numStarted += 1
+
+    def _buildNext(self):
+        """Build the next session on the GUI thread and submit it to the worker pool.
+        """
+        if self._isCancelled:
+            return
+        
+        session = self._sessionList[self._numStarted]
+        try:
+            self._buildStack(session)
+        except Exception as e:
+            logger.error(f'did not build session:{session} {e}')
+            self._numStarted += 1
+            self._onDone(session, None, str(e))
+        else:
+            self._submit(session)
+
+        if self._numStarted < len(self._sessionList):
+            QtCore.QTimer.singleShot(0, self._buildNext)
+        else:
+            # workers exit when the queue is empty
+            self._executor.shutdown(wait=False)
+
+    def _worker(self, session : int):
+        try:
+            stack = self._loadStack(session)
+        except Exception as e:
+            logger.error(f'did not load session:{session} {e}')
+            self._signalDone.emit(session, None, str(e))
+            return
+        self._signalDone.emit(session, stack, '')
+
+    def _onDone(self, session : int, stack, error : str):
+        """Called on the GUI thread as each session is loaded.
+        """
+        self._numDone += 1
+        if self._isCancelled:
+            pass
+        elif stack is None:
+            self.signalStackFailed.emit(session, error)
+        else:
+            self.signalStackLoaded.emit(session, stack)
+        self._checkFinished()
+
+    def _checkFinished(self):
+        if not self._isFinished and self._numDone == len(self._sessionList):
+            self._isFinished = True
+            self.signalFinished.emit()
@@ -0,0 +1,217 @@
+"""Find stack and map widget plugins without importing them.
+
+Finding plugins means importing every module in interface2.stackWidgets and
+interface2.mapWidgets, some of which import matplotlib and seaborn. The plugins
+found in each module are saved in a json manifest along with the module mtime,
+on the next run only new or modified modules are imported.
+
+A plugin module is imported when its class is first needed, see PluginInfo.
+"""
+import json
+import os
+from importlib import import_module
+from inspect import isclass
+from pkgutil import iter_modules
+from typing import Dict, List, Optional
+
+from pymapmanager._logger import logger
+
+class PluginInfo(dict):
+    """One plugin, a value in the dict returned by loadPlugins().
+
+    Has keys (pluginClass, className, type, module, path, humanName).
+
+    The "constructor" key (the plugin class) is filled in on first access,
+    this is when the plugin module is imported.
+    """
+    def __missing__(self, key):
+        if key != 'constructor':
+            raise KeyError(key)
+        constructor = importPluginClass(self['module'], self['className'])
+        self['constructor'] = constructor
+        return constructor
+
+def importPluginClass(modulePath : str, className : str):
+    """Import a plugin module and return the plugin class.
+    """
+    logger.info(f'importing plugin {modulePath}.{className}')
+    try:
+        module = import_module(modulePath)
+        return getattr(module, className)
+    except (ImportError, AttributeError) as e:
+        logger.error(f'did not import plugin {modulePath}.{className}: {e}')
+        raise
+
+class PluginManifest:
+    """Plugins found in each module of a plugin package, cached in a json file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the json manifest, None to not cache (import all modules).
+    """
+
+    version = 2
+    # 2: only classes defined in a module are recorded
+
+    packageDict = {
+        'stackWidgets': 'pymapmanager.interface2.stackWidgets',
+        'mapWidgets': 'pymapmanager.interface2.mapWidgets',
+    }
+    # pluginType -> package to search
+
+    skipModules = ['pymapmanager.interface2.stackWidgets.stackWidget2',
+                   'pymapmanager.interface2.stackWidgets.base',
+                   'pymapmanager.interface2.stackWidgets.event']
+    # modules with no plugins
+
+    def __init__(self, path : Optional[str] = None):
+        self._path = path
+
+        self._manifestDict : Dict[str, Dict[str, dict]] = {}
+        # pluginType -> module name -> {'mtime', 'plugins'}
+
+        self._numImported = 0
+        self._dirty = False
+
+        self._load()
+
+    def __str__(self):
+        return f'PluginManifest path:{self._path} imported:{self._numImported} modules'
+
+    @property
+    def numImported(self) -> int:
+        """Number of modules imported to find plugins (not in the manifest or modified).
+        """
+        return self._numImported
+
+    def getPlugins(self, pluginType : str) -> List[dict]:
+        """Get plugins of a type, one dict per plugin class.
+
+        Each dict has keys (pluginClass, className, module, humanName).
+        """
+        packageName = self.packageDict.get(pluginType)
+        if packageName is None:
+            logger.error(f'did not understand pluginType:"{pluginType}"')
+            return []
+
+        package = import_module(packageName)
+        oldModuleDict = self._manifestDict.get(pluginType, {})
+        newModuleDict = {}
+
+        for moduleFinder, moduleName, _isPkg in iter_modules(package.__path__, packageName + '.'):
+            if moduleName in self.skipModules:
+                continue
+
+            mtime = self._getModuleMtime(moduleFinder, moduleName)
+
+            moduleEntry = oldModuleDict.get(moduleName)
+            if mtime is None or moduleEntry is None or moduleEntry['mtime'] != mtime:
+                plugins = self._scanModule(moduleName)
+                if plugins is None:
+                    # import failed, try again next run
+                    continue
+                moduleEntry = {'mtime': mtime, 'plugins': plugins}
+                self._dirty = True
+
+            newModuleDict[moduleName] = moduleEntry
+
+        if newModuleDict.keys() != oldModuleDict.keys():
+            self._dirty = True
+        self._manifestDict[pluginType] = newModuleDict
+
+        pluginList = []
+        for moduleEntry in newModuleDict.values():
+            pluginList += moduleEntry['plugins']
+        return pluginList
+
+    def _getModuleMtime(self, moduleFinder, moduleName : str) -> Optional[float]:
+        """Get the mtime of a module source, None if there is no file (e.g. frozen app).
+        """
+        try:
+            spec = moduleFinder.find_spec(moduleName)
+        except (AttributeError, ImportError):
+            return None
+        if spec is None or spec.origin is None or not os.path.isfile(spec.origin):
+            return None
+        return os.path.getmtime(spec.origin)
+
+    def _scanModule(self, moduleName : str) -> Optional[List[dict]]:
+        """Import a module and find its plugin classes, a class with a _widgetName.
+
+        Only classes defined in the module are recorded, the manifest entry is
+        invalidated by the mtime of this module and not of modules it imports from.
+        """
+        try:
+            module = import_module(moduleName)
+        except Exception as e:
+            logger.error(f'did not import {moduleName}: {e}')
+            return None
+
+        self._numImported += 1
+
+        plugins = []
+        for attribute_name in dir(module):
+            attribute = getattr(module, attribute_name)
+            if not isclass(attribute):
+                continue
+
+            if attribute.__module__ != moduleName:
+                # imported from another module, recorded when that module is scanned
+                continue
+
+            try:
+                _widgetName = attribute._widgetName  # myHumanName is a static str
+            except (AttributeError) as e:
+                # not a pmmWidget !
+                continue
+
+            # don't add widgets with no specific name
+            if _widgetName in ['not assigned', 'Stack Widget']:
+                continue
+
+            plugins.append({
+                'pluginClass': attribute_name,
+                'className': attribute.__name__,
+                'module': moduleName,
+                'humanName': _widgetName,
+            })
+
+        return plugins
+
+    def _load(self):
+        if self._path is None or not os.path.isfile(self._path):
+            return
+        try:
+            with open(self._path) as f:
+                loadedDict = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f'did not load plugin manifest {self._path}: {e}')
+            return
+
+        if loadedDict.get('version') != self.version:
+            logger.warning(f"ignoring plugin manifest version {loadedDict.get('version')}")
+            return
+
+        self._manifestDict = loadedDict['plugins']
+
+    def save(self):
+        """Save the manifest if any module was imported to find its plugins.
+        """
+        if self._path is None or not self._dirty:
+            return
+
+        saveDict = {
+            'version': self.version,
+            'plugins': self._manifestDict,
+        }
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(self._path, 'w') as f:
+                json.dump(saveDict, f, indent=4)
+        except OSError as e:
+            logger.error(f'did not save plugin manifest {self._path}: {e}')
+            return
+
+        self._dirty = False
+        logger.info(f'saved plugin manifest {self._path}')
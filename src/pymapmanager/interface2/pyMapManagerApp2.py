@@ -8,7 +8,6 @@ import sys
 import math
 from typing import List, Union, Optional  # , Callable, Iterator
 
-import inspect
 
 from platformdirs import user_data_dir
 
@@ -30,185 +29,58 @@ from pymapmanager.timeseriesCore import TimeSeriesCore
 
 from pymapmanager.interface2.mapWidgets.mapWidget import mapWidget
 from pymapmanager.interface2.stackWidgets.stackWidget2 import stackWidget2
+from pymapmanager.interface2.stackWidgets.base.eventProfiler import eventProfiler
 from pymapmanager.interface2.openFirstWindow import OpenFirstWindow
+from pymapmanager.interface2.pluginManifest import PluginInfo, PluginManifest
 # from pymapmanager.interface2.mainMenus import PyMapManagerMenus
 
+from pymapmanager.startupProfiler import startupProfiler
 from pymapmanager._logger import logger, setLogLevel
 
-def _importPlugins(pluginType : str, verbose = False):
-    from inspect import isclass
-    from pkgutil import iter_modules
-    from importlib import import_module, invalidate_caches
-
-    import pymapmanager
-    import pymapmanager.interface2.stackWidgets
-    import pymapmanager.interface2.mapWidgets
-
-    if pluginType == 'stackWidgets':
-        _modulePath = 'pymapmanager.interface2.stackWidgets'
-        # _folderPath = 'stackWidgets'
-    elif pluginType == 'mapWidgets':
-        _modulePath = 'pymapmanager.interface2.mapWidgets'
-        # _folderPath = 'mapWidgets'
-
-    numAdded = 0
-
-    # CRITICAL: abb this list is not complete in pyinstaller
-    invalidate_caches()  # ???
-    m1 = import_module(_modulePath)
-    if verbose:
-        logger.info('m1 is:')
-        print(m1)
-        # <module 'pymapmanager.interface2.stackWidgets' from '/Users/cudmore/Sites/PyMapManager/pymapmanager/interface2/stackWidgets/__init__.py'>
-        print(f'=== "{pluginType}" Found nested modules m1: import_module({_modulePath})')
-        _tmpCount = 0
-        for _a, _item, _b in list(iter_modules(m1.__path__, m1.__name__ + ".")):
-            print(_tmpCount)
-            print(f'   {_a}')
-            print(f'   {_item}')
-            print(f'   {_b}')
-            _tmpCount += 1
-
-    skipModules = [pymapmanager.interface2.stackWidgets.stackWidget2,
-                   pymapmanager.interface2.stackWidgets.base,
-                   pymapmanager.interface2.stackWidgets.event]
-
-    # for (_a, module_name, _b) in iter_modules([package_dir]):
-    _newModuleList = list(iter_modules(m1.__path__, m1.__name__ + "."))
-    for (_a, module_name, _b) in _newModuleList:
-
-        # import the module and iterate through its attributes
-        if module_name in skipModules:
-            continue
-
-        module = import_module(module_name)
-        if verbose:
-            logger.info(f'   module_name:{module_name}')
-            logger.info(f'   module:{module}')
-            logger.info(f'dir(module): {dir(module)}')
-        
-        for attribute_name in dir(module):
-            attribute = getattr(module, attribute_name)
-
-            if not isclass(attribute):
-                # if verbose:
-                #     logger.info(f'      -->> skipping not a class "{attribute_name}"')
-                continue
-
-            try:
-                _widgetName = attribute._widgetName  # myHumanName is a static str
-            except (AttributeError) as e:
-                # not a pmmWidget !
-                if verbose:
-                    logger.info(f'      -->> skipping (_widgetName attribute): {e}')
-                continue
-
-            # don't add widgets with no specific name
-            if _widgetName == 'not assigned':
-                if verbose:
-                    logger.info(f'      -->> skipping (not assigned) "{_widgetName}"')
-                continue
-
-            # don't add widgets with no specific name
-            if _widgetName == 'Stack Widget':
-                if verbose:
-                    logger.info(f'      -->> skipping (Stack Widget) "{_widgetName}"')
-                continue
-
-            if verbose:
-                logger.info(f'--->>> setattr() for _widgetName:{_widgetName}')
-                logger.info(f'   attribute_name:{attribute_name}')
-                logger.info(f'   attribute:{attribute}')
-
-            # TODO: for some reasone line and point widgets are geting aded twice?
-            # logger.info(f'adding attribute_name:{attribute_name} attribute:{attribute}')
-            if pluginType == 'stackWidgets':
-                setattr(pymapmanager.interface2.stackWidgets, attribute_name, attribute)
-            elif pluginType == 'mapWidgets':
-                setattr(pymapmanager.interface2.mapWidgets, attribute_name, attribute)
-            
-            numAdded += 1
-
-    logger.info(f'imported {numAdded} {pluginType} (attr)')
-
-def loadPlugins(pluginType : str, verbose = False) -> dict:
+def loadPlugins(pluginType : str,
+                verbose = False,
+                manifest : Optional[PluginManifest] = None) -> dict:
     """Load stack/map plugins:
 
     Parameters:
-    pluginType : Either 'stack' or 'map'
-        - Package: pymapmanager.interface2.stackPlugins
-        - Package: pymapmanager.interface2.mapPlugins
-        
-        - Folder: <user>/sanpy_plugins
-
-    See: sanpy.fileLoaders.fileLoader_base.getFileLoader()
+    pluginType : Either 'stackWidgets' or 'mapWidgets'
+        - Package: pymapmanager.interface2.stackWidgets
+        - Package: pymapmanager.interface2.mapWidgets
+    manifest : PluginManifest
+        Plugins found on a previous run, plugin modules are only imported
+        when the plugin is run. If None, import all plugin modules.
+
+    Returns a dict with keys of plugin human name and values of PluginInfo.
     """
-
-    # import pymapmanager.interface2.stackWidgets
-    # import pymapmanager.interface2.mapWidgets
+    if manifest is None:
+        manifest = PluginManifest()
 
     pluginDict = {}
 
-    _importPlugins(pluginType, pluginType == 'stackWidgets')
-
-    if pluginType == 'stackWidgets':
-        members = inspect.getmembers(pymapmanager.interface2.stackWidgets)
-        _rootModuleStr = "pymapmanager.interface2.stackWidgets."
-    elif pluginType == 'mapWidgets':
-        members = inspect.getmembers(pymapmanager.interface2.mapWidgets)
-        _rootModuleStr = "pymapmanager.interface2.mapWidgets."
-    else:
-        logger.error(f'did not understand pluginType:"{pluginType}"')
-        return {}
-    
-    # if verbose:
-    #     logger.info(f'members:{members}')
-
-    for moduleName, obj in members:
-        # logger.info(f'1) moduleName:{moduleName} obj:{obj}')
-        if inspect.isclass(obj):
-            
-        
-            # logger.info(f'obj is class moduleName: {moduleName}')
-            # if moduleName in ignoreModuleList:
-            #     # our base plugin class
-            #     continue
-            # loadedList.append(moduleName)
-            fullModuleName = _rootModuleStr + moduleName
-            
-            try:
-                _widgetName = obj._widgetName  # myHumanName is a static str
-            except (AttributeError) as e:
-                # not a pmmWidget !
-                if verbose:
-                    logger.info(f'not a pmmWidget:{e}')
-                continue
-            
-            # don't add widgets with no specific name
-            if _widgetName == 'not assigned':
-                continue
-
-            # don't add widgets with no specific name
-            if _widgetName == 'Stack Widget':
-                continue
-
-            logger.info(f'   adding {pluginType} moduleName:{moduleName} _widgetName:{_widgetName}')
-            # _showInMenu = obj.showInMenu  # showInMenu is a static bool
-            onePluginDict = {
-                "pluginClass": moduleName,
-                "type": "system",
-                "module": fullModuleName,
-                "path": "",
-                "constructor": obj,
-                "humanName": _widgetName,
-                # "showInMenu": showInMenu,
-            }
-            if _widgetName in pluginDict.keys():
+    # sort by class name, first class with a human name wins
+    pluginList = manifest.getPlugins(pluginType)
+    pluginList = sorted(pluginList, key=lambda plugin: plugin['pluginClass'])
+
+    for plugin in pluginList:
+        _widgetName = plugin['humanName']
+
+        onePluginDict = PluginInfo({
+            "pluginClass": plugin['pluginClass'],
+            "className": plugin['className'],
+            "type": "system",
+            "module": plugin['module'],
+            "path": "",
+            "humanName": _widgetName,
+            # "constructor" is imported on first access
+            # "showInMenu": showInMenu,
+        })
+        if _widgetName in pluginDict.keys():
+            if verbose:
                 logger.warning(
-                    f'Plugin already added "{moduleName}" _widgetName:"{_widgetName}"'
+                    f'Plugin already added "{plugin["pluginClass"]}" _widgetName:"{_widgetName}"'
                 )
-            else:
-                pluginDict[_widgetName] = onePluginDict
+        else:
+            pluginDict[_widgetName] = onePluginDict
     
     # sort
     pluginDict = dict(sorted(pluginDict.items()))
@@ -371,6 +243,8 @@ class OpenWidgetList:
     
 class PyMapManagerApp(QtWidgets.QApplication):
     def __init__(self, argv):        
+        startupProfiler.mark('imports')
+
         super().__init__(argv)
 
         # immediately set the log level so we can see initial activity
@@ -395,6 +269,8 @@ class PyMapManagerApp(QtWidgets.QApplication):
         self.setTheme()
         # set theme to loaded config dict
 
+        startupProfiler.mark('preferences')
+
         appIconPath = self.getAppIconPath()
         self.setWindowIcon(QtGui.QIcon(appIconPath))
 
@@ -424,11 +300,20 @@ class PyMapManagerApp(QtWidgets.QApplication):
         # dictionary of open stack widgets
         # keys are full path to stack
 
-        self._stackWidgetPluginsDict = loadPlugins(pluginType='stackWidgets', verbose=False)
-        # application wide stack widgets
-        
-        self._mapWidgetPluginsDict = loadPlugins(pluginType='mapWidgets', verbose=False)
-        # application wide stack widgets
+        with startupProfiler.phase('load plugins'):
+            _manifestPath = os.path.join(self.getAppDataFolder(), 'pluginManifest.json')
+            _pluginManifest = PluginManifest(_manifestPath)
+
+            self._stackWidgetPluginsDict = loadPlugins(pluginType='stackWidgets', verbose=False,
+                                                    manifest=_pluginManifest)
+            # application wide stack widgets
+            
+            self._mapWidgetPluginsDict = loadPlugins(pluginType='mapWidgets', verbose=False,
+                                                    manifest=_pluginManifest)
+            # application wide stack widgets
+
+            _pluginManifest.save()
+            logger.info(_pluginManifest)
         
         # logger.info('building PyMapManagerMenus()')
         # self._mainMenu = PyMapManagerMenus(self)
@@ -437,7 +322,11 @@ class PyMapManagerApp(QtWidgets.QApplication):
         self.enableFolderWindow = False
 
         self._openFirstWindow = None
-        self.openFirstWindow()
+        with startupProfiler.phase('open first window'):
+            self.openFirstWindow()
+
+        startupProfiler.mark('first window')
+        startupProfiler.finish()
 
     def _initUserDocuments(self):
         """
@@ -607,6 +496,17 @@ class PyMapManagerApp(QtWidgets.QApplication):
         self.getFrontWindow().emitRedoEvent()
         # logger.info('')
         
+    def setEventProfiling(self, enabled : bool):
+        """Turn on/off timing of pmmEvent handlers in all widgets.
+        """
+        eventProfiler.setEnabled(enabled)
+
+    def dumpEventProfile(self) -> str:
+        """Log and return per (widget, event type) handler timing.
+        """
+        eventProfiler.dump()
+        return eventProfiler.getReport()
+
     def toggleMapWidget(self, path : str, visible : bool):
         """Show/hide a map widget.
         """
@@ -823,14 +723,18 @@ def run():
     # enable_hi_dpi() must be called before the instantiation of QApplication.
     qdarktheme.enable_hi_dpi()
 
-    app = PyMapManagerApp(sys.argv)
+    # --profile-startup is ours, not for Qt
+    _argv = [arg for arg in sys.argv if arg != startupProfiler.cliFlag]
+    app = PyMapManagerApp(_argv)
 
     # these imports are needed by pyinstaller so they are included in our plugin system
     # we will need similar 'fake' import for all our map widget
-    from pymapmanager.interface2.stackWidgets.scatterplotwidget import ScatterPlotWidget
-    from pymapmanager.interface2.stackWidgets.dendrogramWidget import DendrogramWidget
-    from pymapmanager.interface2.stackWidgets.spineInfoWidget import SpineInfoWidget
-    from pymapmanager.interface2.stackWidgets.histogramWidget2 import HistogramWidget
+    # only run them in a frozen app, otherwise plugins are imported when first run
+    if getattr(sys, 'frozen', False):
+        from pymapmanager.interface2.stackWidgets.scatterplotwidget import ScatterPlotWidget
+        from pymapmanager.interface2.stackWidgets.dendrogramWidget import DendrogramWidget
+        from pymapmanager.interface2.stackWidgets.spineInfoWidget import SpineInfoWidget
+        from pymapmanager.interface2.stackWidgets.histogramWidget2 import HistogramWidget
                                                                         
     
     # from pymapmanager.interface2.stackWidgets.stackWidget2 import stackWidget2
@@ -54,12 +54,12 @@ class annotationListWidget(mmWidget2):
 
     def deletedEvent(self, event):
         # logger.info('')
-        self._setModel()
+        self._refreshRows(self._getEventRowLabels(event))
 
     def editedEvent(self, event):
         logger.info(f'{event}')
         
-        self._setModel()
+        self._refreshRows(self._getEventRowLabels(event))
 
         # reselect previous selection
         spineIDs = event.getSpines()
@@ -141,6 +141,17 @@ class annotationListWidget(mmWidget2):
         dfPoints = self._annotations.getSummaryDf()
         self._myTableView.updateDataFrame(dfPoints)
 
+    def _refreshRows(self, rowLabels : List[int]):
+        """Update table rows of edited or deleted annotations, see myQTableView.refreshRows().
+        """
+        dfPoints = self._annotations.getSummaryDf()
+        self._myTableView.refreshRows(dfPoints, rowLabels)
+
+    def _getEventRowLabels(self, event) -> List[int]:
+        """Get row labels of annotations in an edit (or delete) event.
+        """
+        return event.getSpines()
+
     def _initToolbar(self) -> QtWidgets.QVBoxLayout:
         """Initialize the toolbar with controls.
 
@@ -329,6 +340,11 @@ class lineListWidget(annotationListWidget):
         annotations = stackWidget.getStack().getLineAnnotations()
         super().__init__(stackWidget, annotations, name='lineListWidget')
 
+    def _getEventRowLabels(self, event) -> List[int]:
+        """Segments of the event, for spine events these are the segments of the spines.
+        """
+        return event.getSegments()
+
     def stateChangedEvent(self, event):
         super().stateChangedEvent(event)
                 
@@ -436,7 +452,7 @@ class lineListWidget(annotationListWidget):
         self._myTableView.mySelectRows(segmentID)
 
     def deletedSegmentEvent(self, event : DeleteSegmentEvent):
-        self._setModel()
+        self._refreshRows(event.getSegments())
         # for segment in event:
         #     logger.info(f'segment:{segment}')
 
@@ -484,10 +500,11 @@ class lineListWidget(annotationListWidget):
     
     def setRadiusEvent(self, event):
 
+        segmentID = event.getFirstSegmentSelection()
+
         # refresh linelistWidget
-        self._setModel()
+        self._refreshRows([segmentID])
 
-        segmentID = event.getFirstSegmentSelection()
         # reselect current segment
         self._myTableView._selectRow([segmentID])
 
@@ -512,10 +529,11 @@ class lineListWidget(annotationListWidget):
         # uncheck Pivot box in tracing widget after setting segment pivot
         self.tracingWidget.updateSetPivotCheckBox(False)
 
+        segmentID = event.getFirstSegmentSelection()
+
         # refresh linelistWidget
-        self._setModel()
+        self._refreshRows([segmentID])
 
-        segmentID = event.getFirstSegmentSelection()
         # reselect current segment
         self._myTableView._selectRow([segmentID])
         
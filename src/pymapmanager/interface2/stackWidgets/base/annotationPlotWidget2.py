@@ -7,7 +7,6 @@ if TYPE_CHECKING:
     from pymapmanager.interface2.stackWidgets import stackWidget2
     from pymapmanager.annotations.baseAnnotationsCore import AnnotationsCore, SpineAnnotationsCore, LineAnnotationsCore
 
-import math
 import time
 from typing import List, Optional
 
@@ -31,15 +30,39 @@ from pymapmanager.interface2.stackWidgets.event.segmentEvent import (DeleteSegme
 from pymapmanager._logger import logger
 
 class PointLabels:
+    """Spine labels, only spines in the current slice and view rect have a label.
+
+    TextItems are recycled through a pool as the user scrolls and pans,
+    the number of TextItems scales with visible spines, not with all spines.
+    """
+
+    viewMarginFraction = 0.05
+    # labels of spines just outside the view rect are partially visible
+
     def __init__(self,
                  plotItem : pg.PlotItem,
                  df : Optional[SpineAnnotationsCore]):
         self._plotItem = plotItem
         self._df = df
+        
         self._labels = {}
-    
+        # labelID -> pg.TextItem, labels that are currently shown
+        
+        self._pool : List[pg.TextItem] = []
+        # hidden labels in the plotItem, ready to be reused
+
+        self._sliceLabelIDs = []
+        # labels in the current slice, from hidShowLabels()
+
+        self._labelState = {}
+        # labelID -> (x, y, accept) last applied to the TextItem, to only apply changes
+
+        self._showLabels = False
+
         self._makeAllLabels()
 
+        self._plotItem.getViewBox().sigRangeChanged.connect(self._onViewRangeChanged)
+
     @property
     def df(self) -> SpineAnnotationsCore:
         return self._df
@@ -47,68 +70,95 @@ class PointLabels:
     def updateLabel(self, labelID):
         """Update the position and font of a label.
         
-        TODO:
-            
-            1) If "not accept" then make the label font as "outline"
-            2) Posiiton the label just beyond the point (Depends on 'spine angle'?).
+        See updateLabels().
+        """
+        self.updateLabels([labelID])
+
+    def updateLabels(self, labelIDs : List[int] = None):
+        """Update the position and font of labels in one vectorized layout pass.
+        
+        Labels that are not shown are skipped, they are updated when shown.
+        Only labels whose position or accept changed are touched.
 
+        Parameters
+        ----------
+        labelIDs : List[int] | None
+            Labels to update, None for all shown labels (e.g. after undo/redo).
         """
-        label = self._labels[labelID]
-        self.setLabelPos(labelID, label)
-
-         # set font outline based on "accept" column
-        acceptColumn = self._df.getDataFrame()["accept"]
-        # logger.info(f"acceptColumn {acceptColumn}")
-        # logger.info(f"labelID {labelID} acceptVal {acceptColumn[labelID]}")
-        _font=QtGui.QFont()
-        _font.setBold(True)
-        if not acceptColumn[labelID]:
-            # logger.info("Changing label color -> not accept")
-            self._labels[labelID].setColor(QtGui.QColor(255, 255, 255, 120))
-            _font.setItalic(True)
-            self._labels[labelID].setFont(_font)
+        if labelIDs is None:
+            labelIDs = list(self._labels.keys())
         else:
-            # logger.info("Changing label color -> accept")
-            self._labels[labelID].setColor(QtGui.QColor(200, 200, 200, 255))
-            self._labels[labelID].setFont(_font)
+            labelIDs = [_labelID for _labelID in labelIDs if _labelID in self._labels.keys()]
+        
+        if len(labelIDs) == 0:
+            return
+        
+        try:
+            xPos, yPos, accept = self._getLabelLayout(labelIDs)
+        except KeyError as e:
+            # deleted spines, labels will be updated on next slice
+            logger.warning(e)
+            return
+
+        for labelID, _x, _y, _accept in zip(labelIDs, xPos, yPos, accept):
+            label = self._labels[labelID]
+            oldState = self._labelState.get(labelID, None)
+            
+            if oldState is None or oldState[0] != _x or oldState[1] != _y:
+                label.setPos(QtCore.QPointF(_x, _y))
             
-    def setLabelPos(self, labelID, label):
-        x = self.df.getValue('x', labelID)
-        y = self.df.getValue('y', labelID)
-        spineAngles = self._df.getDataFrame()["spineAngle"]
-        idSpineAngle = spineAngles[labelID]
+            if oldState is None or oldState[2] != _accept:
+                # set font outline based on "accept" column
+                _font=QtGui.QFont()
+                _font.setBold(True)
+                if not _accept:
+                    label.setColor(QtGui.QColor(255, 255, 255, 120))
+                    _font.setItalic(True)
+                else:
+                    label.setColor(QtGui.QColor(200, 200, 200, 255))
+                label.setFont(_font)
+
+            self._labelState[labelID] = (_x, _y, _accept)
+
+    def _getLabelLayout(self, labelIDs : List[int]):
+        """Get label (x, y, accept) for each label.
+
+        Labels are just beyond the spine point, away from the segment based on 'spineAngle'.
+        
+        Returns
+        -------
+        (x, y, accept) : (np.ndarray, np.ndarray, np.ndarray)
+        """
+        df = self.df.getDataFrame().loc[labelIDs, ['x', 'y', 'spineAngle', 'accept']]
+
+        x = df['x'].to_numpy(dtype=float)
+        y = df['y'].to_numpy(dtype=float)
+        spineAngle = df['spineAngle'].to_numpy(dtype=float)
+        accept = df['accept'].to_numpy().astype(bool)
+
         adjustConstant = 3
-        adjustX = adjustConstant * math.cos(idSpineAngle * math.pi/180)
-        adjustY = adjustConstant * math.sin(idSpineAngle * math.pi/180)
-        adjustX = abs(adjustX)
-        adjustY = abs(adjustY)
-
-        if 0 <= idSpineAngle and idSpineAngle <= 90:
-            label.setPos(QtCore.QPointF(x + adjustX, y + adjustY))
-        elif 90 <= idSpineAngle and idSpineAngle <= 180:
-            label.setPos(QtCore.QPointF(x - adjustX, y + adjustY))
-        elif 180 <= idSpineAngle and idSpineAngle <= 270:
-            label.setPos(QtCore.QPointF(x - adjustX, y - adjustY))
-        elif 270 <= idSpineAngle and idSpineAngle <= 360:
-            label.setPos(QtCore.QPointF(x + adjustX, y - adjustY))
+        _radians = np.deg2rad(spineAngle)
+        adjustX = np.abs(adjustConstant * np.cos(_radians))
+        adjustY = np.abs(adjustConstant * np.sin(_radians))
 
-        return label
+        # right for [0, 90] and (270, 360], up for [0, 180]
+        with np.errstate(invalid='ignore'):
+            signX = np.where((spineAngle <= 90) | (spineAngle > 270), 1, -1)
+            signY = np.where(spineAngle <= 180, 1, -1)
+            _validAngle = (spineAngle >= 0) & (spineAngle <= 360)
+
+        # no spine angle, label is on the point
+        xPos = np.where(_validAngle, x + signX * adjustX, x)
+        yPos = np.where(_validAngle, y + signY * adjustY, y)
+
+        return xPos, yPos, accept
 
     def addedLabel(self, labelID):
         """Add a new label.
 
         Called after new spine, among other things.
+        The label is made when it is first shown, see hidShowLabels().
         """
-        # x = self.df.getValue('x', labelID)
-        # y = self.df.getValue('y', labelID)
-        newLabel = self._newLabel(labelID)
-        
-        # add to pg plotItem
-        self._plotItem.addItem(newLabel)
-        
-        # add to dict
-        self._labels[labelID] = newLabel
-
         # abb, this will update based on (accept, usertype)
         self.updateLabel(labelID)
 
@@ -119,47 +169,114 @@ class PointLabels:
         """
         # return dict[key] if key exists in the dictionary, and None otherwise
         labelItem = self._labels.pop(labelID, None)
+        self._labelState.pop(labelID, None)
         if labelItem is not None:
-            # remove from pyqtgraph view
-            self._plotItem.removeItem(labelItem)
+            self._releaseLabel(labelItem)
 
-    def hidShowLabels(self, labelIDs : List[str]):
+    def hidShowLabels(self, labelIDs : List[int]):
         """Used during runtime in setSlice().
+
+        Parameters
+        ----------
+        labelIDs : List[int]
+            Labels (spine ID) in the current slice, culled to the view rect.
         """
-        for k, v in self._labels.items():
-            # labelIndex = int(labelIndex)  # some labels will not cast
-            if k in labelIDs:
-                v.show()
-            else:
-                v.hide()
+        self._sliceLabelIDs = labelIDs
+        self._showLabels = True
+        self._showVisibleLabels()
 
     # abj
-    def hideAllLabels(self, labelIDs : List[str]):
+    def hideAllLabels(self, labelIDs : List[int] = None):
         """ Hide all labels. Used when user unchecks labels within top tool bar
         """
         # logger.info("HIDING ALL LABELS")
-        for k, v in self._labels.items():
-            if k in labelIDs:
-                v.hide()
+        self._showLabels = False
+        for labelID in list(self._labels.keys()):
+            self.deleteLabel(labelID)
 
-    def _makeAllLabels(self):
+    def _onViewRangeChanged(self, *args):
+        """Show/hide labels as user pans and zooms.
+        """
+        if self._showLabels:
+            self._showVisibleLabels()
 
-        if self.df is None:
-            return
+    def _getVisibleLabelIDs(self) -> set:
+        """Get labels in the current slice that are inside the view rect.
+        """
+        if self.df is None or len(self._sliceLabelIDs) == 0:
+            return set()
+        
+        labelIDs = np.asarray(self._sliceLabelIDs)
+        try:
+            xyDf = self.df.getDataFrame().loc[labelIDs, ['x', 'y']]
+        except KeyError as e:
+            # deleted spines, labels will be updated on next slice
+            logger.warning(e)
+            return set()
+
+        (xMin, xMax), (yMin, yMax) = self._plotItem.getViewBox().viewRange()
+        xMargin = (xMax - xMin) * self.viewMarginFraction
+        yMargin = (yMax - yMin) * self.viewMarginFraction
+        
+        x = xyDf['x'].to_numpy()
+        y = xyDf['y'].to_numpy()
+        inView = (x >= xMin - xMargin) & (x <= xMax + xMargin) \
+                    & (y >= yMin - yMargin) & (y <= yMax + yMargin)
+
+        return set(labelIDs[inView].tolist())
+
+    def _showVisibleLabels(self):
+        """Only labels in the slice and view rect have a TextItem, recycle the rest.
+        """
+        visibleLabelIDs = self._getVisibleLabelIDs()
+        
+        for labelID in list(self._labels.keys()):
+            if labelID not in visibleLabelIDs:
+                self.deleteLabel(labelID)
+        
+        newLabelIDs = [labelID for labelID in visibleLabelIDs
+                       if labelID not in self._labels.keys()]
+        for labelID in newLabelIDs:
+            self._labels[labelID] = self._acquireLabel(labelID)
         
+        self.updateLabels(newLabelIDs)
+        
+        for labelID in newLabelIDs:
+            self._labels[labelID].show()
+
+    def _acquireLabel(self, labelID) -> pg.TextItem:
+        """Get a label from the pool, or make a new one.
+        """
+        if len(self._pool) > 0:
+            label = self._pool.pop()
+            label.setText(str(labelID))
+        else:
+            label = self._newLabel(labelID)
+            # add to pg plotItem
+            self._plotItem.addItem(label)
+        return label
+
+    def _releaseLabel(self, label : pg.TextItem):
+        """Hide a label and put it back in the pool.
+        """
+        label.hide()
+        self._pool.append(label)
+
+    def _makeAllLabels(self):
+        """Reset labels, TextItems are made as labels are shown.
+        """
+        for label in self._labels.values():
+            self._releaseLabel(label)
         self._labels = {}
-        for index, row in self.df.getDataFrame().iterrows():
-            labelID = row["index"]  # could use index, it is row label???
-            self.addedLabel(labelID)
+        self._labelState = {}
 
-    def _newLabel(self, labelID) -> pg.LabelItem:
+    def _newLabel(self, labelID) -> pg.TextItem:
         """Make a new label.
         """
         # label = pg.LabelItem("", **{"color": "#FFF", "size": "6pt", "anchor": (1,1)})
         label = pg.TextItem('', anchor=(0.5,0.5))  # border=pg.mkPen(width=5)
         # label = QtWidgets.QLabel('labelID', self._plotItem)
         # label.setPos(QtCore.QPointF(x - 9, y - 9))
-        label = self.setLabelPos(labelID, label)
  
         label.setText(str(labelID))
         myFont=QtGui.QFont()
@@ -168,6 +285,94 @@ class PointLabels:
         label.hide()
         return label
     
+class SpineLineBuffer:
+    """Spine lines (head to anchor) as NaN separated float32 x/y buffers.
+
+    Built once per edit from SpineAnnotationsCore.getSpineLines(). On each
+    slice change, lines of visible spines are copied with a boolean mask
+    into a reused output buffer, to plot with setData(connect='finite').
+
+    Buffer is [x0, x1, nan, x0, x1, nan, ...], one line (usually 2 points) per spine.
+    """
+    def __init__(self):
+        self._x = np.empty(0, dtype=np.float32)
+        self._y = np.empty(0, dtype=np.float32)
+        
+        self._bufferSpinePos = np.empty(0, dtype=np.intp)
+        # position of spine (in self._spineIndex) for each item in the buffer
+
+        self._spineIndex = pd.Index([])
+        # spineID of each spine line
+
+        self._xOut = np.empty(0, dtype=np.float32)
+        self._yOut = np.empty(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self._spineIndex)
+
+    def build(self, spineLineDf : pd.DataFrame):
+        """Build buffers from spine lines.
+
+        Parameters
+        ----------
+        spineLineDf : pd.DataFrame
+            Columns (x, y), index is spineID with consecutive rows per spine line.
+        """
+        spineIDs = spineLineDf.index.to_numpy()
+        numPoints = len(spineIDs)
+        if numPoints == 0:
+            self.__init__()
+            return
+        
+        # first row of each spine line
+        _isStart = np.ones(numPoints, dtype=bool)
+        _isStart[1:] = spineIDs[1:] != spineIDs[:-1]
+        _startRows = np.flatnonzero(_isStart)
+        numLines = len(_startRows)
+
+        # each point shifts right by the number of nan separators before it
+        _linePos = np.cumsum(_isStart) - 1
+        _bufferPos = np.arange(numPoints) + _linePos
+        # nan after last point of each line
+        _nanPos = np.append(_bufferPos[_startRows[1:] - 1] + 1, numPoints + numLines - 1)
+
+        bufferLen = numPoints + numLines
+        self._x = np.empty(bufferLen, dtype=np.float32)
+        self._y = np.empty(bufferLen, dtype=np.float32)
+        self._x[_bufferPos] = spineLineDf['x'].to_numpy()
+        self._y[_bufferPos] = spineLineDf['y'].to_numpy()
+        self._x[_nanPos] = np.nan
+        self._y[_nanPos] = np.nan
+
+        self._bufferSpinePos = np.empty(bufferLen, dtype=np.intp)
+        self._bufferSpinePos[_bufferPos] = _linePos
+        self._bufferSpinePos[_nanPos] = np.arange(numLines)
+
+        self._spineIndex = pd.Index(spineIDs[_startRows])
+
+        self._xOut = np.empty(bufferLen, dtype=np.float32)
+        self._yOut = np.empty(bufferLen, dtype=np.float32)
+
+    def getLines(self, spineIDs):
+        """Get x/y (views into the output buffer) of lines for spineIDs.
+
+        Views are overwritten by the next call.
+        """
+        if len(self._spineIndex) == 0 or len(spineIDs) == 0:
+            return self._xOut[:0], self._yOut[:0]
+        
+        _spinePos = self._spineIndex.get_indexer(spineIDs)
+        _spinePos = _spinePos[_spinePos >= 0]  # spines with no line
+
+        spineMask = np.zeros(len(self._spineIndex), dtype=bool)
+        spineMask[_spinePos] = True
+        bufferMask = spineMask[self._bufferSpinePos]
+        
+        n = np.count_nonzero(bufferMask)
+        np.compress(bufferMask, self._x, out=self._xOut[:n])
+        np.compress(bufferMask, self._y, out=self._yOut[:n])
+        return self._xOut[:n], self._yOut[:n]
+
 class annotationPlotWidget(mmWidget2):
     """Base class to plot annotations in a pg view.
 
@@ -798,7 +1003,7 @@ class pointPlotWidget(annotationPlotWidget):
             [],
             pen=pg.mkPen(width=width, color=color),
             symbol=symbol,
-            connect="pairs",
+            connect="finite",
         )
         self._spineConnections.setZValue(zorder)
         # self._view.addItem(self._spineConnections)
@@ -837,6 +1042,7 @@ class pointPlotWidget(annotationPlotWidget):
         self._pointLabels = PointLabels(self._view, self._annotations)
 
         # make all spine lines
+        self._spineLineBuffer = SpineLineBuffer()
         self._bMakeSpineLines()
 
     def _deleteSelection(self):
@@ -860,10 +1066,9 @@ class pointPlotWidget(annotationPlotWidget):
         """
         logger.info(event)
 
-        for spine in event:
-            # update label
-            spineID = spine['spineID']
-            self._pointLabels.updateLabel(spineID)
+        # update labels
+        spineIDs = [spine['spineID'] for spine in event]
+        self._pointLabels.updateLabels(spineIDs)
 
         # remake all spine lines
         self._bMakeSpineLines()
@@ -874,10 +1079,9 @@ class pointPlotWidget(annotationPlotWidget):
     def manualConnectSpineEvent(self, event : pmmEvent):
         """Update plots on manual connect spine event.
         """
-        for spine in event:
-            # update label
-            spineID = spine['spineID']
-            self._pointLabels.updateLabel(spineID)
+        # update labels
+        spineIDs = [spine['spineID'] for spine in event]
+        self._pointLabels.updateLabels(spineIDs)
 
         # remake all spine lines
         self._bMakeSpineLines()
@@ -887,10 +1091,9 @@ class pointPlotWidget(annotationPlotWidget):
     def autoConnectSpineEvent(self, event : pmmEvent):
         """Update plots on auto connect spine event.
         """
-        for spine in event:
-            # update label
-            spineID = spine['spineID']
-            self._pointLabels.updateLabel(spineID)
+        # update labels
+        spineIDs = [spine['spineID'] for spine in event]
+        self._pointLabels.updateLabels(spineIDs)
 
         # remake all spine lines
         self._bMakeSpineLines()
@@ -903,15 +1106,9 @@ class pointPlotWidget(annotationPlotWidget):
 
         logger.info(f'{self.getClassName()}')
         logger.info(f'event:{event}')
-        
-        _undoEvent = event.getUndoEvent()
 
-        if _undoEvent.type == pmmEventType.moveAnnotation:
-            # TODO: on undo move, redraw label
-            for spine in _undoEvent:
-                # update label
-                spineID = spine['spineID']
-                self._pointLabels.updateLabel(spineID)
+        # any undo can move or (un)accept spines, update all shown labels in one pass
+        self._pointLabels.updateLabels()
 
         self._bMakeSpineLines()
 
@@ -923,11 +1120,8 @@ class pointPlotWidget(annotationPlotWidget):
 
         # logger.info(f'event:{event}')
         
-        # TODO: on undo move, redraw label
-        for spine in event.getRedoEvent():
-            # update label
-            spineID = spine['spineID']
-            self._pointLabels.updateLabel(spineID)
+        # update all shown labels in one pass
+        self._pointLabels.updateLabels()
 
         self._bMakeSpineLines()
 
@@ -958,13 +1152,14 @@ class pointPlotWidget(annotationPlotWidget):
 
     def editedEvent(self, event: pmmEvent):
 
-        for spine in event:
-            # update label
-            spineID = spine['spineID']
-            self._pointLabels.updateLabel(spineID)
-
-        # remake all spine lines
-        self._bMakeSpineLines()
+        if event.type == pmmEventType.refreshSpineEvent:
+            # after core undo/redo, spines may have moved
+            self._pointLabels.updateLabels()
+            self._bMakeSpineLines()
+        else:
+            # editing spine properties (accept, userType, note) does not move spine lines
+            spineIDs = [spine['spineID'] for spine in event]
+            self._pointLabels.updateLabels(spineIDs)
         
         self._refreshSlice()
 
@@ -1038,7 +1233,7 @@ class pointPlotWidget(annotationPlotWidget):
         super().slot_setSlice(sliceNumber=sliceNumber)
 
         # this will have missing values after delete
-        _rows = self._dfPlot["index"].to_list()
+        _rows = self._dfPlot["index"].to_numpy()
 
         #
         # show and hide labels based on sliceNumber
@@ -1046,48 +1241,9 @@ class pointPlotWidget(annotationPlotWidget):
         if self.showLabel:
             self._pointLabels.hidShowLabels(_rows)
 
-        # mask and unmask spine lines based on sliceNumber
-        # _spineLineIndex = []
-        # for _idx, row in enumerate(_rows):
-        #     realRow = row * 2
-        #     # realRow = _idx * 2
-        #     _spineLineIndex.append(realRow)
-        #     _spineLineIndex.append(realRow + 1)
-
-        try:
-            # x/y spine lines come directly from the core
-            # _xData = self._xSpineLines[_spineLineIndex]
-            # _yData = self._ySpineLines[_spineLineIndex]
-
-            _xData = self._spineLineDf.loc[_rows]['x'].to_list()
-            _yData = self._spineLineDf.loc[_rows]['y'].to_list()
-
-        except KeyError as e:
-            logger.error('!!! my KeyError: _spineLineDf did not contain a _rows')
-            logger.error(e)
-            print('self._spineLineDf')
-            print(self._spineLineDf)
-            print('_rows:')
-            print(_rows)
-
-        except IndexError as e:
-            logger.error(f"!!! my IndexError {e}")
-            # logger.error(f'self._xSpineLines:{len(self._xSpineLines)}')
-            # # print(self._xSpineLines)
-            # logger.error(f'self._ySpineLines:{len(self._ySpineLines)}')
-            # # print(self._ySpineLines)
-
-            # logger.error(f'_rows:{len(_rows)}')
-            # logger.error(f'_spineLineIndex:{len(_spineLineIndex)}')
-            # print(_spineLineIndex)
-
-            # print('self._spineLinesIndex:')
-            # print(self._spineLinesIndex)
-
-            # logger.error('>>>><<<<<>>>><<<')
-
-        else:
-            self._spineConnections.setData(_xData, _yData)
+        # x/y spine lines of spines in this slice, nan separated
+        _xData, _yData = self._spineLineBuffer.getLines(_rows)
+        self._spineConnections.setData(_xData, _yData, connect='finite')
 
         stopSec = time.time()
         # logger.info(f'{self.getClassName()} took {round(stopSec-startSec,4)} seconds')
@@ -1116,6 +1272,7 @@ class pointPlotWidget(annotationPlotWidget):
         """        
         
         self._spineLineDf = self._annotations.getSpineLines()
+        self._spineLineBuffer.build(self._spineLineDf)
 
     def _getScatterColor(self) -> List[str]:
         # TODO: refactor this to not explicitly loop
@@ -1346,43 +1503,20 @@ class linePlotWidget(annotationPlotWidget):
     
     # abb was missing??? called from imagePlotWidget ???
     def refreshRadiusLines(self, sliceNumber: int):
-                
-        xLeft = []
-        yLeft = []
-        xRight = []
-        yRight = []
-        _lineConnectLeft = None
-        _lineConnectRight = None
+        """Plot left/right radius lines in the current z range.
 
+        Coordinates come from the cached PolylineLayer of LineAnnotationsCore.
+        """
+        if not self.showRadiusLines:
+            self._leftRadiusLines.setData([], [])
+            self._rightRadiusLines.setData([], [])
+            return
+        
         zPlusMinus = self._displayOptions["zPlusMinus"]
-        dfLeft = self._annotations.getLeftRadiusPlot(sliceNumber, zPlusMinus)
-        dfRight = self._annotations.getRightRadiusPlot(sliceNumber, zPlusMinus)
-
-        if self.showRadiusLines and dfLeft is not None and dfRight is not None:
-        # if self.showRadiusLines:
-            # logger.info("showing radius lines")
-            # xLeft = self._dfPlot['xLeft'].to_numpy()
-            # yLeft = self._dfPlot['yLeft'].to_numpy()
-            # xRight = self._dfPlot['xRight'].to_numpy()
-            # yRight = self._dfPlot['yRight'].to_numpy()
-            zPlusMinus = self._displayOptions["zPlusMinus"]
-            # dfLeft = self._annotations.getLeftRadiusPlot(sliceNumber, zPlusMinus)
-            if dfLeft is not None:
-                xLeft = dfLeft["x"].to_numpy()
-                yLeft = dfLeft["y"].to_numpy()
-                _lineConnectLeft = self.old_getScatterConnect(dfLeft)
-            
-            # dfRight = self._annotations.getRightRadiusPlot(sliceNumber, zPlusMinus)
-            if dfRight is not None:
-                xRight = dfRight["x"].to_numpy()
-                yRight = dfRight["y"].to_numpy()
-                _lineConnectRight = self.old_getScatterConnect(dfRight)
 
-                # logger.info(f'length dfleft {len(dfLeft)}')
-                # logger.info(f'length dfRight {len(dfRight)}')
+        xLeft, yLeft, _lineConnectLeft = self._annotations.getPolylineSlice('leftRadius', sliceNumber, zPlusMinus)
+        xRight, yRight, _lineConnectRight = self._annotations.getPolylineSlice('rightRadius', sliceNumber, zPlusMinus)
 
-        # logger.info(f"xRight, yRight: {xRight}, {yRight}")
-        #
         self._leftRadiusLines.setData(
             xLeft, yLeft,
             connect=_lineConnectLeft,
@@ -0,0 +1,72 @@
+"""Opt-in timing of pmmEvent handlers, per (widget, event type).
+
+Turned on from the app with PyMapManagerApp.setEventProfiling(True),
+dump with PyMapManagerApp.dumpEventProfile().
+"""
+import bisect
+from typing import Dict, Tuple
+
+from pymapmanager._logger import logger
+
+class EventProfiler:
+    """Latency histogram of each (widget name, event type) handler.
+
+    Off by default, when off mmWidget2.slot_pmmEvent() does not time handlers.
+    """
+
+    binEdgesMs = [0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000]
+    # upper edge of each histogram bin in ms, last bin is > 1000 ms
+
+    def __init__(self):
+        self._enabled = False
+        self._statsDict : Dict[Tuple[str, str], dict] = {}
+        # (widgetName, eventTypeName) -> {'count', 'totalMs', 'maxMs', 'histogram'}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def setEnabled(self, enabled : bool):
+        self._enabled = enabled
+
+    def clear(self):
+        self._statsDict = {}
+
+    def record(self, widgetName : str, eventTypeName : str, elapsedMs : float):
+        key = (widgetName, eventTypeName)
+        oneStats = self._statsDict.get(key, None)
+        if oneStats is None:
+            oneStats = {
+                'count': 0,
+                'totalMs': 0.0,
+                'maxMs': 0.0,
+                'histogram': [0] * (len(self.binEdgesMs) + 1),
+            }
+            self._statsDict[key] = oneStats
+        
+        oneStats['count'] += 1
+        oneStats['totalMs'] += elapsedMs
+        oneStats['maxMs'] = max(oneStats['maxMs'], elapsedMs)
+        oneStats['histogram'][bisect.bisect_left(self.binEdgesMs, elapsedMs)] += 1
+
+    def getStats(self) -> Dict[Tuple[str, str], dict]:
+        return self._statsDict
+
+    def getReport(self) -> str:
+        """Get a text table, slowest total time first.
+        """
+        _binLabels = [f'<{_edge}' for _edge in self.binEdgesMs] + [f'>{self.binEdgesMs[-1]}']
+        retStr = f"{'widget':<30} {'event':<22} {'count':>6} {'meanMs':>8} {'maxMs':>8}  histogram ms {' '.join(_binLabels)}\n"
+        
+        _sorted = sorted(self._statsDict.items(), key=lambda item: item[1]['totalMs'], reverse=True)
+        for (widgetName, eventTypeName), oneStats in _sorted:
+            _meanMs = oneStats['totalMs'] / oneStats['count']
+            _histogram = ' '.join(str(_count) for _count in oneStats['histogram'])
+            retStr += f"{widgetName:<30} {eventTypeName:<22} {oneStats['count']:>6} {_meanMs:>8.2f} {oneStats['maxMs']:>8.2f}  {_histogram}\n"
+        return retStr
+
+    def dump(self):
+        logger.info(f'event handler timing:\n{self.getReport()}')
+
+eventProfiler = EventProfiler()
+# one profiler shared by all widgets
@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     from pymapmanager.interface2.stackWidgets.event.spineEvent import SelectSpine
 
 import copy
+import time
 from enum import Enum, auto
 from typing import List, Optional, Tuple, TypedDict, Self
 
@@ -15,6 +16,8 @@ from qtpy import QtGui, QtCore, QtWidgets
 
 import pymapmanager
 
+from pymapmanager.interface2.stackWidgets.base.eventProfiler import eventProfiler
+
 from pymapmanager._logger import logger
 
 class pmmStates(Enum):
@@ -75,14 +78,37 @@ class pmmEventType(Enum):
     # setPivotPoint = auto() # abj
     settingSegmentPivot = auto() # abj
 
+def _toTuple(items) -> Optional[tuple]:
+    """Freeze a selection list, None stays None.
+    """
+    if items is None:
+        return None
+    if not isinstance(items, (list, tuple)):
+        items = [items]
+    return tuple(items)
+
+def _toList(items) -> Optional[list]:
+    if items is None:
+        return None
+    return list(items)
+
 class StackSelection:
+    """Point, segment and state selection of one stack.
+
+    Selections are stored as tuples and the setters replace them, they are never
+    modified in place. A copy (see getCopy) shares all selections with the original.
+    Getters return a new list so callers are free to modify it.
+    """
+
+    __slots__ = ('_dict',)
+
     def __init__(self, stack : pymapmanager.stack = None):
         
         self._dict = {
             'stack': stack,
 
-            'pointSelectionList': [],
-            'pointSelectionSessionList': [],  # new for maps, None for no map
+            'pointSelectionList': (),
+            'pointSelectionSessionList': (),  # new for maps, None for no map
 
             'segmentSelectionList': None,  # segmentID
             'segmentPointSelectionList': None,
@@ -147,18 +173,16 @@ class StackSelection:
             List of sessions (same length as items).
             If None then assign all point to self.stack.getMapSession()
         """
-        if not isinstance(items, list):
-            items = [items]
+        items = _toTuple(items)
         self._setValue('pointSelectionList', items)
 
         if sessions is None:
             # asssign all points to our stack map session (can be none)
             # _sessions = [self.stack.getMapTimepoint()] * len(items)
-            sessions = [self.stack.timepoint] * len(items)
+            sessions = (self.stack.timepoint,) * len(items)
             # self._setValue('pointSelectionSessionList', _sessions)
         else:
-            if not isinstance(sessions, list):
-                sessions = [sessions]
+            sessions = _toTuple(sessions)
         self._setValue('pointSelectionSessionList', sessions)
     
     # def getPointSelection(self, mmWidget) -> Optional[List[int]]:
@@ -168,7 +192,7 @@ class StackSelection:
         not true: Only return points that match our self.stack.getMapSession()
         """
         
-        return self._getValue('pointSelectionList')
+        return _toList(self._getValue('pointSelectionList'))
     
         #
         # intermediate solution
@@ -197,22 +221,22 @@ class StackSelection:
         
         Used by map widget
         """
-        return self._getValue('pointSelectionSessionList')
+        return _toList(self._getValue('pointSelectionSessionList'))
 
     def hasPointSelection(self) -> bool:
-        #pointSelectionList = self._getValue('pointSelectionList')
-        return len(self.getPointSelection()) > 0
+        pointSelectionList = self._getValue('pointSelectionList')
+        return len(pointSelectionList) > 0
 
     def firstPointSelection(self) -> Optional[int]:
         """
             returns index of first point selection
         """
-        _points = self.getPointSelection()
+        _points = self._getValue('pointSelectionList')
         if len(_points) > 0:
             return _points[0]
 
     def getFirstPointRoiType(self):
-        _points = self.getPointSelection()
+        _points = self._getValue('pointSelectionList')
         if len(_points) > 0:
             firstPoint = _points[0]
             firstRoiType = self.stack.getPointAnnotations().getValue('roiType', firstPoint)
@@ -221,18 +245,14 @@ class StackSelection:
     # segment selection
     #
     def setSegmentSelection(self, items : List[int]):
-        if items is None:
-            pass
-        elif not isinstance(items, list):
-            items = [items]
-
-        for _idx, item in enumerate(items):
-            items[_idx] = int(item)
+        items = _toTuple(items)
+        if items is not None:
+            items = tuple(int(item) for item in items)
             
         self._setValue('segmentSelectionList', items)
 
     def getSegmentSelection(self) -> Optional[List[int]]:
-        return self._getValue('segmentSelectionList')
+        return _toList(self._getValue('segmentSelectionList'))
 
     def hasSegmentSelection(self) -> bool:
         segmentSelectionList = self._getValue('segmentSelectionList')
@@ -251,14 +271,10 @@ class StackSelection:
     # segment point selection
     #
     def setSegmentPointSelection(self, items : List[int]):
-        if items is None:
-            pass
-        elif not isinstance(items, list):
-            items = [items]
-        self._setValue('segmentPointSelectionList', items)
+        self._setValue('segmentPointSelectionList', _toTuple(items))
 
     def getSegmentPointSelection(self) -> Optional[List[int]]:
-        return self._getValue('segmentPointSelectionList')
+        return _toList(self._getValue('segmentPointSelectionList'))
 
     def hasSegmentPointSelection(self) -> bool:
         segmentSelectionList = self._getValue('segmentPointSelectionList')
@@ -296,14 +312,14 @@ class StackSelection:
         except (KeyError) as e:
             logger.error(f'did not find key "{key}", available keys are {self._dict.keys()}')
 
-    def _old_getCopy(self):
-        """Shallow copy the selection.
+    def getCopy(self) -> "StackSelection":
+        """Copy the selection, sharing the (immutable) selections and the stack.
         
         Used to generate a new selection to reduce from map to stack.
         """
-        return copy.deepcopy(self)
-
-        # copy.deepcopy(self._dict)
+        _copy = StackSelection.__new__(StackSelection)
+        _copy._dict = self._dict.copy()
+        return _copy
 
 class pmmEvent():
     def __init__(self,
@@ -330,7 +346,7 @@ class pmmEvent():
             'senderName': mmWidget.getName(),
             'type': theType,
             #'annotationObject': thePmmWidget.getAnnotations(),
-            'listOfItems': [],  # selection
+            'listOfItems': (),  # selection
             'x': None,
             'y': None,
             'z': None,
@@ -340,9 +356,9 @@ class pmmEvent():
             'channelNumber' : 1,
             'brightestIndex': None,
 
-            'pointSelection': [],
-            'segmentSelection': [],  # segmentID
-            'segmentPointSelection': [],
+            'pointSelection': (),
+            'segmentSelection': (),  # segmentID
+            'segmentPointSelection': (),
 
             # getStack() will be None for maps, ok but not well designed
             'stackSelection': StackSelection(mmWidget.getStack()),
@@ -509,15 +525,44 @@ class pmmEvent():
         return copy.copy(self)
 
     def getDeepCopy(self):
-        """deep copy the event.
+        """Copy the event so it can be changed without changing self.
         
         Used to generate a new event with a different type.
+
+        Payloads (selections, spine edits) are immutable and are shared with
+        the copy, only the top level dicts are copied.
         """
         _copy = copy.copy(self)
-        _copy._dict = copy.deepcopy(self._dict)
+        _copy._dict = self._dict.copy()
+        _copy._dict['stackSelection'] = self.getStackSelection().getCopy()
 
         return _copy
     
+eventHandlerNames = {
+    pmmEventType.undoSpineEvent: 'undoEvent',
+    pmmEventType.redoSpineEvent: 'redoEvent',
+    pmmEventType.selectSpine: 'selectedSpine',  # abb 20240906
+    pmmEventType.selection: 'selectedEvent',
+    pmmEventType.add: 'addedEvent',
+    pmmEventType.delete: 'deletedEvent',
+    pmmEventType.edit: 'editedEvent',
+    pmmEventType.refreshSpineEvent: 'editedEvent',  # gui update after core undo/redo
+    pmmEventType.stateChange: 'stateChangedEvent',
+    pmmEventType.moveAnnotation: 'moveAnnotationEvent',
+    pmmEventType.manualConnectSpine: 'manualConnectSpineEvent',
+    pmmEventType.autoConnectSpine: 'autoConnectSpineEvent',
+    pmmEventType.setSlice: 'setSliceEvent',
+    pmmEventType.setColorChannel: 'setColorChannelEvent',
+    pmmEventType.setRadius: 'setRadiusEvent',  # abj
+    # segment events, abb 20240716
+    pmmEventType.addSegment: 'addedSegmentEvent',
+    pmmEventType.deleteSegment: 'deletedSegmentEvent',
+    pmmEventType.addSegmentPoint: 'addedSegmentPointEvent',
+    pmmEventType.deleteSegmentPoint: 'deletedSegmentPointEvent',
+    pmmEventType.settingSegmentPivot: 'settedSegmentPivot',  # abj
+}
+"""Name of the mmWidget2 method that handles each event type, see slot_pmmEvent()."""
+
 # class mmWidget2(QtWidgets.QWidget):
 class mmWidget2(QtWidgets.QMainWindow):
     """All PyMapManager widgets derive from the base widget.
@@ -531,6 +576,12 @@ class mmWidget2(QtWidgets.QMainWindow):
     _signalPmmEvent = QtCore.Signal(object)  # pmmEvent
     # 
 
+    coalesceEventTypes = {pmmEventType.setSlice}
+    # idempotent display events, only the latest in a burst is emitted, see emitEvent()
+
+    coalesceIntervalMs = 16
+    # about one frame at 60 Hz
+
     def __init__(self,
                  stackWidget : "pymapmanager.interface2.stackWidgets.StackWidget2" = None,
                  mapWidget : "pymapmanager.interface2.mapWidgets.mapWidget" = None,
@@ -572,6 +623,11 @@ class mmWidget2(QtWidgets.QMainWindow):
 
         self._blockSlots = False
 
+        # coalesce bursts of events in coalesceEventTypes, see emitEvent()
+        self._coalesceTimers = {}  # pmmEventType -> QtCore.QTimer
+        self._coalescePending = {}  # pmmEventType -> (pmmEvent, blockSlots)
+        self._coalesceStats = {}  # pmmEventType -> {'emitted': int, 'merged': int}
+
         _windowTitle = self._widgetName
         # TODO: get this working, have inherited classes call this after init() ?
         # if self.getStackWidget() is not None:
@@ -732,6 +788,24 @@ class mmWidget2(QtWidgets.QMainWindow):
         return self._blockSlots
 
     def emitEvent(self, event : pmmEvent, blockSlots=True):
+        """Emit an event to connected widgets.
+
+        Events in coalesceEventTypes (like setSlice) are throttled to one per
+        coalesceIntervalMs. The first event of a burst is emitted immediately,
+        later events in the burst replace each other and only the latest
+        is emitted at the end of the interval.
+
+        Only the widget where an event starts coalesces. A stack widget
+        re-emits to its children right away, a deferred (older) event
+        would move children back to a stale slice.
+        """
+        if event.type in self.coalesceEventTypes and not self._iAmStackWidget:
+            if self._coalesceEvent(event, blockSlots):
+                return
+        
+        self._emitEvent(event, blockSlots)
+
+    def _emitEvent(self, event : pmmEvent, blockSlots=True):
         if blockSlots:
             self.blockSlotsOn()
         else:
@@ -743,6 +817,69 @@ class mmWidget2(QtWidgets.QMainWindow):
 
         self.blockSlotsOff()
 
+    def _coalesceEvent(self, event : pmmEvent, blockSlots : bool) -> bool:
+        """Defer an event if we emitted one of the same type within coalesceIntervalMs.
+
+        Returns True if the event was deferred (or merged with a deferred event).
+        """
+        eventType = event.type
+        _stats = self._coalesceStats.setdefault(eventType, {'emitted': 0, 'merged': 0})
+
+        timer = self._coalesceTimers.get(eventType, None)
+        if timer is not None and timer.isActive():
+            if eventType in self._coalescePending.keys():
+                # previous deferred event is never emitted
+                _stats['merged'] += 1
+            self._coalescePending[eventType] = (event, blockSlots)
+            return True
+        
+        # first event of a burst, emit now and open a window to coalesce the rest
+        if timer is None:
+            timer = QtCore.QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda eventType=eventType: self._flushCoalescedEvent(eventType))
+            self._coalesceTimers[eventType] = timer
+        timer.start(self.coalesceIntervalMs)
+        
+        _stats['emitted'] += 1
+        return False
+
+    def _flushCoalescedEvent(self, eventType : pmmEventType):
+        """Emit the latest deferred event of a type at the end of a coalesce window.
+        """
+        pending = self._coalescePending.pop(eventType, None)
+        if pending is None:
+            return
+        
+        # keep coalescing while the burst continues
+        self._coalesceTimers[eventType].start(self.coalesceIntervalMs)
+        
+        self._coalesceStats[eventType]['emitted'] += 1
+
+        event, blockSlots = pending
+        self._emitEvent(event, blockSlots)
+
+    def getCoalesceStats(self) -> dict:
+        """Get number of emitted and merged (dropped) events for each coalesced event type.
+        """
+        return {eventType.name: dict(_stats) for eventType, _stats in self._coalesceStats.items()}
+
+
+    @classmethod
+    def _getDispatchTable(cls) -> dict:
+        """Get event types our class handles, {pmmEventType: handler method name}.
+
+        Only handlers that override the (do nothing) mmWidget2 handler are included.
+        Built once per class.
+        """
+        dispatchTable = cls.__dict__.get('_dispatchTable', None)
+        if dispatchTable is None:
+            dispatchTable = {}
+            for eventType, handlerName in eventHandlerNames.items():
+                if getattr(cls, handlerName) is not getattr(mmWidget2, handlerName):
+                    dispatchTable[eventType] = handlerName
+            cls._dispatchTable = dispatchTable
+        return dispatchTable
 
     def slot_pmmEvent(self, event : pmmEvent):
         """Process a pmmEvent and call the proper slot.
@@ -759,86 +896,26 @@ class mmWidget2(QtWidgets.QMainWindow):
         if _doDebug:
             logger.info(f"event.type: {event.type.name} pmmEventType.selection.name: {pmmEventType.selection.name}")
 
-        if event.type == pmmEventType.undoSpineEvent:
-            acceptEvent = self.undoEvent(event)
-
-        elif event.type == pmmEventType.redoSpineEvent:
-            acceptEvent = self.redoEvent(event)
-
-        # abb 20240906
-        elif event.type == pmmEventType.selectSpine:
-            # logger.info(f'   <<< "{self.getClassName()}"')
-            acceptEvent = self.selectedSpine(event)
-       
-        elif event.type == pmmEventType.selection:
-            # logger.info(f'   <<< "{self.getClassName()}"')
-            acceptEvent = self.selectedEvent(event)
-       
-        elif event.type == pmmEventType.add:
-            acceptEvent = self.addedEvent(event)
-
-        elif event.type == pmmEventType.delete:
-            acceptEvent = self.deletedEvent(event)
-        
-        elif event.type == pmmEventType.edit:
-            acceptEvent = self.editedEvent(event)
-        
-        elif event.type == pmmEventType.refreshSpineEvent:
+        if event.type == pmmEventType.refreshSpineEvent and self._iAmStackWidget:
             # no backend (stackWidget) action
             # event to update gui after core change (undo and redo)
-            if not self._iAmStackWidget:
-                acceptEvent = self.editedEvent(event)
-            else:
-                acceptEvent = True
-
-        elif event.type == pmmEventType.stateChange:
-            acceptEvent = self.stateChangedEvent(event)
-        elif event.type == pmmEventType.moveAnnotation:
-            acceptEvent = self.moveAnnotationEvent(event)
-        elif event.type == pmmEventType.manualConnectSpine:
-            acceptEvent = self.manualConnectSpineEvent(event)
-        elif event.type == pmmEventType.autoConnectSpine:
-            acceptEvent = self.autoConnectSpineEvent(event)
-        
-        elif event.type == pmmEventType.setSlice:
-            acceptEvent = self.setSliceEvent(event)
-        
-        elif event.type == pmmEventType.setColorChannel:
-            acceptEvent = self.setColorChannelEvent(event)
-
-        elif event.type == pmmEventType.undoSpineEvent:
-            acceptEvent = self.undoEvent(event)
-        # elif event.type == pmmEventType.redoSpineEvent:
-        #     acceptEvent = self.redoEvent(event)
-
-        #abj
-        elif event.type == pmmEventType.setRadius:
-            acceptEvent = self.setRadiusEvent(event)
-
-        # abb 20240716
-        # segment events
-        elif event.type == pmmEventType.addSegment:
-            # stack widget needs to select new segment
-            acceptEvent = self.addedSegmentEvent(event)
-        elif event.type == pmmEventType.deleteSegment:
-            # stack widget needs to cancel segment selection
-            acceptEvent = self.deletedSegmentEvent(event)
-        elif event.type == pmmEventType.addSegmentPoint:
-            acceptEvent = self.addedSegmentPointEvent(event)
-        elif event.type == pmmEventType.deleteSegmentPoint:
-            acceptEvent = self.deletedSegmentPointEvent(event)
-
-        elif event.type == pmmEventType.settingSegmentPivot: # abj
-            acceptEvent = self.settedSegmentPivot(event)
-
-        # abj
-        # elif event.type == pmmEventType.acceptPoint:
-        #     acceptEvent = self.acceptPoint(event)
-        # elif event.type == pmmEventType.changeUserType:
-        #     acceptEvent = self.changeUserType(event)
-
-        else:
+            handlerName = None
+        elif event.type not in eventHandlerNames.keys():
             logger.error(f'did not understand event type {event.type}')
+            handlerName = None
+        else:
+            # None when our class does not implement the handler
+            handlerName = self._getDispatchTable().get(event.type, None)
+
+        if handlerName is not None:
+            _handler = getattr(self, handlerName)
+            if eventProfiler.enabled:
+                _startSec = time.perf_counter()
+                acceptEvent = _handler(event)
+                _elapsedMs = (time.perf_counter() - _startSec) * 1000
+                eventProfiler.record(self.getName(), event.type.name, _elapsedMs)
+            else:
+                acceptEvent = _handler(event)
 
         # if no parent widget, assume we have children
         if acceptEvent is not None and not acceptEvent:
@@ -859,16 +936,14 @@ class mmWidget2(QtWidgets.QMainWindow):
                 
                 # 1
                 # re-emit event to children
-                # 20240906 removed copy
-                # _newEvent = event.getDeepCopy()
-                _newEvent = event
+                # copy does not copy payloads, it does not change the senders event
+                _newEvent = event.getDeepCopy()
                 
                 # to break recursion
                 _newEvent.reEmitMapAsPoint = senderObject._mapWidget is not None          
 
                 # 03/12 reduce point selection down to stack
-                # 20240906 removed copy
-                # _stackSelection = _newEvent.getStackSelection().getCopy()
+                # already a copy from getDeepCopy()
                 _stackSelection = _newEvent.getStackSelection()
                 _stackSelection = self._reduceToStackSelection(_stackSelection)
                 _newEvent._dict['stackSelection'] = _stackSelection
@@ -183,6 +183,9 @@ class StackPluginDock():
         # humanName, newPlugin = self.parentStackWidget().getOpenPluginDict()[newPluginKey]
         logger.info(f"runPlugin_inDock testtt {newPlugin}")
 
+        if newPlugin is None:
+            return
+
         if newPlugin.getShowSelf():
             newTabIndex = sender.addTab(
                 newPlugin.getWidget(), pluginName
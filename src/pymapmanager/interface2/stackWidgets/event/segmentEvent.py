@@ -41,6 +41,7 @@ class _EditSegment(pmmEvent):
         super().__init__(eventType, mmWidget)
 
         # list of dict with keys in (segmentID, col, value)
+        # a tuple in copies of this event, see getDeepCopy()
         self._list = []
 
     def getSegments(self) -> List[int]:
@@ -81,8 +82,17 @@ class _EditSegment(pmmEvent):
                               z=z,
                               col=col,
                               value=value)
+        if isinstance(self._list, tuple):
+            self._list = list(self._list)
         self._list.append(segmentEdit)
 
+    def getDeepCopy(self):
+        """Copy the event, the copy holds the list of segment edits as a tuple.
+        """
+        _copy = super().getDeepCopy()
+        _copy._list = tuple(self._list)
+        return _copy
+
     def getName(self) -> str:
         """Derived classes define this and is used in undo/redo menus.
         """
@@ -1,42 +1,82 @@
-from typing import List, TypedDict, Self
+from typing import List
 
 from pymapmanager.interface2.stackWidgets.base.mmWidget2 import (
     mmWidget2, pmmEvent, pmmEventType)
 
 from pymapmanager._logger import logger
 
-class SpineEdit(TypedDict):
-    """Dict to hold a spine edit including
+class SpineEdit:
+    """Immutable spine edit including
         (add, delete, edit, move head, move tail, etc)
+
+    Edits are shared between copies of an event, use replace() to get a
+    changed edit. Keys are read like a dict, e.g. spineEdit['spineID'].
     """
-    spineID : int  # all but new
-    sessionID : int
-    segmentID : int  # add
-    x : int  # new, move head, move tail
-    y : int
-    z : int
-    col : str  # edit property
-    value : object
-
-    @classmethod
-    def create(spineID : int,
-               sessionID : int = None,
-               segmentID : int = None,
-               x : int = None,
-               y : int = None,
-               z : int = None,
-               col : str = None,
-               value : object = None
-               ) -> Self:
-        return SpineEdit(spineID=spineID,
-                         sessionID=sessionID,
-                         segmentID=segmentID,
-                         x=x,
-                         y=y,
-                         z=z,
-                         col=col,
-                         value=value
-                         )
+    __slots__ = ('spineID',  # all but new
+                 'sessionID',
+                 'segmentID',  # add
+                 'x',  # new, move head, move tail
+                 'y',
+                 'z',
+                 'col',  # edit property
+                 'value')
+
+    def __init__(self,
+                 spineID : int = None,
+                 sessionID : int = None,
+                 segmentID : int = None,
+                 x : int = None,
+                 y : int = None,
+                 z : int = None,
+                 col : str = None,
+                 value : object = None):
+        _set = super().__setattr__
+        _set('spineID', spineID)
+        _set('sessionID', sessionID)
+        _set('segmentID', segmentID)
+        _set('x', x)
+        _set('y', y)
+        _set('z', z)
+        _set('col', col)
+        _set('value', value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'SpineEdit is immutable, use replace() to set "{name}"')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'SpineEdit is immutable, can not delete "{name}"')
+
+    def __getitem__(self, key : str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key : str, default = None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return self.__slots__
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def replace(self, **kwargs) -> "SpineEdit":
+        """Get a new edit with some keys changed, e.g. replace(spineID=newSpineID).
+        """
+        values = dict(self.items())
+        values.update(kwargs)
+        return SpineEdit(**values)
+
+    def __eq__(self, other):
+        if not isinstance(other, SpineEdit):
+            return NotImplemented
+        return self.items() == other.items()
+
+    def __repr__(self):
+        _items = ', '.join(f'{key}={value!r}' for key, value in self.items())
+        return f'SpineEdit({_items})'
 
 class _EditSpine(pmmEvent):
     """Abstract class for all spine edit(s).
@@ -48,7 +88,8 @@ class _EditSpine(pmmEvent):
                  isAlt : bool = False):
         super().__init__(eventType, mmWidget)
 
-        # list of dict with keys in (spineID, col, value)
+        # list of SpineEdit
+        # a tuple in copies of this event, see getDeepCopy()
         self._list = []
 
         self._isAlt = isAlt
@@ -111,8 +152,30 @@ class _EditSpine(pmmEvent):
                               z=z,
                               col=col,
                               value=value)
+        self._thawEdits()
         self._list.append(spineEdit)
 
+    def updateEdit(self, rowIdx : int, **kwargs):
+        """Set keys of one spine edit, e.g. updateEdit(0, spineID=newSpineID).
+
+        The edit is replaced (not modified) so copies of this event are not changed.
+        """
+        self._thawEdits()
+        self._list[rowIdx] = self._list[rowIdx].replace(**kwargs)
+
+    def _thawEdits(self):
+        """Copy on write, copies of an event hold their edits in a tuple.
+        """
+        if isinstance(self._list, tuple):
+            self._list = list(self._list)
+
+    def getDeepCopy(self):
+        """Copy the event, the copy shares the (immutable) spine edits in a tuple.
+        """
+        _copy = super().getDeepCopy()
+        _copy._list = tuple(self._list)
+        return _copy
+
     def reduceToSession(self, sessionID : int) -> List[SpineEdit]:
         """Reduce a spine edit to one timepoint.
 
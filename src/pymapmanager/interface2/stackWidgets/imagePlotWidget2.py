@@ -1,3 +1,5 @@
+from typing import List
+
 import numpy as np
 import pyqtgraph as pg
 
@@ -6,6 +8,7 @@ from qtpy import QtGui, QtCore, QtWidgets
 import pymapmanager
 import pymapmanager.annotations
 import pymapmanager.interface2
+from pymapmanager.rgbComposite import RgbComposite
 from pymapmanager.interface2.stackWidgets.event.spineEvent import (
                 SelectSpine,
                 EditSpinePropertyEvent,
@@ -40,6 +43,10 @@ class ImagePlotWidget(mmWidget2):
     """Signal emitted when slice changes.
     """
     
+    signalSliceChanged = QtCore.Signal(int)  # (int) : slice number
+    """Signal emitted when the user changes the slice, used by mapWidget to link stack windows.
+    """
+
     signalChannelChange = QtCore.Signal(object)  #(int) : channel number
     """Signal emitted when image channel is changed.
     """
@@ -69,6 +76,9 @@ class ImagePlotWidget(mmWidget2):
         self._sliceImage = None
         self._sliderBlocked = False
 
+        self._rgbComposite = RgbComposite()
+        # reuses one uint8 buffer for rgb images across slices
+
         self._buildUI()
 
         # self.setFocus()
@@ -481,7 +491,11 @@ class ImagePlotWidget(mmWidget2):
 
         # channel = contrastDict['channel']
         # self._contrastDict[channel] = contrastDict
-        self._setContrast()
+        if self._channelIsRGB():
+            # contrast is applied when we composite the rgb image
+            self.refreshSlice()
+        else:
+            self._setContrast()
 
     def slot_setChannel(self, channel):
         logger.info(f'channel:{channel} {type(channel)}')
@@ -533,29 +547,8 @@ class ImagePlotWidget(mmWidget2):
     def _setContrast(self):
         # rgb
         if self._channelIsRGB():
-            tmpLevelList = []  # list of [min,max]
-            for channelIdx in range(self._myStack.numChannels):
-                oneMinContrast = self._myStack.contrast.getValue(channelIdx, 'minAutoContrast-rgb')
-                oneMaxContrast = self._myStack.contrast.getValue(channelIdx, 'maxAutoContrast-rgb')
-
-                # convert to [0..255]
-                #bitDepth = self._myStack.header['bitDepth']
-                #maxInt = 2**bitDepth
-                maxInt = 2**8  # rgb has bit depth of 8 per color channel
-                oneMinContrast = int(oneMinContrast / maxInt * 255)
-                oneMaxContrast = int(oneMaxContrast / maxInt * 255)
-
-                oneLevel = [oneMinContrast, oneMaxContrast]
-                # logger.info(f"oneLevel {oneLevel}")
-                tmpLevelList.append(oneLevel)
-            
-            levelList = [None] * 3
-            levelList[0] = tmpLevelList[1]
-            levelList[1] = tmpLevelList[0]  # green
-            levelList[2] = tmpLevelList[1]
-
-            #
-            # logger.info(f'{self._displayThisChannelIdx} levelList:{levelList}')
+            # contrast was applied in _getRgbImage(), show the full 8-bit range
+            levelList = [[0, 255]] * 3
             self._myImage.setLevels(levelList, update=True)
 
         else:
@@ -601,39 +594,10 @@ class ImagePlotWidget(mmWidget2):
         # abb 20241120, is always on
         # _doSlidingZ = self._displayOptionsDict['windowState']['doSlidingZ']
 
-        upDownSlices = self._displayOptionsDict['windowState']['zPlusMinus']
+        upDownSlices = self._getUpDownSlices()
 
         if self._channelIsRGB():
-            logger.warning('TODO: remove hard coded two channel assumption for rgb')
-            
-            # ch1_image = self._myStack.getImageSlice(imageSlice=sliceNumber, channelIdx=0)
-            # ch2_image = self._myStack.getImageSlice(imageSlice=sliceNumber, channelIdx=1)
-            ch0_image = self._myStack.getMaxProjectSlice(sliceNumber,
-                                    channelIdx=0,
-                                    upSlices=upDownSlices, downSlices=upDownSlices,
-                                    func=np.max)
-            ch1_image = self._myStack.getMaxProjectSlice(sliceNumber,
-                                    channelIdx=1,
-                                    upSlices=upDownSlices, downSlices=upDownSlices,
-                                    func=np.max)
-            
-            # rgb requires 8-bit images
-            ch0_image = ch0_image/ch0_image.max() * 2**8
-            ch1_image = ch1_image/ch1_image.max() * 2**8
-
-            ch0_image = ch0_image.astype(np.uint8)
-            ch1_image = ch1_image.astype(np.uint8)
-            
-            # print('2) ch1_image:', ch1_image.shape, ch1_image.dtype)
-
-            _xShape = ch0_image.shape[0]
-            _yShape = ch0_image.shape[1]
-            sliceImage = np.ndarray((_xShape,_yShape,3))
-            
-            # magenta is blue + red
-            sliceImage[:,:,0] = ch1_image  # red
-            sliceImage[:,:,1] = ch0_image  # green
-            sliceImage[:,:,2] = ch1_image  # blue
+            sliceImage = self._getRgbImage(sliceNumber, upDownSlices)
 
         else:
             sliceImage = self._myStack.getMaxProjectSlice(sliceNumber,
@@ -644,8 +608,19 @@ class ImagePlotWidget(mmWidget2):
         #     # one channel
         #     sliceImage = self._myStack.getImageSlice(imageSlice=sliceNumber, channelIdx=self._displayThisChannelIdx)
 
-        autoLevels = True
-        levels = None
+        # warm the slice cache in the direction the user is scrolling
+        for _channelIdx in self._getSliceChannels():
+            self._myStack.prefetchSlices(sliceNumber,
+                                    channelIdx=_channelIdx,
+                                    upSlices=upDownSlices, downSlices=upDownSlices)
+
+        if self._channelIsRGB():
+            # rgb is already 8-bit with contrast applied
+            autoLevels = False
+            levels = [[0, 255]] * 3
+        else:
+            autoLevels = True
+            levels = None
         
         self._myImage.setImage(sliceImage, levels=levels, autoLevels=autoLevels)
         self._sliceImage = sliceImage
@@ -665,6 +640,62 @@ class ImagePlotWidget(mmWidget2):
             logger.info(f'  -->> emitEvent signalUpdateSlice() _currentSlice:{self._currentSlice}')
             self.emitEvent(_pmmEvent, blockSlots=True)
 
+            self.signalSliceChanged.emit(self._currentSlice)
+
+    def _getUpDownSlices(self) -> int:
+        """Number of slices above and below the current slice in the projection.
+        """
+        return self._displayOptionsDict['windowState']['zPlusMinus']
+
+    def _getSliceChannels(self) -> List[int]:
+        """Channels shown for a slice, all channels for rgb.
+        """
+        if self._channelIsRGB():
+            return list(range(self._myStack.numChannels))
+        return [self._displayThisChannelIdx]
+
+    def prepareSlice(self, sliceNumber : int):
+        """Load the projections for a slice into the stack slice cache, does not change the display.
+
+        Called from SliceRenderCoordinator worker threads, the following
+        _setSlice() for the same slice does not wait on disk.
+        """
+        upDownSlices = self._getUpDownSlices()
+        for channelIdx in self._getSliceChannels():
+            self._myStack.getMaxProjectSlice(int(sliceNumber),
+                                    channelIdx=channelIdx,
+                                    upSlices=upDownSlices, downSlices=upDownSlices,
+                                    func=np.max)
+
+    def _getRgbImage(self, sliceNumber : int, upDownSlices : int) -> np.ndarray:
+        """Composite all channels into one 8-bit rgb image.
+
+        Uses each channel 'colorLUT' and rgb contrast from the stack contrast.
+        Rgb contrast is on an 8-bit scale [0, 256] of the channel 'globalMax'.
+
+        Returns a buffer that is reused on the next call.
+        """
+        imageList = []
+        colorList = []
+        contrastList = []
+        for channelIdx in range(self._myStack.numChannels):
+            oneImage = self._myStack.getMaxProjectSlice(sliceNumber,
+                                    channelIdx=channelIdx,
+                                    upSlices=upDownSlices, downSlices=upDownSlices,
+                                    func=np.max)
+            imageList.append(oneImage)
+
+            _contrast = self._myStack.contrast
+            colorList.append(_contrast.getValue(channelIdx, 'colorLUT'))
+
+            globalMax = _contrast.getValue(channelIdx, 'globalMax')
+            maxInt = 2**8  # rgb has bit depth of 8 per color channel
+            oneMinContrast = _contrast.getValue(channelIdx, 'minAutoContrast-rgb') / maxInt * globalMax
+            oneMaxContrast = _contrast.getValue(channelIdx, 'maxAutoContrast-rgb') / maxInt * globalMax
+            contrastList.append((oneMinContrast, oneMaxContrast))
+
+        return self._rgbComposite.composite(imageList, colorList, contrastList)
+
     def _emitSetSlice(self, newSlice):
             _pmmEvent = pmmEvent(pmmEventType.setSlice, self)
             # _pmmEvent.setSliceNumber(self._currentSlice)
@@ -672,6 +703,8 @@ class ImagePlotWidget(mmWidget2):
 
             logger.info(f'  -->> emit signalUpdateSlice() _currentSlice:{newSlice}')
             self.emitEvent(_pmmEvent, blockSlots=True)
+
+            self.signalSliceChanged.emit(int(newSlice))
     
     def toggleImageView(self):
         """Show/hide image.
@@ -49,6 +49,7 @@ class stackWidget2(mmWidget2):
                     timeseriescore : TimeSeriesCore,
                     mapWidget : "pymapmanager.interface2.mapWidget.mapWidget" = None,
                     timepoint : int = 0,
+                    stack : "pymapmanager.stack" = None,
     ):
         """Main stack widget that is parent to all other mmWidget2 widgets.
         
@@ -60,6 +61,8 @@ class stackWidget2(mmWidget2):
             Used in maps
         timepoint : int
             Used in maps
+        stack : pymapmanager.stack
+            Already loaded stack for timepoint, see StackRunLoader. If None then load it.
         """
         iAmMapWidget = False
 
@@ -68,7 +71,9 @@ class stackWidget2(mmWidget2):
                          iAmStackWidget=True,
                          iAmMapWidget=iAmMapWidget)
 
-        self._stack = pymapmanager.stack(timeseriescore, timepoint=timepoint)
+        if stack is None:
+            stack = pymapmanager.stack(timeseriescore, timepoint=timepoint)
+        self._stack = stack
 
         # keep track of map widget we were opened from
         self._mapWidget : Optional["pymapmanager.interface2.mapWidgets.mapWidget"] = mapWidget
@@ -170,6 +175,9 @@ class stackWidget2(mmWidget2):
             else:
                 self.getPyMapManagerApp().closeStackWindow(self)
 
+        # stop prefetching image slices
+        self._stack.close()
+
         self.close()
 
     def closeStackWindow(self):
@@ -347,7 +355,10 @@ class stackWidget2(mmWidget2):
             viewMenu.addAction(aAction)
     
     def createDockPlugin(self, pluginName: str, show: bool = True):
-        humanName, newPlugin, pluginNumber = self.createAndShowNewPlugin(pluginName)
+        _ret = self.createAndShowNewPlugin(pluginName)
+        if _ret is None:
+            return None, None
+        humanName, newPlugin, pluginNumber = _ret
         return humanName, newPlugin
 
     def runPlugin(self, pluginName: str, show: bool = True, inDock=False):
@@ -372,7 +383,11 @@ class stackWidget2(mmWidget2):
             return
             # return pluginKey
         # 
-        humanName, newPlugin, pluginNumber = self.createAndShowNewPlugin(pluginName, show)
+        _ret = self.createAndShowNewPlugin(pluginName, show)
+        if _ret is None:
+            # not a valid plugin or did not import
+            return
+        humanName, newPlugin, pluginNumber = _ret
 
         if not newPlugin.getInitError():
             # logger.info("here")
@@ -426,10 +441,17 @@ class stackWidget2(mmWidget2):
             logger.error(f'Plugin: "{pluginName}" not valid')
             return
         else:
-            humanName = pluginDict[pluginName]["constructor"]._widgetName
+            try:
+                # imports the plugin module on first use, see PluginInfo
+                pluginClass = pluginDict[pluginName]["constructor"]
+            except (ImportError, AttributeError) as e:
+                logger.error(f'Plugin: "{pluginName}" did not import: {e}')
+                return
+            
+            humanName = pluginClass._widgetName
             logger.info(f'Running plugin: "{pluginName}"')
 
-            newPlugin = pluginDict[pluginName]["constructor"](
+            newPlugin = pluginClass(
                 stackWidget=self,
             )
 
@@ -794,8 +816,7 @@ class stackWidget2(mmWidget2):
                 return
 
             # fill in newSpineID and segmentID
-            event._list[_rowIdx]['spineID'] = newSpineID
-            event._list[_rowIdx]['segmentID'] = segmentID
+            event.updateEdit(_rowIdx, spineID=newSpineID, segmentID=segmentID)
 
         self.getUndoRedo().addUndo(event)
 
@@ -824,7 +845,7 @@ class stackWidget2(mmWidget2):
 
             # fill in newSpineID and segmentID
             # event._list[_rowIdx]['spineID'] = deleteSpineID
-            event._list[_rowIdx]['segmentID'] = segmentID
+            event.updateEdit(_rowIdx, segmentID=segmentID)
 
         # logger.warning(f'_deleted:{_deleted}')
         
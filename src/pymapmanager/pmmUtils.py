@@ -9,12 +9,8 @@ from typing import Optional
 
 import numpy as np
 # from scipy.spatial import ConvexHull
-import matplotlib.pyplot as plt
-
 import pandas as pd
 # import scipy
-from matplotlib.path import Path
-
 import pymapmanager as pmm
 
 # from pymapmanager.utils import _findBrightestIndex
@@ -268,6 +264,7 @@ def calculateLineROIcoords(lineIndex, radius, lineAnnotations):
     return coordinateList
 
 def calculateFinalMask(rectanglePoly, linePoly):
+    from matplotlib.path import Path
 
     # TODO: Change this to detect image shape rather than have it hard coded
     nx, ny = 1024, 1024
@@ -368,6 +365,7 @@ def _old_calculateCandidateMasks(mask, distance, numPts, originalSpinePoint, img
     Return: 
         Values of mask at position with lowest intensity
     """
+    import matplotlib.pyplot as plt
     from scipy import ndimage
     # struct = 
     # print(mask)
@@ -479,6 +477,7 @@ def calculateMaskDict(mask, image):
 def plotFinalMask(mask, distance, numPts, originalSpinePoint, img):
     """ 
     """
+    import matplotlib.pyplot as plt
     from scipy import ndimage
     labelArray, numLabels = ndimage.label(mask)
     # print("label array:", labelArray)
@@ -0,0 +1,110 @@
+"""Composite any number of image channels into one 8-bit RGB image.
+
+Each channel is mapped to [0, 255] with a lookup table built from its
+contrast (min, max) and added to the RGB components of its color. Output
+is written into a preallocated uint8 buffer that is reused across slices.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+from pymapmanager._logger import logger
+
+class RgbComposite:
+    """Build an RGB image from N channels with per channel color and contrast.
+
+    Channels are combined with max blending, each RGB component is the
+    max over channels, so there is no overflow and no wider temporary.
+
+    The returned array is reused on the next call to composite().
+    """
+
+    colorDict = {
+        'r': (1, 0, 0),
+        'g': (0, 1, 0),
+        'b': (0, 0, 1),
+        'c': (0, 1, 1),
+        'm': (1, 0, 1),
+        'y': (1, 1, 0),
+        'w': (1, 1, 1),
+    }
+    # map StackContrast 'colorLUT' to rgb weights
+
+    maxLutCache = 16
+
+    def __init__(self):
+        self._buffer : np.ndarray = None  # (y, x, 3) uint8, returned
+        self._channelBuffer : np.ndarray = None  # (y, x) uint8, one channel after lut
+        self._lutCache = {}
+
+    def composite(self,
+                  imageList : List[np.ndarray],
+                  colorList : List[str],
+                  contrastList : List[Tuple[float, float]]) -> np.ndarray:
+        """Composite channels into an RGB uint8 image.
+
+        Parameters
+        ----------
+        imageList : List[np.ndarray]
+            One 2D image per channel, all the same shape.
+        colorList : List[str]
+            One color per channel, a key in colorDict like 'g'.
+        contrastList : List[Tuple[float, float]]
+            One (min, max) intensity per channel, min maps to 0 and max maps to 255.
+        """
+        shape = imageList[0].shape
+        if self._buffer is None or self._buffer.shape[:2] != shape:
+            self._buffer = np.zeros(shape + (3,), dtype=np.uint8)
+            self._channelBuffer = np.zeros(shape, dtype=np.uint8)
+        else:
+            self._buffer.fill(0)
+
+        for image, color, (minContrast, maxContrast) in zip(imageList, colorList, contrastList):
+            if image is None:
+                continue
+
+            weights = self.colorDict.get(color, None)
+            if weights is None:
+                logger.warning(f'did not understand color {color} -->> defaulting to white')
+                weights = self.colorDict['w']
+
+            for component, weight in enumerate(weights):
+                if weight == 0:
+                    continue
+                self._scaleChannel(image, minContrast, maxContrast, weight, out=self._channelBuffer)
+                _component = self._buffer[:, :, component]
+                np.maximum(_component, self._channelBuffer, out=_component)
+
+        return self._buffer
+
+    def _scaleChannel(self,
+                      image : np.ndarray,
+                      minContrast : float,
+                      maxContrast : float,
+                      weight : float,
+                      out : np.ndarray):
+        """Map image intensities [minContrast, maxContrast] to [0, 255*weight] into out.
+        """
+        if image.dtype in (np.uint8, np.uint16):
+            lutSize = 2 ** (8 * image.dtype.itemsize)
+            lut = self._getLut(minContrast, maxContrast, weight, lutSize)
+            np.take(lut, image, out=out, mode='clip')
+        else:
+            # floats or wide ints, no lut
+            _range = max(maxContrast - minContrast, 1)
+            scaled = (image - minContrast) * (255 * weight / _range)
+            np.clip(scaled, 0, 255, out=scaled)
+            out[:] = scaled
+
+    def _getLut(self, minContrast, maxContrast, weight, lutSize) -> np.ndarray:
+        key = (minContrast, maxContrast, weight, lutSize)
+        lut = self._lutCache.get(key)
+        if lut is None:
+            if len(self._lutCache) >= self.maxLutCache:
+                self._lutCache.clear()
+            _range = max(maxContrast - minContrast, 1)
+            values = np.arange(lutSize, dtype=np.float32)
+            lut = (values - minContrast) * (255 * weight / _range)
+            lut = np.clip(lut, 0, 255).astype(np.uint8)
+            self._lutCache[key] = lut
+        return lut
@@ -0,0 +1,316 @@
+"""Memory bounded cache of image slices and max projections.
+
+Owned by a pymapmanager.stack and shared by all widgets that display
+image data for that stack (ImagePlotWidget, HistogramWidget, ...).
+
+SlicePrefetcher warms the cache with image planes on worker threads.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from pymapmanager._logger import logger
+
+class SliceCache:
+    """LRU cache of image slices, evicted by total size in bytes.
+
+    Keys are usually (timepoint, channelIdx, zRange, funcName).
+
+    Cached arrays are set read only, callers need to copy before modifying.
+
+    Thread safe, SlicePrefetcher puts arrays from worker threads.
+    """
+
+    defaultMaxBytes = 256 * 2**20
+    # 256 MB, about 60 projections of a 1024x1024 uint16 image
+
+    def __init__(self, maxBytes : int = None):
+        if maxBytes is None:
+            maxBytes = self.defaultMaxBytes
+
+        self._maxBytes : int = maxBytes
+        self._numBytes : int = 0
+
+        self._cache : OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+        self._hits : int = 0
+        self._misses : int = 0
+        self._evictions : int = 0
+
+    def __str__(self):
+        _mb = self._numBytes / 2**20
+        _maxMb = self._maxBytes / 2**20
+        retStr = f'SliceCache items:{len(self)} size:{_mb:.1f}/{_maxMb:.1f} MB'
+        retStr += f' hits:{self._hits} misses:{self._misses} evictions:{self._evictions}'
+        return retStr
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key : Hashable):
+        with self._lock:
+            return key in self._cache
+
+    @property
+    def maxBytes(self) -> int:
+        return self._maxBytes
+
+    @property
+    def numBytes(self) -> int:
+        return self._numBytes
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, key : Hashable) -> Optional[np.ndarray]:
+        """Get a cached array and mark it as most recently used.
+
+        Returns None (and counts a miss) if key is not in the cache.
+        """
+        with self._lock:
+            try:
+                value = self._cache[key]
+            except KeyError:
+                self._misses += 1
+                return None
+
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key : Hashable, value : np.ndarray):
+        """Add an array to the cache, evicting least recently used arrays.
+
+        Arrays larger than maxBytes are not cached.
+        """
+        if value is None:
+            return
+
+        nbytes = getattr(value, 'nbytes', 0)
+        if nbytes > self._maxBytes:
+            logger.warning(f'not caching {nbytes} bytes, larger than maxBytes:{self._maxBytes}')
+            return
+
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+
+        with self._lock:
+            if key in self._cache:
+                self._pop(key)
+
+            self._cache[key] = value
+            self._numBytes += nbytes
+
+            while self._numBytes > self._maxBytes:
+                oldKey = next(iter(self._cache))
+                self._pop(oldKey)
+                self._evictions += 1
+
+    def _pop(self, key : Hashable):
+        value = self._cache.pop(key)
+        self._numBytes -= getattr(value, 'nbytes', 0)
+        return value
+
+    def setMaxBytes(self, maxBytes : int):
+        """Set the memory budget, evicting if we are now over budget.
+        """
+        with self._lock:
+            self._maxBytes = maxBytes
+            while self._numBytes > self._maxBytes and len(self._cache) > 0:
+                oldKey = next(iter(self._cache))
+                self._pop(oldKey)
+                self._evictions += 1
+
+    def invalidate(self, timepoint : int = None, channelIdx : int = None):
+        """Remove cached arrays for a timepoint and/or channel.
+
+        With no arguments, remove everything (see clear).
+        """
+        if timepoint is None and channelIdx is None:
+            self.clear()
+            return
+
+        with self._lock:
+            removeKeys = []
+            for key in self._cache.keys():
+                if timepoint is not None and key[0] != timepoint:
+                    continue
+                if channelIdx is not None and key[1] != channelIdx:
+                    continue
+                removeKeys.append(key)
+
+            for key in removeKeys:
+                self._pop(key)
+
+    def clear(self):
+        """Remove all cached arrays, does not reset hit/miss counters.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._numBytes = 0
+
+    def resetCounters(self):
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+class SlicePrefetcher:
+    """Fetch image planes ahead of the user on a thread pool and put them in a SliceCache.
+
+    After each slice change, call prefetch(). Planes just past the edge of the
+    sliding-z window in the direction of travel are fetched so the next
+    slice steps are cache hits. Pending requests are cancelled when the
+    direction changes.
+
+    Parameters
+    ----------
+    fetchPlane : Callable[[int, int], np.ndarray]
+        Function to fetch one plane as fetchPlane(channelIdx, z).
+    planeKey : Callable[[int, int], Hashable]
+        Function to get the SliceCache key for one plane as planeKey(channelIdx, z).
+    sliceCache : SliceCache
+    numSlices : int
+    """
+
+    defaultNumAhead = 4
+    # number of planes to fetch ahead of the window
+
+    defaultNumWorkers = 2
+
+    def __init__(self,
+                 fetchPlane : Callable[[int, int], np.ndarray],
+                 planeKey : Callable[[int, int], Hashable],
+                 sliceCache : SliceCache,
+                 numSlices : int,
+                 numAhead : int = None,
+                 numWorkers : int = None):
+        
+        self._fetchPlane = fetchPlane
+        self._planeKey = planeKey
+        self._sliceCache = sliceCache
+        self._numSlices = numSlices
+
+        self._numAhead = numAhead if numAhead is not None else self.defaultNumAhead
+        _numWorkers = numWorkers if numWorkers is not None else self.defaultNumWorkers
+
+        self._executor = ThreadPoolExecutor(max_workers=_numWorkers,
+                                            thread_name_prefix='SlicePrefetcher')
+        
+        self._pending : Dict[Tuple[int, int], Future] = {}
+        # (channelIdx, z) -> Future
+        self._lock = threading.RLock()
+
+        self._lastSlice : Optional[int] = None
+        self._direction : int = 0  # +1 is down (increasing z), -1 is up
+
+        self._numPrefetched = 0
+        self._numCancelled = 0
+
+        self._isShutdown = False
+
+    def __str__(self):
+        return f'SlicePrefetcher pending:{len(self._pending)} prefetched:{self._numPrefetched} cancelled:{self._numCancelled}'
+
+    @property
+    def numAhead(self) -> int:
+        return self._numAhead
+
+    def setNumAhead(self, numAhead : int):
+        self._numAhead = numAhead
+
+    def prefetch(self, channelIdx : int, imageSlice : int, upSlices : int, downSlices : int):
+        """Schedule planes ahead of the window centered on imageSlice.
+
+        Uses the same window as stack.getMaxProjectSlice(), [imageSlice-upSlices, imageSlice+downSlices).
+        """
+        if self._isShutdown or self._numAhead <= 0:
+            return
+        
+        if self._lastSlice is not None and imageSlice != self._lastSlice:
+            direction = 1 if imageSlice > self._lastSlice else -1
+            if self._direction != 0 and direction != self._direction:
+                self.cancel()
+            self._direction = direction
+        self._lastSlice = imageSlice
+
+        if self._direction == 0:
+            # no direction of travel yet, warm both sides
+            zList = list(range(imageSlice + downSlices, imageSlice + downSlices + self._numAhead))
+            zList += list(range(imageSlice - upSlices - 1, imageSlice - upSlices - 1 - self._numAhead, -1))
+        elif self._direction > 0:
+            zList = range(imageSlice + downSlices, imageSlice + downSlices + self._numAhead)
+        else:
+            zList = range(imageSlice - upSlices - 1, imageSlice - upSlices - 1 - self._numAhead, -1)
+
+        for z in zList:
+            if z < 0 or z >= self._numSlices:
+                continue
+            pendingKey = (channelIdx, z)
+            if pendingKey in self._pending.keys():
+                continue
+            if self._planeKey(channelIdx, z) in self._sliceCache:
+                continue
+            future = self._executor.submit(self._worker, channelIdx, z)
+            with self._lock:
+                self._pending[pendingKey] = future
+            future.add_done_callback(lambda f, k=pendingKey: self._onDone(k, f))
+
+    def _onDone(self, pendingKey : Tuple[int, int], future : Future):
+        with self._lock:
+            if self._pending.get(pendingKey) is future:
+                self._pending.pop(pendingKey)
+
+    def _worker(self, channelIdx : int, z : int):
+        key = self._planeKey(channelIdx, z)
+        if key in self._sliceCache:
+            return
+        try:
+            plane = self._fetchPlane(channelIdx, z)
+        except Exception as e:
+            logger.error(f'channelIdx:{channelIdx} z:{z} {e}')
+            return
+        self._sliceCache.put(key, plane)
+        self._numPrefetched += 1
+
+    def waitFor(self, channelIdx : int, z : int):
+        """Wait for an in flight request for one plane so we do not fetch it twice.
+
+        A request that has not started is cancelled, the caller fetches the plane itself.
+        """
+        with self._lock:
+            future = self._pending.get((channelIdx, z))
+        if future is None:
+            return
+        if future.cancel():
+            self._numCancelled += 1
+            return
+        try:
+            future.result()
+        except Exception as e:
+            logger.error(f'channelIdx:{channelIdx} z:{z} {e}')
+
+    def cancel(self):
+        """Cancel all pending (not started) requests.
+        """
+        with self._lock:
+            futureList = list(self._pending.values())
+            self._pending.clear()
+        for future in futureList:
+            if future.cancel():
+                self._numCancelled += 1
+
+    def shutdown(self):
+        """Cancel pending requests and stop the thread pool, does not wait for running requests.
+        """
+        self._isShutdown = True
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,163 @@
+"""Incremental max (or min) projection over a sliding window of image planes.
+
+When the user steps one slice, the window [firstSlice, lastSlice) moves by one.
+Rather than fetch and reduce all planes again, we keep the planes in the
+window in a two stack queue where each entry also holds the running
+max of the entries below it. Adding or removing a plane at either end
+is one np.maximum (amortized), and the projection is the max of the two
+stack tops.
+"""
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from pymapmanager._logger import logger
+
+class SlidingProjection:
+    """Sliding window projection over z planes for one channel.
+
+    Parameters
+    ----------
+    fetchPlane : Callable[[int], np.ndarray]
+        Function to fetch one image plane by zero based slice index.
+    func : np.max or np.min
+        The projection to compute.
+    """
+
+    # map projection functions to their pairwise ufunc
+    supportedFuncs = {
+        'max': np.maximum,
+        'amax': np.maximum,
+        'min': np.minimum,
+        'amin': np.minimum,
+    }
+
+    def __init__(self,
+                 fetchPlane : Callable[[int], np.ndarray],
+                 func = np.max):
+        _funcName = getattr(func, '__name__', str(func))
+        if _funcName not in self.supportedFuncs.keys():
+            raise ValueError(f'SlidingProjection does not support func "{_funcName}"')
+
+        self._fetchPlane = fetchPlane
+        self._ufunc = self.supportedFuncs[_funcName]
+
+        # each stack is a list of (z, plane, aggregate)
+        # _front holds the top of the window, its last entry is firstSlice
+        # _back holds the bottom of the window, its last entry is lastSlice-1
+        self._front : List[Tuple[int, np.ndarray, np.ndarray]] = []
+        self._back : List[Tuple[int, np.ndarray, np.ndarray]] = []
+
+        self._zRange : Optional[Tuple[int, int]] = None
+
+        self._numFetches = 0
+        self._numRebuilds = 0
+
+    def __str__(self):
+        return f'SlidingProjection zRange:{self._zRange} fetches:{self._numFetches} rebuilds:{self._numRebuilds}'
+
+    @property
+    def zRange(self) -> Optional[Tuple[int, int]]:
+        return self._zRange
+
+    @property
+    def numFetches(self) -> int:
+        """Number of image planes fetched, for profiling.
+        """
+        return self._numFetches
+
+    def clear(self):
+        self._front = []
+        self._back = []
+        self._zRange = None
+
+    def getProjection(self, zRange : Tuple[int, int]) -> np.ndarray:
+        """Get the projection over planes [zRange[0], zRange[1]).
+
+        Moves the current window to zRange, fetching only planes not already in the window.
+        """
+        firstSlice, lastSlice = zRange
+        if lastSlice <= firstSlice:
+            lastSlice = firstSlice + 1
+
+        if self._zRange is None:
+            self._rebuild(firstSlice, lastSlice)
+        else:
+            a, b = self._zRange
+            numSteps = abs(firstSlice - a) + abs(lastSlice - b)
+            overlaps = firstSlice < b and lastSlice > a
+            if not overlaps or numSteps > (lastSlice - firstSlice):
+                self._rebuild(firstSlice, lastSlice)
+            else:
+                # grow first so the window is never empty
+                while a > firstSlice:
+                    a -= 1
+                    self._pushFront(a, self._fetch(a))
+                while b < lastSlice:
+                    self._pushBack(b, self._fetch(b))
+                    b += 1
+                while a < firstSlice:
+                    self._popFront()
+                    a += 1
+                while b > lastSlice:
+                    self._popBack()
+                    b -= 1
+                self._zRange = (firstSlice, lastSlice)
+
+        return self._query()
+
+    def _fetch(self, z : int) -> np.ndarray:
+        self._numFetches += 1
+        return self._fetchPlane(z)
+
+    def _rebuild(self, firstSlice : int, lastSlice : int):
+        self._numRebuilds += 1
+        self.clear()
+        for z in range(firstSlice, lastSlice):
+            self._pushBack(z, self._fetch(z))
+        self._zRange = (firstSlice, lastSlice)
+
+    def _query(self) -> np.ndarray:
+        if self._front and self._back:
+            return self._ufunc(self._front[-1][2], self._back[-1][2])
+        elif self._front:
+            return self._front[-1][2]
+        else:
+            return self._back[-1][2]
+
+    def _push(self, stack : list, z : int, plane : np.ndarray):
+        if stack:
+            aggregate = self._ufunc(plane, stack[-1][2])
+        else:
+            aggregate = plane
+        stack.append((z, plane, aggregate))
+
+    def _pushFront(self, z : int, plane : np.ndarray):
+        self._push(self._front, z, plane)
+
+    def _pushBack(self, z : int, plane : np.ndarray):
+        self._push(self._back, z, plane)
+
+    def _transfer(self, fromStack : list, toStack : list):
+        """Move all entries to the (empty) other stack, recomputing aggregates.
+        """
+        entries = fromStack[::-1]
+        fromStack.clear()
+        for z, plane, _aggregate in entries:
+            self._push(toStack, z, plane)
+
+    def _popFront(self):
+        if not self._front:
+            self._transfer(self._back, self._front)
+        if not self._front:
+            logger.error('window is empty')
+            return
+        self._front.pop()
+
+    def _popBack(self):
+        if not self._back:
+            self._transfer(self._front, self._back)
+        if not self._back:
+            logger.error('window is empty')
+            return
+        self._back.pop()
@@ -1,3 +1,4 @@
+import threading
 from typing import Optional
 
 import numpy as np
@@ -6,6 +7,8 @@ from mapmanagercore.lazy_geo_pd_images import Metadata
 
 import pymapmanager
 from pymapmanager.stackcontrast import StackContrast
+from pymapmanager.sliceCache import SliceCache, SlicePrefetcher
+from pymapmanager.slidingProjection import SlidingProjection
 from pymapmanager.annotations.baseAnnotationsCore import SpineAnnotationsCore, LineAnnotationsCore
 # from pymapmanager.timeseriesCore import TimeSeriesCore
 from pymapmanager._logger import logger
@@ -30,6 +33,9 @@ class stack:
             In memory TimeSeriesCore (wraps core MapAnnotations)
         timepoint : int
             Timepoint in timeseriescore
+        loadImageData : bool
+            If False, call loadImageData() before showing the stack.
+            Annotations are always built here.
         """
 
         self._fullMap : pymapmanager.TimeSeriesCore = timeseriescore
@@ -40,21 +46,38 @@ class stack:
 
         self._maxNumChannels = 3
 
+        self._sliceCache = SliceCache()
+        # shared by all widgets showing image data for this stack
+
+        self._slidingProjections = {}
+        # dict of (channelIdx, funcName) -> SlidingProjection, see getMaxProjectSlice()
+
+        self._projectionLock = threading.Lock()
+        # projections can be requested from worker threads, see SliceRenderCoordinator
+
+        self._prefetcher : Optional[SlicePrefetcher] = None
+        # created on first call to prefetchSlices()
+
+        self._stackContrast : Optional[StackContrast] = None
+        # set in loadImageData()
+
         self._buildHeader()
 
-        # if loadImageData:
-        #     logger.warning(f'EXPENSIVE: loading all image data for {self.numChannels} channels')
-        #     for _channel in range(self.numChannels):
-        #         _channel += 1
-        #         logger.warning(f'   _channel:{_channel} TODO: turn loadImages() back on ... ')
-        #         # self.loadImages(channel=_channel)
+        if loadImageData:
+            self.loadImageData(defaultChannelIdx)
 
+        # logger.info(f'loaded stack timepoint: {self}')
+
+    def loadImageData(self, defaultChannelIdx : int = 0):
+        """Load the first image slice and set the contrast.
+
+        Only reads image data, does not touch the annotations of the core map.
+        Can be called from a worker thread, see StackRunLoader.
+        """
         # get the first image slice from defaultChannelIdx
         self.getImageSlice(0, defaultChannelIdx)
 
         self._stackContrast = StackContrast(self)
-
-        # logger.info(f'loaded stack timepoint: {self}')
               
     @property
     def maxNumChannels(self) -> int:
@@ -64,6 +87,10 @@ class stack:
     def contrast(self) -> StackContrast:
         return self._stackContrast
     
+    @property
+    def sliceCache(self) -> SliceCache:
+        return self._sliceCache
+    
     def getTimeSeriesCore(self) -> pymapmanager.TimeSeriesCore:
         return self._fullMap
 
@@ -168,13 +195,19 @@ class stack:
     def getAutoContrast(self, channelIdx):
         """Get auto contrast for an entire stack
         
-        Expensive as this loads the entire stack
+        Uses intensity stats saved in the .mmap,
+            expensive if they are missing as this reads every plane in the stack.
 
         Note: called once on creation of StackContrast()
         """
         _min, _max, _globalMin, _globalMax = self._fullMap.getMapImages().getAutoContrast(self.timepoint, channel=channelIdx)
         return _min, _max, _globalMin, _globalMax
 
+    def getIntensityStats(self, channelIdx) -> dict:
+        """Get intensity stats for an entire stack, see ImagesCore.getIntensityStats().
+        """
+        return self._fullMap.getMapImages().getIntensityStats(self.timepoint, channel=channelIdx)
+
     def getImageSlice(self,
                       imageSlice : int,
                       channelIdx : int = 1
@@ -225,6 +258,14 @@ class stack:
             upSlices:
             downSlices:
             func: Reference to np funtion to use like np.max
+
+        Projections are cached in self.sliceCache,
+            callers need to copy the returned array before modifying it.
+
+        On a cache miss, np.max and np.min projections are computed incrementally
+            with a per channel SlidingProjection, stepping one slice fetches one plane.
+
+        Thread safe, projections of one stack are made one at a time.
         """
 
         if not isinstance(imageSlice, int):
@@ -244,15 +285,102 @@ class stack:
 
 
         zRange = (firstSlice, lastSlice)
-        slices = self._fullMap.getMapImages().getPixels(
-            timepoint=self.timepoint,
-            channelIdx=channelIdx,
-            zRange=zRange)
+
+        _funcName = getattr(func, '__name__', str(func))
+        cacheKey = (self.timepoint, channelIdx, zRange, _funcName)
+        slices = self._sliceCache.get(cacheKey)
+        if slices is not None:
+            return slices
+
+        with self._projectionLock:
+            # another thread may have made it while we waited
+            slices = self._sliceCache.get(cacheKey)
+            if slices is not None:
+                return slices
+
+            slidingProjection = self._getSlidingProjection(channelIdx, func)
+            if slidingProjection is not None:
+                slices = slidingProjection.getProjection(zRange)
+            else:
+                slices = self._fullMap.getMapImages().getPixels(
+                    timepoint=self.timepoint,
+                    channelIdx=channelIdx,
+                    zRange=zRange)
+            
+            self._sliceCache.put(cacheKey, slices)
 
         # logger.info(f'{slices.shape}')
         # return slices._image
         return slices
 
+    def _getSlidingProjection(self, channelIdx : int, func) -> Optional[SlidingProjection]:
+        """Get (or create) the sliding projection for one channel.
+
+        Returns None if func is not supported, e.g. np.mean.
+        """
+        _funcName = getattr(func, '__name__', str(func))
+        if _funcName not in SlidingProjection.supportedFuncs.keys():
+            return None
+        
+        key = (channelIdx, _funcName)
+        if key not in self._slidingProjections.keys():
+            def _fetchPlane(z : int):
+                return self._getPlane(channelIdx, z)
+            self._slidingProjections[key] = SlidingProjection(_fetchPlane, func=func)
+        
+        return self._slidingProjections[key]
+
+    def _planeCacheKey(self, channelIdx : int, z : int) -> tuple:
+        """Key of one image plane in self.sliceCache.
+        """
+        return (self.timepoint, channelIdx, (z, z+1), 'plane')
+    
+    def _fetchPlane(self, channelIdx : int, z : int) -> np.ndarray:
+        """Fetch one image plane from the core, no caching.
+
+        Called from SlicePrefetcher worker threads.
+        """
+        return self._fullMap.getMapImages().getPixels(timepoint=self.timepoint,
+                                                      channelIdx=channelIdx,
+                                                      zRange=z)
+
+    def _getPlane(self, channelIdx : int, z : int) -> np.ndarray:
+        """Get one image plane, from self.sliceCache if it was prefetched.
+        """
+        key = self._planeCacheKey(channelIdx, z)
+        plane = self._sliceCache.get(key)
+        if plane is None and self._prefetcher is not None:
+            self._prefetcher.waitFor(channelIdx, z)
+            plane = self._sliceCache.get(key)
+        if plane is None:
+            plane = self._fetchPlane(channelIdx, z)
+            self._sliceCache.put(key, plane)
+        return plane
+
+    def prefetchSlices(self,
+                        imageSlice : int,
+                        channelIdx : int = 1,
+                        upSlices : int = 1,
+                        downSlices : int = 1):
+        """Fetch image planes ahead of the current slice on worker threads.
+
+        Call after each slice change with the same arguments as getMaxProjectSlice().
+        Planes go into self.sliceCache so the next slice steps do not wait on disk.
+        """
+        if self._prefetcher is None:
+            self._prefetcher = SlicePrefetcher(self._fetchPlane,
+                                               self._planeCacheKey,
+                                               self._sliceCache,
+                                               numSlices=self.numSlices)
+        self._prefetcher.prefetch(channelIdx, int(imageSlice), upSlices, downSlices)
+
+    def close(self):
+        """Stop background work, called when the stack window closes.
+        """
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown()
+            self._prefetcher = None
+
     def getPixel(self, channel : int, imageSlice : int, y, x) -> int:
         """Get the intensity of a pixel.
         
@@ -291,12 +419,24 @@ class stack:
         # self.getPointAnnotations()._buildTimepoint()  # rebuild single timepoint
         self.getPointAnnotations()._buildDataFrame()
 
+        self._rebuildLineAnnotations()
+
     def redo(self):
         _ret = self._fullMap.redo()
 
         # CRITICAL FOR REDO !!!!!
         self.getPointAnnotations()._buildTimepoint()  # rebuild single timepoint
         self.getPointAnnotations()._buildDataFrame()
+
+        self._rebuildLineAnnotations()
+
+    def _rebuildLineAnnotations(self):
+        """Rebuild line annotations and their caches after undo/redo.
+        """
+        _lines = self.getLineAnnotations()
+        _lines._clearCaches()
+        _lines._buildTimepoint()
+        _lines._buildDataFrame()
         
     #abj
     def save(self):
@@ -326,4 +466,8 @@ class stack:
 
         Currently called whenever a new channel is imported
         """
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+        self._sliceCache.clear()
+        self._slidingProjections = {}
         self._stackContrast = StackContrast(theStack=self)
\ No newline at end of file
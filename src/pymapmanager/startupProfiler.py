@@ -0,0 +1,169 @@
+"""Time the imports and phases of app startup, up to showing the first window.
+
+Enable by setting the environment variable PYMAPMANAGER_PROFILE_STARTUP=1
+or by running the app with --profile-startup. This module is imported first
+by pymapmanager/__init__.py so imports of all dependencies are timed.
+
+When enabled, builtins.__import__ is wrapped to time the first import of
+each module (main thread only). Inclusive time includes nested imports, self
+time does not.
+"""
+import builtins
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.util import resolve_name
+from typing import Dict, List, Optional, Tuple
+
+class StartupProfiler:
+    envVar = 'PYMAPMANAGER_PROFILE_STARTUP'
+    cliFlag = '--profile-startup'
+
+    firstWindowBudgetSec = 6.0
+    # cold start budget, from import pymapmanager to the first window shown
+
+    numReportImports = 25
+    # number of slowest imports in the report
+
+    def __init__(self):
+        self._startSec = time.perf_counter()
+        self._enabled = False
+
+        self._builtinImport = None
+        self._threadId = None
+
+        self._importDict : Dict[str, Tuple[float, float]] = {}
+        # module name -> (inclusive sec, self sec)
+
+        self._childSecStack : List[float] = []
+        # time in nested imports, one per import in progress
+
+        self._phaseList : List[Tuple[str, float, float]] = []
+        # (name, start sec, duration sec), start relative to self._startSec
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def startFromEnvironment(self) -> bool:
+        """Start if the environment variable or command line flag is set.
+        """
+        _fromEnv = os.environ.get(self.envVar, '') not in ('', '0')
+        if _fromEnv or self.cliFlag in sys.argv:
+            self.start()
+        return self._enabled
+
+    def start(self):
+        """Start timing imports and phases.
+        """
+        if self._enabled:
+            return
+        self._enabled = True
+        self._threadId = threading.get_ident()
+        self._builtinImport = builtins.__import__
+        builtins.__import__ = self._profiledImport
+
+    def stop(self):
+        """Stop timing imports, keeps what has been recorded.
+        """
+        if self._builtinImport is not None:
+            builtins.__import__ = self._builtinImport
+            self._builtinImport = None
+        self._enabled = False
+
+    def _profiledImport(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if threading.get_ident() != self._threadId:
+            return self._builtinImport(name, globals, locals, fromlist, level)
+
+        if level > 0:
+            _package = globals.get('__package__') if globals else None
+            try:
+                fullName = resolve_name('.' * level + name, _package)
+            except (ImportError, ValueError):
+                fullName = name
+        else:
+            fullName = name
+
+        if fullName in sys.modules:
+            return self._builtinImport(name, globals, locals, fromlist, level)
+
+        self._childSecStack.append(0.0)
+        _startSec = time.perf_counter()
+        try:
+            return self._builtinImport(name, globals, locals, fromlist, level)
+        finally:
+            elapsedSec = time.perf_counter() - _startSec
+            childSec = self._childSecStack.pop()
+            if len(self._childSecStack) > 0:
+                self._childSecStack[-1] += elapsedSec
+            self._importDict[fullName] = (elapsedSec, elapsedSec - childSec)
+
+    @contextmanager
+    def phase(self, name : str):
+        """Time a phase of startup, use as `with startupProfiler.phase('load plugins'):`
+        """
+        if not self._enabled:
+            yield
+            return
+        _startSec = time.perf_counter()
+        try:
+            yield
+        finally:
+            _endSec = time.perf_counter()
+            self._phaseList.append((name, _startSec - self._startSec, _endSec - _startSec))
+
+    def mark(self, name : str):
+        """Record a point in time, e.g. 'first window'.
+        """
+        if not self._enabled:
+            return
+        self._phaseList.append((name, time.perf_counter() - self._startSec, 0.0))
+
+    def getElapsed(self, name : str) -> Optional[float]:
+        """Seconds from import pymapmanager to the end of a phase or mark, None if not recorded.
+        """
+        for _name, startSec, durSec in self._phaseList:
+            if _name == name:
+                return startSec + durSec
+        return None
+
+    def getImports(self) -> Dict[str, Tuple[float, float]]:
+        """Dict of module name -> (inclusive sec, self sec).
+        """
+        return dict(self._importDict)
+
+    def getReport(self) -> str:
+        lines = ['Startup phases (ms since import pymapmanager):']
+        for name, startSec, durSec in self._phaseList:
+            endMs = (startSec + durSec) * 1000
+            lines.append(f'  {name:<28} end:{endMs:8.1f}  duration:{durSec * 1000:8.1f}')
+
+        firstWindowSec = self.getElapsed('first window')
+        if firstWindowSec is not None:
+            _status = 'ok' if firstWindowSec <= self.firstWindowBudgetSec else 'OVER BUDGET'
+            lines.append(f'  first window in {firstWindowSec:.2f} s, budget {self.firstWindowBudgetSec:.2f} s {_status}')
+
+        lines.append(f'Slowest {self.numReportImports} of {len(self._importDict)} imports (ms):')
+        lines.append(f'  {"inclusive":>10} {"self":>10}  module')
+        _sorted = sorted(self._importDict.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (inclusiveSec, selfSec) in _sorted[:self.numReportImports]:
+            lines.append(f'  {inclusiveSec * 1000:10.1f} {selfSec * 1000:10.1f}  {name}')
+        return '\n'.join(lines)
+
+    def finish(self):
+        """Stop timing imports and log the report, call once the first window is shown.
+        """
+        if not self._enabled:
+            return
+        self.stop()
+
+        from pymapmanager._logger import logger
+        logger.info('\n' + self.getReport())
+        firstWindowSec = self.getElapsed('first window')
+        if firstWindowSec is not None and firstWindowSec > self.firstWindowBudgetSec:
+            logger.warning(f'first window took {firstWindowSec:.2f} s, budget is {self.firstWindowBudgetSec:.2f} s')
+
+startupProfiler = StartupProfiler()
+"""Shared by pymapmanager and the app, see PyMapManagerApp."""
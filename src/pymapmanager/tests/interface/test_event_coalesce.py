@@ -0,0 +1,38 @@
+import pytest
+
+import mapmanagercore.data
+
+from pymapmanager.interface2 import PyMapManagerApp
+from pymapmanager.interface2.stackWidgets.base.mmWidget2 import pmmEventType
+
+# this makes qapp be our PyMapManagerApp, it is derived from QApplication
+@pytest.fixture(scope="session")
+def qapp_cls():
+    return PyMapManagerApp
+
+def test_coalesce_set_slice(qtbot, qapp):
+    """A burst of setSlice from the image plot emits only the first and the last slice.
+    """
+    path = mapmanagercore.data.getSingleTimepointMap()
+    sw = qapp.loadStackWidget(path)
+
+    imagePlotWidget = sw._getNamedWidget(sw._imagePlotName)
+
+    emittedList = []
+    imagePlotWidget._signalPmmEvent.connect(
+        lambda event: emittedList.append(event.getSliceNumber())
+        if event.type == pmmEventType.setSlice else None)
+
+    sliceList = [1, 2, 3, 4, 5]
+    for sliceNumber in sliceList:
+        imagePlotWidget._setSlice(sliceNumber)
+
+    qtbot.waitUntil(lambda: len(emittedList) == 2, timeout=1000)
+    qtbot.wait(100)
+
+    assert emittedList == [1, 5]
+    assert imagePlotWidget.getCoalesceStats() == {'setSlice': {'emitted': 2, 'merged': 3}}
+    assert imagePlotWidget._currentSlice == 5
+
+    # stack widget re-emits to its children without coalescing
+    assert sw.getCoalesceStats() == {}
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+import matplotlib
+
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from pymapmanager.interface2.mapWidgets.mapPlotCache import MapPlotCache
+from pymapmanager.interface2.mapWidgets.mmMapPlot_mpl import mmMapPlot_mpl, _old_getPlotDict_mpl
+
+class _FakeMap:
+    """Stands in for TimeSeriesCore, 3 sessions."""
+    numSessions = 3
+
+    def __init__(self):
+        self.version = 0
+        self.numGets = 0
+        # spine 0 is always there, 1 is added in session 1, 2 is transient, 3 is on segment 1
+        rows = [(0, 0, 0), (0, 1, 0), (0, 2, 0),
+                (1, 1, 0), (1, 2, 0),
+                (2, 1, 0),
+                (3, 0, 1)]
+        index = pd.MultiIndex.from_tuples([(spineID, t) for spineID, t, _ in rows], names=['spineID', 't'])
+        self._df = pd.DataFrame({
+            'segmentID': [segmentID for _, _, segmentID in rows],
+            'spineLength': np.arange(len(rows), dtype=float),
+            'spinePosition': np.arange(len(rows), dtype=float) * 10,
+        }, index=index)
+
+    def getPointDataFrame(self):
+        self.numGets += 1
+        return self._df.sample(frac=1, random_state=0)
+
+def _plotDict():
+    plotDict = _old_getPlotDict_mpl()
+    plotDict['doDark'] = False
+    plotDict['segmentid'] = 0
+    plotDict['xstat'] = 't'
+    plotDict['ystat'] = 'spineLength'
+    return plotDict
+
+def test_map_plot_cache():
+    _map = _FakeMap()
+    cache = MapPlotCache(_map)
+
+    plotDict = cache.fillPlotDict(_plotDict())
+    assert list(plotDict['xyPlotSpineID']) == [0, 0, 0, 1, 1, 2]
+    assert list(plotDict['x']) == [0, 1, 2, 1, 2, 1]
+    assert plotDict['markerColor'] == ['w', 'w', 'w', 'g', 'w', 'b']
+    assert plotDict['runColor'] == ['', 'g', 'b']
+    assert list(plotDict['ySpineLineDict'][1]) == [3.0, 4.0]
+    assert len(plotDict['xPlotLines']) == 3
+
+    # switching stat does not get the map values again
+    plotDict['ystat'] = 'spinePosition'
+    cache.fillPlotDict(plotDict)
+    assert list(plotDict['y']) == [0, 10, 20, 30, 40, 50]
+    assert _map.numGets == 1
+
+    # a change to the map does
+    _map.version += 1
+    cache.fillPlotDict(plotDict)
+    assert _map.numGets == 2
+    assert cache.numBuilds == 2
+
+def test_map_plot_run_lines():
+    _map = _FakeMap()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    mapPlot = mmMapPlot_mpl(_map, _plotDict(), fig=fig)
+
+    # one artist for all runs
+    segments = mapPlot.myRunLines.get_segments()
+    assert len(segments) == 3
+    assert segments[1].tolist() == [[1.0, 3.0], [2.0, 4.0]]
+
+    # dynamics color added and transient runs
+    mapPlot.toggledynamics(True)
+    colors = mapPlot.myRunLines.get_colors()
+    assert colors[1].tolist() == list(matplotlib.colors.to_rgba('g'))
+    assert colors[2].tolist() == list(matplotlib.colors.to_rgba('b'))
+    mapPlot.toggledynamics(False)
+    colors = mapPlot.myRunLines.get_colors()
+    assert (colors == colors[0]).all()
+
+    mapPlot.setRunLineStyle(colors=['r', 'g', 'b'], visibleMask=np.array([True, False, True]))
+    alpha = mapPlot.myRunLines.get_colors()[:, 3]
+    assert alpha.tolist() == [1.0, 0.0, 1.0]
+
+    mapPlot.togglelines(False)
+    assert not mapPlot.myRunLines.get_visible()
+
+def test_map_plot_replot():
+    _map = _FakeMap()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    mapPlot = mmMapPlot_mpl(_map, _plotDict(), fig=fig)
+    scatter = mapPlot.myScatterPlot
+
+    mapPlot.pd['ystat'] = 'spinePosition'
+    mapPlot.pd['segmentid'] = 1
+    mapPlot.rebuildPlotDict()
+    mapPlot.replotMap(resetZoom=True)
+
+    # same artist, new values
+    assert mapPlot.myScatterPlot is scatter
+    assert scatter.get_offsets().tolist() == [[0.0, 60.0]]
+    assert mapPlot.axes.get_ylim()[0] <= 60 <= mapPlot.axes.get_ylim()[1]
+
+def test_map_plot_pick():
+    _map = _FakeMap()
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    mapPlot = mmMapPlot_mpl(_map, _plotDict(), fig=fig)
+
+    pickList = []
+    mapPlot.connect_on_pick(pickList.append)
+
+    # click near the point of spine 1 in session 2 (x 2, y 4)
+    px, py = mapPlot.axes.transData.transform((2, 4))
+    MouseEvent('button_press_event', canvas, px + 2, py - 2, button=1)._process()
+    assert len(pickList) == 1
+    assert pickList[0]['spineID'] == 1
+    assert pickList[0]['timepoint'] == 2
+    assert mapPlot.myPointSelection.get_xdata() == [2]
+
+    # click away from all points
+    px, py = mapPlot.axes.transData.transform((0.5, 4.5))
+    MouseEvent('button_press_event', canvas, px, py, button=1)._process()
+    assert len(pickList) == 1
+
+if __name__ == '__main__':
+    test_map_plot_cache()
+    test_map_plot_run_lines()
+    test_map_plot_replot()
+    test_map_plot_pick()
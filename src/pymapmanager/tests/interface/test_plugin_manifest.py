@@ -0,0 +1,40 @@
+from pymapmanager.interface2.pluginManifest import PluginManifest
+from pymapmanager.interface2.pyMapManagerApp2 import loadPlugins
+
+def test_plugin_manifest(tmp_path):
+    manifestPath = str(tmp_path / 'pluginManifest.json')
+
+    manifest = PluginManifest(manifestPath)
+    pluginDict = loadPlugins('stackWidgets', manifest=manifest)
+    assert manifest.numImported > 0
+    manifest.save()
+
+    # second run finds the same plugins without importing modules
+    manifest = PluginManifest(manifestPath)
+    cachedPluginDict = loadPlugins('stackWidgets', manifest=manifest)
+    assert manifest.numImported == 0
+    assert list(cachedPluginDict.keys()) == list(pluginDict.keys())
+
+    # plugin class is imported on first access
+    scatterPlugin = cachedPluginDict['Scatter Plot']
+    assert 'constructor' not in scatterPlugin
+    assert scatterPlugin['constructor']._widgetName == 'Scatter Plot'
+
+def test_plugin_manifest_skips_imported_classes():
+    """Plugin classes imported into a module are not recorded for that module.
+    """
+    manifest = PluginManifest()
+
+    # imports pointListWidget, lineListWidget and ImagePlotWidget
+    moduleName = 'pymapmanager.interface2.stackWidgets.stackWidget2'
+    plugins = manifest._scanModule(moduleName)
+
+    assert all(plugin['module'] == moduleName for plugin in plugins)
+    assert 'Point List' not in [plugin['humanName'] for plugin in plugins]
+
+if __name__ == '__main__':
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmpDir:
+        test_plugin_manifest(Path(tmpDir))
+    test_plugin_manifest_skips_imported_classes()
@@ -0,0 +1,112 @@
+import numpy as np
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from pymapmanager.interface2.core._blit_manager import BlitManager
+from pymapmanager.interface2.core._point_index import PointGridIndex
+
+def test_point_grid_index():
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 10, size=20000)
+    y = rng.normal(100, 1, size=20000)
+    x[::97] = np.nan
+    y[::89] = np.nan
+
+    pointIndex = PointGridIndex(x, y)
+    assert len(pointIndex) == np.count_nonzero(np.isfinite(x) & np.isfinite(y))
+
+    for x0, x1, y0, y1 in [(-5, 5, 99, 101), (8, -3, 102, 98), (-100, 100, 0, 200),
+                           (40, 50, 99, 101), (0, 0, 99, 101), (1, 2, np.nan, 101)]:
+        # boolean filter is what Highlighter.inside() used to do
+        _x0, _x1 = sorted((x0, x1))
+        _y0, _y1 = sorted((y0, y1))
+        expectedMask = (x > _x0) & (x < _x1) & (y > _y0) & (y < _y1)
+        assert np.array_equal(pointIndex.queryRect(x0, x1, y0, y1), np.flatnonzero(expectedMask))
+        assert np.array_equal(pointIndex.queryRectMask(x0, x1, y0, y1), expectedMask)
+
+    for px, py in [(0, 100), (25, 97), (-3, 100.5)]:
+        xRadius, yRadius = 0.5, 0.05
+        dist = ((x - px) / xRadius) ** 2 + ((y - py) / yRadius) ** 2
+        dist[~(dist <= 1)] = np.inf
+        expected = int(np.argmin(dist)) if np.isfinite(dist).any() else None
+        assert pointIndex.nearest(px, py, xRadius, yRadius) == expected
+
+    # far from all points
+    assert pointIndex.nearest(1000, 1000, 1, 1) is None
+
+    emptyIndex = PointGridIndex(np.array([]), np.array([]))
+    assert len(emptyIndex.queryRect(0, 1, 0, 1)) == 0
+    assert emptyIndex.nearest(0, 0, 1, 1) is None
+
+def test_blit_manager():
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.scatter(np.arange(10), np.arange(10))
+    (highlight, ) = ax.plot([], [], 'o', color='yellow')
+
+    blitManager = BlitManager(canvas, [highlight])
+    assert highlight.get_animated()
+
+    canvas.draw()
+    background = np.array(canvas.buffer_rgba())
+
+    # only the highlight is drawn over the background
+    highlight.set_data([5], [5])
+    blitManager.update()
+    highlighted = np.array(canvas.buffer_rgba())
+    assert not np.array_equal(background, highlighted)
+
+    highlight.set_data([], [])
+    blitManager.update()
+    assert np.array_equal(background, np.array(canvas.buffer_rgba()))
+
+class _NoBlitCanvas(FigureCanvasAgg):
+    supports_blit = False
+
+def _countYellow(canvas) -> int:
+    rgba = np.array(canvas.buffer_rgba())
+    return int(np.count_nonzero((rgba[..., 0] == 255) & (rgba[..., 1] == 255) & (rgba[..., 2] == 0)))
+
+def test_blit_manager_no_blit():
+    """Without blitting the highlight is drawn by update() and by a normal draw.
+    """
+    fig = Figure()
+    canvas = _NoBlitCanvas(fig)
+    ax = fig.add_subplot()
+    (highlight, ) = ax.plot([5], [5], 'o', color='yellow', markersize=20)
+
+    blitManager = BlitManager(canvas, [highlight])
+    assert not highlight.get_animated()
+
+    blitManager.update()
+    assert _countYellow(canvas) > 0
+
+    # set animated by someone else, update() still draws it
+    highlight.set_animated(True)
+    blitManager.update()
+    assert _countYellow(canvas) > 0
+    assert highlight.get_animated()
+
+def test_blit_manager_savefig(tmp_path):
+    """Animated artists are in saved figures.
+    """
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    (highlight, ) = ax.plot([5], [5], 'o', color='yellow', markersize=20)
+
+    BlitManager(canvas, [highlight])
+    assert highlight.get_animated()
+
+    import matplotlib.image
+    savePath = str(tmp_path / 'fig.png')
+    fig.savefig(savePath)
+    rgba = matplotlib.image.imread(savePath)
+    assert np.count_nonzero((rgba[..., 0] == 1) & (rgba[..., 1] == 1) & (rgba[..., 2] == 0)) > 0
+
+if __name__ == '__main__':
+    test_point_grid_index()
+    test_blit_manager()
+    test_blit_manager_no_blit()
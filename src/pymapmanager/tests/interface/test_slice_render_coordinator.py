@@ -0,0 +1,50 @@
+import threading
+import time
+
+from pymapmanager.interface2.mapWidgets.sliceRenderCoordinator import SliceRenderCoordinator
+
+def test_slice_render_coordinator(qtbot):
+    appliedList = []
+    coordinator = SliceRenderCoordinator(lambda key, sliceNumber: appliedList.append((key, sliceNumber)),
+                                         numWorkers=4)
+
+    numSessions = 4
+    loadSec = 0.2
+    threadSet = set()
+    def _prepareSlice(sliceNumber):
+        threadSet.add(threading.get_ident())
+        time.sleep(loadSec)
+
+    _startSec = time.perf_counter()
+    for session in range(numSessions):
+        coordinator.requestSlice(session, _prepareSlice, 5)
+    qtbot.waitUntil(lambda: len(appliedList) == numSessions, timeout=5000)
+    elapsedSec = time.perf_counter() - _startSec
+
+    assert sorted(appliedList) == [(session, 5) for session in range(numSessions)]
+    # sessions load in parallel, not one after the other
+    assert elapsedSec < loadSec * numSessions
+    assert threading.get_ident() not in threadSet
+
+    coordinator.shutdown()
+
+def test_slice_render_coordinator_drops_superseded(qtbot):
+    appliedList = []
+    coordinator = SliceRenderCoordinator(lambda key, sliceNumber: appliedList.append(sliceNumber))
+
+    releaseEvent = threading.Event()
+    def _prepareSlice(sliceNumber):
+        releaseEvent.wait(5)
+
+    # slice 1 is loading, 2 is replaced by 3
+    for sliceNumber in [1, 2, 3]:
+        coordinator.requestSlice(0, _prepareSlice, sliceNumber)
+    releaseEvent.set()
+
+    qtbot.waitUntil(lambda: len(appliedList) > 0, timeout=5000)
+    qtbot.wait(100)
+
+    assert appliedList == [3]
+    assert coordinator.numDropped == 1
+
+    coordinator.shutdown()
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pandas as pd
+
+import pymapmanager
+from pymapmanager import TimeSeriesCore
+from pymapmanager.annotations.baseAnnotationsCore import SpineAnnotationsCore, LineAnnotationsCore
+from pymapmanager.interface2.mapWidgets.stackRunLoader import StackRunLoader
+
+def test_stack_run_loader(qtbot):
+    threadSet = set()
+
+    def _loadStack(session):
+        threadSet.add(threading.get_ident())
+        time.sleep(0.05)
+        if session == 2:
+            raise ValueError('bad session')
+        return f'stack {session}'
+
+    loader = StackRunLoader(_loadStack, [0, 1, 2, 3], numWorkers=4)
+
+    loadedDict = {}
+    failedList = []
+    loader.signalStackLoaded.connect(lambda session, stack: loadedDict.update({session: stack}))
+    loader.signalStackFailed.connect(lambda session, error: failedList.append(session))
+
+    with qtbot.waitSignal(loader.signalFinished, timeout=5000):
+        loader.start()
+
+    assert loadedDict == {0: 'stack 0', 1: 'stack 1', 3: 'stack 3'}
+    assert failedList == [2]
+    assert loader.numDone == 4
+    # sessions were loaded on worker threads, not the GUI thread
+    assert threading.get_ident() not in threadSet
+
+def test_stack_run_loader_cancel(qtbot):
+    startEvent = threading.Event()
+
+    def _loadStack(session):
+        startEvent.wait(5)
+        return session
+
+    loader = StackRunLoader(_loadStack, [0, 1, 2], numWorkers=1)
+    loadedList = []
+    loader.signalStackLoaded.connect(lambda session, stack: loadedList.append(session))
+
+    with qtbot.waitSignal(loader.signalFinished, timeout=5000):
+        loader.start()
+        # session 0 is in progress, 1 and 2 are cancelled
+        loader.cancel()
+        startEvent.set()
+
+    assert loadedList == []
+
+def test_stack_run_loader_build(qtbot):
+    """Sessions are built one per event loop step on the GUI thread, then loaded on workers.
+    """
+    buildList = []
+    buildThreads = set()
+
+    def _buildStack(session):
+        buildThreads.add(threading.get_ident())
+        if session == 1:
+            raise ValueError('bad session')
+        buildList.append(session)
+
+    def _loadStack(session):
+        assert session in buildList
+        return session
+
+    loader = StackRunLoader(_loadStack, [0, 1, 2], numWorkers=2, buildStack=_buildStack)
+    loadedList = []
+    failedList = []
+    loader.signalStackLoaded.connect(lambda session, stack: loadedList.append(session))
+    loader.signalStackFailed.connect(lambda session, error: failedList.append(session))
+
+    with qtbot.waitSignal(loader.signalFinished, timeout=5000):
+        loader.start()
+        # start() returns before any session is built
+        assert buildList == []
+
+    assert buildThreads == {threading.get_ident()}
+    assert buildList == [0, 2]
+    assert sorted(loadedList) == [0, 2]
+    assert failedList == [1]
+
+def test_stack_run_loader_build_cancel(qtbot):
+    buildList = []
+
+    loader = StackRunLoader(lambda session: session, [0, 1, 2], buildStack=buildList.append)
+    loadedList = []
+    loader.signalStackLoaded.connect(lambda session, stack: loadedList.append(session))
+
+    with qtbot.waitSignal(loader.signalFinished, timeout=5000):
+        loader.start()
+        # no session was built
+        loader.cancel()
+
+    qtbot.wait(50)
+    assert buildList == []
+    assert loadedList == []
+
+def test_stack_run_loader_from_map(qtbot, monkeypatch):
+    """Two workers load the sessions of a real map at the same time.
+
+    Annotation frames are built from the shared core map and must not be
+    built on the workers.
+    """
+    from mapmanagercore.data import getMultiTimepointMap
+
+    tsc = TimeSeriesCore(getMultiTimepointMap())
+    sessionList = list(range(tsc.numSessions))
+    assert len(sessionList) >= 2
+
+    buildThreads = set()
+    for _class in (SpineAnnotationsCore, LineAnnotationsCore):
+        def _buildDataFrame(self, _build=_class._buildDataFrame):
+            buildThreads.add(threading.get_ident())
+            return _build(self)
+        monkeypatch.setattr(_class, '_buildDataFrame', _buildDataFrame)
+
+    # both workers are loading image data at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    _loadImageData = pymapmanager.stack.loadImageData
+    def loadImageData(self, *args, **kwargs):
+        if self.timepoint < 2:
+            barrier.wait()
+        return _loadImageData(self, *args, **kwargs)
+    monkeypatch.setattr(pymapmanager.stack, 'loadImageData', loadImageData)
+
+    loader = StackRunLoader.fromMap(tsc, sessionList, numWorkers=2)
+    loadedDict = {}
+    loader.signalStackLoaded.connect(lambda session, stack: loadedDict.update({session: stack}))
+
+    with qtbot.waitSignal(loader.signalFinished, timeout=30000):
+        loader.start()
+
+    assert buildThreads == {threading.get_ident()}
+    assert sorted(loadedDict.keys()) == sessionList
+
+    for session, _stack in loadedDict.items():
+        assert _stack.contrast is not None
+        serialStack = pymapmanager.stack(tsc, timepoint=session)
+        pd.testing.assert_frame_equal(_stack.getPointAnnotations().getDataFrame(),
+                                      serialStack.getPointAnnotations().getDataFrame())
+        pd.testing.assert_frame_equal(_stack.getLineAnnotations().getDataFrame(),
+                                      serialStack.getLineAnnotations().getDataFrame())
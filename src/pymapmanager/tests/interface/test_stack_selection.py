@@ -0,0 +1,64 @@
+import pytest
+
+from pymapmanager.interface2.stackWidgets.base.mmWidget2 import StackSelection
+from pymapmanager.interface2.stackWidgets.event.spineEvent import EditSpinePropertyEvent, SpineEdit
+
+def test_stack_selection_copy():
+    selection = StackSelection()
+    selection.setPointSelection([3, 5], sessions=[0, 0])
+    selection.setSegmentSelection([1])
+
+    selectionCopy = selection.getCopy()
+    # selections are shared, not copied
+    assert selectionCopy._dict['pointSelectionList'] is selection._dict['pointSelectionList']
+
+    # getters return lists, changing them does not change the selection
+    points = selectionCopy.getPointSelection()
+    assert points == [3, 5]
+    points.append(7)
+    assert selection.getPointSelection() == [3, 5]
+
+    # setting the copy does not change the original
+    selectionCopy.setPointSelection([7], sessions=[1])
+    selectionCopy.setSegmentSelection(2)
+    assert selection.getPointSelection() == [3, 5]
+    assert selection.getSessionSelection() == [0, 0]
+    assert selection.getSegmentSelection() == [1]
+    assert selectionCopy.firstSegmentSelection() == 2
+
+class _FakeWidget:
+    """Stands in for the mmWidget2 that sends an event."""
+    def getName(self):
+        return 'fake widget'
+
+    def getStack(self):
+        return None
+
+    def getMapTimepoint(self):
+        return None
+
+def test_spine_edit_copy():
+    event = EditSpinePropertyEvent(_FakeWidget(), spineID=3, col='note', value='a')
+    event.addEditProperty(5, 'note', 'b')
+
+    spineEdit = event._list[0]
+    assert spineEdit['spineID'] == 3
+    assert spineEdit.get('col') == 'note'
+    with pytest.raises(AttributeError):
+        spineEdit.spineID = 4
+
+    eventCopy = event.getDeepCopy()
+    # copying does not change the event, edits are shared
+    assert isinstance(event._list, list)
+    assert isinstance(eventCopy._list, tuple)
+    assert eventCopy._list[0] is spineEdit
+
+    # updating the copy replaces its edit, the original is not changed
+    eventCopy.updateEdit(0, spineID=7)
+    assert eventCopy.getSpines() == [7, 5]
+    assert event.getSpines() == [3, 5]
+    assert spineEdit == SpineEdit(spineID=3, col='note', value='a')
+
+if __name__ == '__main__':
+    test_stack_selection_copy()
+    test_spine_edit_copy()
@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+
+from pymapmanager.startupProfiler import StartupProfiler
+
+plottingModules = ['matplotlib', 'seaborn', 'scipy']
+# loaded on first use, not to show the first window
+
+def _runPython(code : str, home : str) -> dict:
+    """Run code in a new interpreter (cold start) and return the json it prints last.
+    """
+    env = dict(os.environ)
+    env['HOME'] = home  # user documents, preferences and plugin manifest
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env[StartupProfiler.envVar] = '1'
+    result = subprocess.run([sys.executable, '-c', code],
+                            env=env, capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_does_not_load_plotting(tmp_path):
+    code = '\n'.join([
+        'import json, sys',
+        'import pymapmanager.interface2.pyMapManagerApp2',
+        f'print(json.dumps([m for m in {plottingModules} if m in sys.modules]))',
+    ])
+    loadedModules = _runPython(code, str(tmp_path))
+    assert loadedModules == []
+
+def test_first_window_budget(tmp_path):
+    code = '\n'.join([
+        'import json',
+        'from pymapmanager.interface2.pyMapManagerApp2 import PyMapManagerApp',
+        'from pymapmanager.startupProfiler import startupProfiler',
+        'app = PyMapManagerApp([])',
+        "print(json.dumps(startupProfiler.getElapsed('first window')))",
+    ])
+    # first run builds the plugin manifest
+    _runPython(code, str(tmp_path))
+
+    firstWindowSec = _runPython(code, str(tmp_path))
+    assert firstWindowSec is not None
+    assert firstWindowSec < StartupProfiler.firstWindowBudgetSec
+
+if __name__ == '__main__':
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmpDir:
+        test_import_does_not_load_plotting(Path(tmpDir))
+        test_first_window_budget(Path(tmpDir))
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from qtpy import QtCore
+
+from pymapmanager.interface2.core._data_model import pandasModel
+from pymapmanager.interface2.core.search_widget import TableModel, myQTableView
+
+def _makeDf():
+    df = pd.DataFrame({
+        'x': [1.234, 3.0, np.nan, -2.5, 4.0],
+        'n': [0, 1, 2, -3, 4],
+        'b': [True, False, True, False, True],
+        's': ['a', 'b', 'c', 'd', 'e'],
+    }, index=[10, 11, 12, 13, 14])
+    return df
+
+def _display(model, row, col):
+    return model.data(model.index(row, col), QtCore.Qt.DisplayRole)
+
+def test_table_model_display(qtbot):
+    model = TableModel(_makeDf())
+
+    assert model.rowCount(None) == 5
+    assert model.columnCount(None) == 4
+
+    assert _display(model, 0, 0) == 1.23
+    assert _display(model, 1, 0) == '3.0'
+    assert np.isnan(_display(model, 2, 0))
+    assert _display(model, 0, 1) == 0
+    assert _display(model, 3, 1) == '-3'
+    assert _display(model, 1, 2) == 'False'
+    assert _display(model, 4, 3) == 'e'
+
+    # vertical header is the dataframe index
+    rowHeader = model.headerData(2, QtCore.Qt.Vertical, QtCore.Qt.DisplayRole)
+    assert rowHeader == 12
+    assert isinstance(rowHeader, int)
+
+def test_pandas_model_edit(qtbot):
+    model = pandasModel(_makeDf().reset_index(drop=True))
+    assert _display(model, 2, 0) == ''
+
+    removedList = []
+    model.rowsAboutToBeRemoved.connect(lambda parent, first, last: removedList.append((first, last)))
+    model.myDeleteRows([0, 1, 3])
+    assert removedList == [(3, 3), (0, 1)]
+    assert model.rowCount() == 2
+    assert list(model.myGetData()['s']) == ['c', 'e']
+    assert _display(model, 1, 3) == 'e'
+
+    changedList = []
+    model.dataChanged.connect(lambda first, last: changedList.append((first.row(), last.row())))
+    newDf = pd.DataFrame({'x': [7.5, 8.5], 's': ['y', 'z']})
+    model.mySetRow([0, 1], newDf)
+    assert changedList == [(0, 1)]
+    assert _display(model, 0, 0) == 7.5
+    assert _display(model, 1, 3) == 'z'
+    assert _display(model, 1, 1) == 4
+
+def test_table_view_refresh_rows(qtbot):
+    """Edits and deletes patch the existing model, row labels are kept.
+    """
+    view = myQTableView(df=_makeDf(), name='test')
+    model = view.model
+
+    removedList = []
+    changedList = []
+    model.rowsAboutToBeRemoved.connect(lambda parent, first, last: removedList.append((first, last)))
+    model.dataChanged.connect(lambda first, last: changedList.append((first.row(), last.row())))
+
+    # delete label 11, edit label 13
+    newDf = _makeDf().drop(index=[11])
+    newDf.loc[13, 's'] = 'z'
+    view.refreshRows(newDf, [11, 13])
+
+    assert view.model is model
+    assert removedList == [(1, 1)]
+    assert changedList == [(2, 2)]
+    assert model.rowCount() == 4
+    assert _display(model, 2, 3) == 'z'
+    assert model.headerData(2, QtCore.Qt.Vertical, QtCore.Qt.DisplayRole) == 13
+
+    # added row -->> new model
+    addedDf = pd.concat([newDf, _makeDf().loc[[11]]])
+    view.refreshRows(addedDf, [11])
+    assert view.model is not model
+    assert view.model.rowCount() == 5
+
+if __name__ == '__main__':
+    test_table_model_display(None)
+    test_pandas_model_edit(None)
+    test_table_view_refresh_rows(None)
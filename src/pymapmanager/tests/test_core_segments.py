@@ -197,6 +197,59 @@ def test_qt_segments():
     # print('=== pac.getDataFrame()')
     # print(pac.getDataFrame())
 
+def test_segment_summary():
+    """Summary points/length match per segment queries, before and after a radius edit.
+    """
+    zarrPath = getSingleTimepointMap()
+
+    from pymapmanager import TimeSeriesCore
+    tsc = TimeSeriesCore(zarrPath)
+    _stack = stack(tsc, timepoint=0)
+
+    lac = _stack.getLineAnnotations()
+
+    def _checkSummary():
+        summaryDf = lac.getSummaryDf()
+        for segmentID in summaryDf.index:
+            assert summaryDf.loc[segmentID, 'Points'] == lac.getNumPoints(segmentID)
+            assert summaryDf.loc[segmentID, 'Length'] == round(lac.getLength(segmentID), 2)
+
+    _checkSummary()
+
+    segmentID = lac.getSummaryDf().index[0]
+    lac.setValue(segmentID, 5)
+    _checkSummary()
+
+def test_polyline_slice_undo():
+    """Radius polylines follow a radius edit and its undo.
+    """
+    zarrPath = getSingleTimepointMap()
+
+    from pymapmanager import TimeSeriesCore
+    tsc = TimeSeriesCore(zarrPath)
+    _stack = stack(tsc, timepoint=0)
+
+    lac = _stack.getLineAnnotations()
+
+    sliceNumber = 30
+    zPlusMinus = 100  # all points
+
+    xOrig, yOrig, _ = lac.getPolylineSlice('leftRadius', sliceNumber, zPlusMinus)
+    xOrig, yOrig = xOrig.copy(), yOrig.copy()
+
+    segmentID = lac.getSummaryDf().index[0]
+    oldRadius = lac.singleTimepoint.segments[:]['radius'].loc[segmentID]
+    lac.setValue(segmentID, oldRadius + 5)
+
+    xEdit, yEdit, _ = lac.getPolylineSlice('leftRadius', sliceNumber, zPlusMinus)
+    assert not (list(xEdit) == list(xOrig) and list(yEdit) == list(yOrig))
+
+    _stack.undo()
+
+    xUndo, yUndo, _ = lac.getPolylineSlice('leftRadius', sliceNumber, zPlusMinus)
+    assert list(xUndo) == list(xOrig)
+    assert list(yUndo) == list(yOrig)
+
 def debug_copy():
     from pymapmanager import TimeSeriesCore
 
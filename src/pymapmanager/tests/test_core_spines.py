@@ -1,6 +1,9 @@
+import pandas as pd
+
 from mapmanagercore.data import getMultiTimepointMap
 
 from pymapmanager import stack, TimeSeriesCore
+from pymapmanager.annotations.baseAnnotationsCore import getSpineMarkers
 
 from pymapmanager._logger import logger, setLogLevel
 
@@ -52,6 +55,51 @@ def _tmpCudmoreTest():
         print(f"   afterManualConnectDf:{afterManualConnectDf.loc[spineID, ['x', 'y', 'z']]}")
         print(afterManualConnectDf.columns)
 
+def test_spine_markers():
+    accept = pd.Series([True, False, True, True], dtype=object)
+    userType = pd.Series([0, 3, 12, None], dtype=object)
+    markerColor, mplMarker = getSpineMarkers(accept, userType)
+    assert list(markerColor) == ['m', 'w', 'm', 'm']
+    assert list(mplMarker) == ['o', '<', 'o', 'o']
+
+    markerColor, mplMarker = getSpineMarkers(pd.Series([False, True]), pd.Series([7, 9]))
+    assert list(markerColor) == ['w', 'm']
+    assert list(mplMarker) == ['*', 'h']
+
+def _assertSameAsRebuild(pa):
+    """Incrementally patched df should match a full rebuild.
+    """
+    patchedDf = pa.getDataFrame().copy()
+    pa._buildDataFrame()
+    rebuiltDf = pa.getDataFrame()
+    pd.testing.assert_frame_equal(patchedDf.sort_index(),
+                                  rebuiltDf.sort_index(),
+                                  check_dtype=False)
+
+def test_incremental_df():
+    zarrPath = getMultiTimepointMap()
+    tsc = TimeSeriesCore(zarrPath)
+    _stack = stack(timeseriescore=tsc, timepoint=0)
+    pa = _stack.getPointAnnotations()
+
+    numSpines = len(pa)
+
+    newSpineID = pa.addSpine(segmentID=0, x=100, y=100, z=10)
+    assert len(pa) == numSpines + 1
+    _assertSameAsRebuild(pa)
+
+    pa.moveSpine(spineID=newSpineID, x=110, y=105, z=12)
+    assert pa.getValue('x', newSpineID) == 110
+    _assertSameAsRebuild(pa)
+
+    pa.editSpine([{'spineID': newSpineID, 'col': 'accept', 'value': False}])
+    assert pa.getValue('markerColor', newSpineID) == 'w'
+    _assertSameAsRebuild(pa)
+
+    pa.deleteAnnotation(newSpineID)
+    assert len(pa) == numSpines
+    _assertSameAsRebuild(pa)
+
 if __name__ == '__main__':
     setLogLevel()
     _tmpCudmoreTest()
\ No newline at end of file
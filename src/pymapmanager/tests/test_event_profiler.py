@@ -0,0 +1,25 @@
+from pymapmanager.interface2.stackWidgets.base.eventProfiler import EventProfiler
+
+def test_event_profiler():
+    profiler = EventProfiler()
+    assert not profiler.enabled
+
+    profiler.record('Point Plot', 'setSlice', 0.5)
+    profiler.record('Point Plot', 'setSlice', 20)
+    profiler.record('Line Plot', 'setSlice', 2000)
+
+    oneStats = profiler.getStats()[('Point Plot', 'setSlice')]
+    assert oneStats['count'] == 2
+    assert oneStats['maxMs'] == 20
+    assert sum(oneStats['histogram']) == 2
+    assert profiler.getStats()[('Line Plot', 'setSlice')]['histogram'][-1] == 1
+
+    # slowest first
+    reportLines = profiler.getReport().splitlines()
+    assert reportLines[1].startswith('Line Plot')
+
+    profiler.clear()
+    assert len(profiler.getStats()) == 0
+
+if __name__ == '__main__':
+    test_event_profiler()
@@ -0,0 +1,148 @@
+import threading
+import time
+import zipfile
+
+import numpy as np
+import zarr
+
+from pymapmanager.intensityStats import IntensityAccumulator, IntensityStats, computeIntensityStats
+from pymapmanager.timeseriesCore import ImagesCore
+
+def _makeVolume():
+    rng = np.random.default_rng(0)
+    return rng.integers(10, 3000, size=(12, 32, 32), dtype=np.uint16)
+
+def test_intensity_accumulator():
+    volume = _makeVolume()
+
+    accumulator = IntensityAccumulator()
+    for plane in volume:
+        accumulator.add(plane)
+    stats = accumulator.getStats()
+
+    assert stats['min'] == volume.min()
+    assert stats['max'] == volume.max()
+    assert sum(stats['histogram']) == volume.size
+
+    lowPercent, highPercent = IntensityAccumulator.autoContrastPercentiles
+    assert abs(stats['minAutoContrast'] - np.percentile(volume, lowPercent)) <= 1
+    assert abs(stats['maxAutoContrast'] - np.percentile(volume, highPercent)) <= 1
+
+def test_intensity_stats_save_load(tmp_path):
+    # stand in for a .mmap zip store saved by core
+    mmapPath = str(tmp_path / 'test.mmap')
+    with zipfile.ZipFile(mmapPath, 'w') as zf:
+        zf.writestr('.zattrs', '{}')
+
+    accumulator = IntensityAccumulator()
+    accumulator.add(_makeVolume())
+    stats = accumulator.getStats()
+
+    intensityStats = IntensityStats(mmapPath)
+    assert intensityStats.get(0, 1) is None
+    intensityStats.set(0, 1, stats)
+    intensityStats.save(mmapPath)
+
+    loadedStats = IntensityStats(mmapPath)
+    assert loadedStats.get(0, 1) == stats
+    assert loadedStats.get(0, 0) is None
+
+def test_intensity_stats_load_threads(tmp_path, monkeypatch):
+    mmapPath = str(tmp_path / 'test.mmap')
+    with zipfile.ZipFile(mmapPath, 'w') as zf:
+        zf.writestr('.zattrs', '{}')
+
+    accumulator = IntensityAccumulator()
+    accumulator.add(_makeVolume())
+    stats = accumulator.getStats()
+
+    savedStats = IntensityStats(mmapPath)
+    for timepoint in range(4):
+        savedStats.set(timepoint, 0, stats)
+    savedStats.save(mmapPath)
+
+    # slow down reading the json so all threads get() while it is loading
+    intensityStats = IntensityStats(mmapPath)
+    _readStatsDict = intensityStats._readStatsDict
+    barrier = threading.Barrier(4, timeout=5)
+    def _slowReadStatsDict():
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        # the other threads call get() now
+        time.sleep(0.2)
+        return _readStatsDict()
+    monkeypatch.setattr(intensityStats, '_readStatsDict', _slowReadStatsDict)
+
+    resultDict = {}
+    def _get(timepoint):
+        if timepoint > 0:
+            barrier.wait()
+        resultDict[timepoint] = intensityStats.get(timepoint, 0)
+
+    threads = [threading.Thread(target=_get, args=(timepoint,)) for timepoint in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # every thread gets the saved stats, none sees a partly loaded store
+    assert resultDict == {timepoint: stats for timepoint in range(4)}
+
+def test_compute_intensity_stats_batches():
+    volume = _makeVolume()
+    planeBytes = volume[0].nbytes
+
+    fetchedList = []
+    def _fetchSlab(firstSlice, lastSlice):
+        fetchedList.append(lastSlice - firstSlice)
+        return volume[firstSlice:lastSlice]
+
+    accumulator = IntensityAccumulator()
+    accumulator.add(volume)
+    expectedStats = accumulator.getStats()
+
+    # memory for 4 planes split across 2 workers -->> batches of 2 planes
+    stats = computeIntensityStats(_fetchSlab,
+                                  numSlices=volume.shape[0],
+                                  planeBytes=planeBytes,
+                                  maxBytes=planeBytes * 4,
+                                  numWorkers=2)
+    assert max(fetchedList) == 2
+    assert sum(fetchedList) == volume.shape[0]
+    assert stats == expectedStats
+
+class _CountingArray:
+    """Zarr array (c, z, y, x) that counts the number of pixels read."""
+    def __init__(self, array):
+        self._array = array
+        self.numRead = 0
+
+    def __getitem__(self, key):
+        data = self._array[key]
+        self.numRead += np.size(data)
+        return data
+
+class _FakeMap:
+    """Stands in for core MapAnnotations, images of one timepoint."""
+    def __init__(self, array):
+        class _Images:
+            def _images(self, timepoint):
+                return array
+        self._images = _Images()
+
+def test_images_core_get_slab():
+    volume = np.stack([_makeVolume(), _makeVolume() + 1])  # (c, z, y, x)
+    array = _CountingArray(zarr.array(volume, chunks=(1, 1, 32, 32)))
+    imagesCore = ImagesCore(_FakeMap(array))
+
+    slab = imagesCore.getSlab(0, 1, (3, 5))
+    assert np.array_equal(slab, volume[1, 3:5])
+    # only the 2 requested planes are read
+    assert array.numRead == volume[1, 3:5].size
+
+if __name__ == '__main__':
+    test_intensity_accumulator()
+    test_compute_intensity_stats_batches()
+    test_images_core_get_slab()
@@ -0,0 +1,26 @@
+import shapely
+
+from pymapmanager.annotations.polylineLayer import PolylineLayer
+
+def test_polyline_layer():
+    line0 = shapely.LineString([(0, 0, 0), (1, 0, 1), (2, 0, 2), (3, 0, 9), (4, 0, 2)])
+    line1 = shapely.MultiLineString([[(0, 1, 1), (1, 1, 1)], [(5, 1, 1), (6, 1, 1)]])
+
+    polylineLayer = PolylineLayer([line0, line1])
+    assert len(polylineLayer) == 9
+
+    x, y, connect = polylineLayer.getSlice(0, 2)
+
+    # point (3, 0, 9) is out of the z range
+    assert list(x) == [0, 1, 2, 4, 0, 1, 5, 6]
+    assert list(y) == [0, 0, 0, 0, 1, 1, 1, 1]
+    # no line across the z gap, between segments, or between parts of a MultiLineString
+    assert list(connect) == [True, True, False, False, True, False, True, False]
+
+    x, y, connect = polylineLayer.getSlice(20, 30)
+    assert len(x) == 0 and len(connect) == 0
+
+    assert len(PolylineLayer([]).getSlice(0, 10)[0]) == 0
+
+if __name__ == '__main__':
+    test_polyline_layer()
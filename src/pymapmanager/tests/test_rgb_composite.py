@@ -0,0 +1,28 @@
+import numpy as np
+
+from pymapmanager.rgbComposite import RgbComposite
+
+def test_rgb_composite():
+    green = np.array([[0, 100], [200, 400]], dtype=np.uint16)
+    red = np.array([[400, 0], [100, 200]], dtype=np.uint16)
+    blue = np.full((2, 2), 50, dtype=np.uint16)
+
+    rgbComposite = RgbComposite()
+    rgb = rgbComposite.composite([green, red, blue],
+                                 ['g', 'r', 'b'],
+                                 [(0, 400), (0, 400), (50, 100)])
+
+    assert rgb.shape == (2, 2, 3)
+    assert rgb.dtype == np.uint8
+    assert np.array_equal(rgb[:, :, 1], (green / 400 * 255).astype(np.uint8))
+    assert np.array_equal(rgb[:, :, 0], (red / 400 * 255).astype(np.uint8))
+    assert np.all(rgb[:, :, 2] == 0)  # blue is at its min contrast
+
+    # buffer is reused and cleared
+    rgb2 = rgbComposite.composite([green], ['m'], [(0, 400)])
+    assert rgb2 is rgb
+    assert np.array_equal(rgb2[:, :, 0], rgb2[:, :, 2])
+    assert np.all(rgb2[:, :, 1] == 0)
+
+if __name__ == '__main__':
+    test_rgb_composite()
@@ -0,0 +1,59 @@
+import numpy as np
+
+from pymapmanager.sliceCache import SliceCache, SlicePrefetcher
+
+def test_slice_cache_lru():
+    oneImage = np.zeros((8, 8), dtype=np.uint16)  # 128 bytes
+    sc = SliceCache(maxBytes=oneImage.nbytes * 2)
+
+    assert sc.get((0, 0, (0, 3), 'max')) is None
+    assert sc.misses == 1
+
+    sc.put((0, 0, (0, 3), 'max'), oneImage.copy())
+    sc.put((0, 0, (1, 4), 'max'), oneImage.copy())
+    assert len(sc) == 2
+
+    # touch first key so second key is least recently used
+    assert sc.get((0, 0, (0, 3), 'max')) is not None
+    assert sc.hits == 1
+
+    sc.put((0, 1, (0, 3), 'max'), oneImage.copy())
+    assert len(sc) == 2
+    assert sc.numBytes == oneImage.nbytes * 2
+    assert (0, 0, (1, 4), 'max') not in sc
+    assert (0, 0, (0, 3), 'max') in sc
+
+    # cached arrays are read only
+    cached = sc.get((0, 1, (0, 3), 'max'))
+    assert not cached.flags.writeable
+
+    sc.invalidate(channelIdx=1)
+    assert len(sc) == 1
+
+    sc.clear()
+    assert len(sc) == 0
+    assert sc.numBytes == 0
+
+def test_slice_prefetcher():
+    volume = np.arange(10 * 4 * 4, dtype=np.uint16).reshape(10, 4, 4)
+    sc = SliceCache()
+
+    def _planeKey(channelIdx, z):
+        return (0, channelIdx, (z, z+1), 'plane')
+
+    prefetcher = SlicePrefetcher(lambda channelIdx, z: volume[z].copy(),
+                                 _planeKey, sc, numSlices=10, numAhead=2)
+
+    prefetcher.prefetch(0, imageSlice=3, upSlices=1, downSlices=1)  # no direction yet
+    prefetcher.prefetch(0, imageSlice=4, upSlices=1, downSlices=1)  # scrolling down
+    # wait for worker threads
+    prefetcher._executor.shutdown(wait=True)
+
+    # planes past the bottom of the window [3, 5)
+    assert _planeKey(0, 5) in sc
+    assert _planeKey(0, 6) in sc
+    assert np.array_equal(sc.get(_planeKey(0, 5)), volume[5])
+
+if __name__ == '__main__':
+    test_slice_cache_lru()
+    test_slice_prefetcher()
@@ -0,0 +1,41 @@
+import numpy as np
+
+from pymapmanager.slidingProjection import SlidingProjection
+
+def _makeStack(numSlices=20):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 2**12, size=(numSlices, 16, 16), dtype=np.uint16)
+
+def test_sliding_projection_matches_np_max():
+    volume = _makeStack()
+    numSlices = volume.shape[0]
+    sp = SlidingProjection(lambda z: volume[z], func=np.max)
+
+    zPlusMinus = 3
+    # scroll down, back up, then jump
+    sliceList = list(range(numSlices)) + list(range(numSlices-1, -1, -1)) + [15, 2, 9]
+    for imageSlice in sliceList:
+        firstSlice = max(imageSlice - zPlusMinus, 0)
+        lastSlice = min(imageSlice + zPlusMinus + 1, numSlices)
+        projection = sp.getProjection((firstSlice, lastSlice))
+        expected = np.max(volume[firstSlice:lastSlice], axis=0)
+        assert np.array_equal(projection, expected)
+        assert projection.dtype == volume.dtype
+
+def test_sliding_projection_one_fetch_per_step():
+    volume = _makeStack()
+    sp = SlidingProjection(lambda z: volume[z], func=np.min)
+
+    sp.getProjection((0, 7))
+    assert sp.numFetches == 7
+
+    sp.getProjection((1, 8))
+    assert sp.numFetches == 8
+
+    projection = sp.getProjection((0, 7))
+    assert sp.numFetches == 9
+    assert np.array_equal(projection, np.min(volume[0:7], axis=0))
+
+if __name__ == '__main__':
+    test_sliding_projection_matches_np_max()
+    test_sliding_projection_one_fetch_per_step()
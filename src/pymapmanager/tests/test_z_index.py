@@ -0,0 +1,25 @@
+import numpy as np
+
+from pymapmanager.annotations.zIndex import ZSortedIndex
+
+def test_z_sorted_index():
+    rng = np.random.default_rng(0)
+    z = rng.integers(0, 50, size=500).astype(float)
+    z[::37] = np.nan
+    segmentID = np.repeat(np.arange(5), 100)
+
+    zIndex = ZSortedIndex(z, segmentID)
+
+    for zMin, zMax in [(0, 0), (10, 14), (-5, 3), (45, 80), (20, 10)]:
+        # boolean filter is what getSegmentPlot() used to do
+        expectedRows = np.flatnonzero((z >= zMin) & (z <= zMax))
+        assert np.array_equal(zIndex.getRows(zMin, zMax), expectedRows)
+
+        for _segmentID in range(5):
+            expectedRows = np.flatnonzero((z >= zMin) & (z <= zMax) & (segmentID == _segmentID))
+            assert np.array_equal(zIndex.getRows(zMin, zMax, segmentID=_segmentID), expectedRows)
+
+    assert len(zIndex.getRows(0, 50, segmentID=99)) == 0
+
+if __name__ == '__main__':
+    test_z_sorted_index()
@@ -15,12 +15,24 @@ from mapmanagercore import MapAnnotations, MultiImageLoader
 from mapmanagercore.analysis_params import AnalysisParams
 from mapmanagercore.schemas import Spine, Segment
 
+from pymapmanager.intensityStats import IntensityStats, computeIntensityStats
 from pymapmanager._logger import logger
 
 class ImagesCore:
-    def __init__(self, fullMap : "TimeSeriesCore"):
+
+    statsMaxBytes = 64 * 2**20
+    # peak memory for image data when computing intensity stats
+
+    statsNumWorkers = 2
+    # number of threads when computing intensity stats
+
+    def __init__(self, fullMap : "TimeSeriesCore", intensityStats : IntensityStats = None):
         self._fullMap : TimeSeriesCore = fullMap
 
+        if intensityStats is None:
+            intensityStats = IntensityStats()
+        self._intensityStats : IntensityStats = intensityStats
+
     def getPixels(self, timepoint, channelIdx, zRange : Union[int, Tuple[int,int]]):
         # logger.info(f'timepoint:{timepoint} channelIdx:{channelIdx} zRange:{zRange}')
         
@@ -41,11 +53,63 @@ class ImagesCore:
         timepoint : int
         channel : int
             Zero based channel index.
+
+        Returns
+        -------
+        (minAutoContrast, maxAutoContrast, globalMin, globalMax)
         """
         # channelIdx = channel - 1
         # channelIdx = channel # abj
-        _min, _max, _globalMin, _globalMax = self._fullMap.getAutoContrast_qt(timepoint, channel=channel)
-        return _min, _max, _globalMin, _globalMax
+        stats = self.getIntensityStats(timepoint, channel)
+        return stats['minAutoContrast'], stats['maxAutoContrast'], stats['min'], stats['max']
+
+    def getIntensityStats(self, timepoint, channel) -> dict:
+        """Get intensity stats (min, max, auto contrast, histogram) for one channel.
+
+        Uses stats saved in the .mmap, only computes them (reading every plane) when missing.
+        """
+        _shape = list(self.getShape(timepoint)[1:])  # (z, y, x)
+
+        stats = self._intensityStats.get(timepoint, channel)
+        if stats is not None and stats.get('shape') == _shape:
+            return stats
+        
+        logger.info(f'computing intensity stats timepoint:{timepoint} channel:{channel}')
+        stats = self._computeIntensityStats(timepoint, channel)
+        stats['shape'] = _shape
+        self._intensityStats.set(timepoint, channel, stats)
+        return stats
+
+    def _computeIntensityStats(self, timepoint, channel) -> dict:
+        """Compute intensity stats in batches of planes, never loading the full volume.
+        """
+        _shape = self.getShape(timepoint)
+        numSlices = _shape[1]
+        # read one plane to get bytes per plane
+        planeBytes = self.getPixels(timepoint, channel, 0).nbytes
+
+        def _fetchSlab(firstSlice, lastSlice):
+            return self.getSlab(timepoint, channel, (firstSlice, lastSlice))
+
+        return computeIntensityStats(_fetchSlab,
+                                     numSlices=numSlices,
+                                     planeBytes=planeBytes,
+                                     maxBytes=self.statsMaxBytes,
+                                     numWorkers=self.statsNumWorkers)
+
+    def getSlab(self, timepoint, channelIdx, zRange : Tuple[int,int]) -> np.ndarray:
+        """Get raw image planes [zRange[0], zRange[1]) as (z, y, x).
+        
+        Unlike getPixels(), planes are not max projected.
+        For lazy (zarr) loaders, only these planes are read.
+        """
+        # index channel and z together, [channelIdx] alone reads the full (z, y, x) volume
+        return np.asarray(self._fullMap._images._images(timepoint)[channelIdx, zRange[0]:zRange[1]])
+
+    def getShape(self, timepoint) -> Tuple[int, int, int, int]:
+        """Shape of image data as (c, z, y, x).
+        """
+        return self._fullMap._images.shape(timepoint)
     
     def metadata(self, timepoint):
         return self._fullMap.metadata(timepoint)
@@ -138,6 +202,9 @@ class TimeSeriesCore():
         self._fullMap : MapAnnotations = None
 
         self._isDirty : bool = False
+
+        self._version : int = 0
+        # incremented on every change to annotations, see incrementVersion()
         
         # TODO just use endswith(), splitext does not handle '.ome.zarr'
         _ext = os.path.splitext(path)[1]
@@ -154,7 +221,11 @@ class TimeSeriesCore():
             logger.error(f'did not load file extension: "{_ext}"')
             return
         
-        self._imagesCore = ImagesCore(self._fullMap)
+        if path.endswith('.mmap') or path.endswith('.mmap/'):
+            self._intensityStats = IntensityStats(path)
+        else:
+            self._intensityStats = IntensityStats()
+        self._imagesCore = ImagesCore(self._fullMap, self._intensityStats)
         
         # self._pointsCore = PointsCore(self, self._fullMap)
         # self._segmentCore = SegmentsCore(self, self._fullMap)
@@ -194,6 +265,15 @@ class TimeSeriesCore():
     def setDirty(self, dirty=True):
         self._isDirty = dirty
 
+    @property
+    def version(self) -> int:
+        """Incremented on every change to annotations, used to invalidate caches of map values.
+        """
+        return self._version
+    
+    def incrementVersion(self):
+        self._version += 1
+
     def getAnalysisParams(self) -> AnalysisParams:
         return self._fullMap.analysisParams
     
@@ -352,7 +432,10 @@ class TimeSeriesCore():
         ext = os.path.splitext(self.path)[1]
 
         if ext == ".mmap":
+            # saving overwrites the .mmap, load stats first
+            self._intensityStats.ensureLoaded()
             self._fullMap.save(self.path)
+            self._intensityStats.save(self.path)
 
             # Store last save time to display
 
@@ -370,7 +453,9 @@ class TimeSeriesCore():
             logger.error(f'map must have extension ".mmap", got "{ext}" -->> did not save.')
             return
         
+        self._intensityStats.ensureLoaded()
         self._fullMap.save(path)
+        self._intensityStats.save(path)
 
         # abb 20241221
         self._path = path
@@ -378,10 +463,12 @@ class TimeSeriesCore():
     def undo(self):
         logger.info('-->> PERFORMING UNDO')
         self._fullMap.undo()
+        self.incrementVersion()
 
     def redo(self):
         logger.info('-->> PERFORMING REDO')
         self._fullMap.redo()
+        self.incrementVersion()
 
     def loadInNewChannel(self, path: Union[str, np.ndarray], time: int = 0, channel: int = 0):
         """ Call loadInNewChannel in backend MapManagerCore
@@ -397,6 +484,9 @@ class TimeSeriesCore():
 
         self._fullMap.loadInNewChannel(path, time, channel)
 
+        # channel indices may have changed, recompute stats on next request
+        self._intensityStats.invalidate(timepoint=time)
+
         # totalChannels = self._imagesCore.getTotalChannels()
         # logger.info(f"after total channel in timeseriescore: {totalChannels}")
 
@@ -9,8 +9,6 @@ from ast import Tuple
 from typing import List
 import math
 import numpy as np
-import skimage
-from matplotlib.path import Path
 # import scipy
 from math import atan2
 
@@ -139,6 +137,7 @@ def _findBrightestIndex(x, y, z,
             Rather than a single image slice, pass it a small z-projection centered on z
             use pmm.stack.getMaxProjectSlice() to do this.
     """
+    import skimage.measure
     # numPnts = 5  # parameter for the search, seach +/- from closest point (seed point)
     # linewidth = 3
     # 1) use pythagrian theorem to find the closest point on the line.
@@ -581,6 +580,7 @@ def calculateFinalMask(rectanglePoly, linePoly):
     """
         Calculate the final spine polygon given a the original spine polygon and segment (line) polygon
     """
+    from matplotlib.path import Path
     # TODO: Change this to detect image shape rather than have it hard coded
     nx, ny = 1024, 1024
 
@@ -621,6 +621,7 @@ def calculateFinalMask(rectanglePoly, linePoly):
 def convertCoordsToMask(poly):
     """Convert coords of a polygon to mask.
     """
+    from matplotlib.path import Path
     # TODO: Change this to detect image shape rather than have it hard coded
     nx, ny = 1024, 1024
 